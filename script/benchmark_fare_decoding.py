@@ -0,0 +1,85 @@
+import json
+import timeit
+from typing import Any, Dict
+from fare_decoder import (decode_response, convert_outbound,
+                          build_flight_record, encode_flight_record)
+from models import (FlightModel, DepartureAirport, ArrivalAirport,
+                    CityDeparture, CityArrival, Price, PriceValue)
+
+
+FARES_IN_RESPONSE = 200
+REPEAT = 5
+TIMESTAMP = 1742751829
+
+
+def make_response_bytes(fares_count: int) -> bytes:
+    """Returns a fare API response with `fares_count` fares, exp: {"fares": [...], "size": 200}."""
+    def airport(country: str, iata: str, name: str, country_code: str) -> dict:
+        return {"countryName": country, "iataCode": iata, "name": name, "seoName": name.lower(),
+                "city": {"name": name, "code": name.upper(), "countryCode": country_code}}
+
+    fares = [{
+        "outbound": {
+            "departureAirport": airport("Lithuania", "VNO", "Vilnius", "lt"),
+            "arrivalAirport": airport("Spain", "BCN", "Barcelona", "es"),
+            "departureDate": f"2025-{fare % 12 + 1:02d}-{fare % 28 + 1:02d}T17:05:00",
+            "arrivalDate": f"2025-{fare % 12 + 1:02d}-{fare % 28 + 1:02d}T19:40:00",
+            "price": {"value": 20 + fare * 0.37, "valueMainUnit": "20", "valueFractionalUnit": "37",
+                      "currencyCode": "EUR", "currencySymbol": "€"},
+            "flightKey": f"FR~1787~ ~~VNO~{fare}", "flightNumber": "FR1787",
+            "previousPrice": None, "priceUpdated": 1742734424000,
+        },
+        "summary": {"price": {"value": 20 + fare * 0.37}, "previousPrice": None, "newRoute": False},
+    } for fare in range(fares_count)]
+    return json.dumps({"fares": fares, "size": fares_count}).encode("utf-8")
+
+
+def extract_with_pydantic(outbound: Dict[str, Any]) -> str:
+    """Previous path: field by field pydantic construction, model_dump and json.dumps(indent=4)."""
+    flight_model = FlightModel(
+        departureAirport=DepartureAirport(
+            countryName=outbound['departureAirport']['countryName'],
+            iataCode=outbound['departureAirport']['iataCode'],
+            name=outbound['departureAirport']['name'],
+            city=CityDeparture(**{key: outbound['departureAirport']['city'][key]
+                                  for key in ("name", "code", "countryCode")})),
+        arrivalAirport=ArrivalAirport(
+            countryName=outbound['arrivalAirport']['countryName'],
+            iataCode=outbound['arrivalAirport']['iataCode'],
+            name=outbound['arrivalAirport']['name'],
+            city=CityArrival(**{key: outbound['arrivalAirport']['city'][key]
+                                for key in ("name", "code", "countryCode")})),
+        departureDate=outbound['departureDate'],
+        arrivalDate=outbound['arrivalDate'],
+        flightNumber=outbound['flightNumber'],
+        price=Price(prices_history=[PriceValue(timestamp=TIMESTAMP, price=outbound['price']['value'])],
+                    currencyCode=outbound['price']['currencyCode']),
+        priceUpdated=outbound['priceUpdated'])
+    return json.dumps(flight_model.model_dump(), indent=4)
+
+
+def run_pydantic(content: bytes) -> list:
+    return [extract_with_pydantic(fare["outbound"]) for fare in json.loads(content)["fares"]]
+
+
+def run_msgspec_convert(content: bytes) -> list:
+    """Current path: builtin decode (cache and archive keep dicts), typed convert, encode."""
+    return [encode_flight_record(build_flight_record(convert_outbound(fare["outbound"]), TIMESTAMP))
+            for fare in decode_response(content)["fares"]]
+
+
+def benchmark_fare_decoding_main() -> None:
+    content = make_response_bytes(FARES_IN_RESPONSE)
+    expected = [json.loads(entry) for entry in run_pydantic(content)]
+    for name, run in (("pydantic (before)", run_pydantic),
+                      ("msgspec convert", run_msgspec_convert)):
+        if [json.loads(entry) for entry in run(content)] != expected:
+            raise AssertionError(f"{name} output differs from the pydantic output.")
+        number = max(1, 2000 // FARES_IN_RESPONSE)
+        best = min(timeit.repeat(lambda: run(content), number=number, repeat=REPEAT))
+        per_record_us = best / number / FARES_IN_RESPONSE * 1_000_000
+        print(f"{name:<20} {per_record_us:8.2f} us/record")
+
+
+if __name__ == "__main__":
+    benchmark_fare_decoding_main()
@@ -0,0 +1,60 @@
+import json
+import timeit
+from typing import List
+from storage.codec import encode_flights, decode_flights
+
+
+FLIGHTS = 5000
+PRICES_PER_FLIGHT = 12
+REPEAT = 3
+
+
+def make_flights(flights_count: int, prices_count: int) -> List[dict]:
+    """Returns flight entries in the JSON file format with `prices_count` prices each."""
+    def airport(country: str, iata: str, name: str, country_code: str) -> dict:
+        return {"countryName": country, "iataCode": iata, "name": name,
+                "city": {"name": name, "code": name.upper(), "countryCode": country_code}}
+
+    return [{
+        "departureAirport": airport("Lithuania", "VNO", "Vilnius", "lt"),
+        "arrivalAirport": airport("Spain", "BCN", "Barcelona", "es"),
+        "departureDate": f"2025-{flight % 12 + 1:02d}-{flight % 28 + 1:02d}T17:05:00",
+        "arrivalDate": f"2025-{flight % 12 + 1:02d}-{flight % 28 + 1:02d}T19:40:00",
+        "price": {"prices_history": [{"timestamp": 1742751829 + price * 600,
+                                      "price": round(20 + (flight * 7 + price * 3) % 150 + 0.99, 2)}
+                                     for price in range(prices_count)],
+                  "currencyCode": "EUR"},
+        "flightNumber": f"FR{1000 + flight % 50}",
+        "priceUpdated": 1742734424000,
+    } for flight in range(flights_count)]
+
+
+def measure(flights: List[dict], save, load) -> tuple:
+    """Returns: (size in bytes, best save seconds, best load seconds)"""
+    data = save()
+    if load(data) != flights:
+        raise AssertionError("Loaded flights differ from the saved ones.")
+    save_seconds = min(timeit.repeat(save, number=1, repeat=REPEAT))
+    load_seconds = min(timeit.repeat(lambda: load(data), number=1, repeat=REPEAT))
+    return len(data), save_seconds, load_seconds
+
+
+def benchmark_flight_codecs_main() -> None:
+    flights = make_flights(FLIGHTS, PRICES_PER_FLIGHT)
+    baseline = measure(flights,
+                       lambda: json.dumps(flights, indent=4).encode("utf-8"),
+                       lambda data: json.loads(data.decode("utf-8")))
+    print(f"{'format':<22} {'size KB':>9} {'save ms':>9} {'load ms':>9}")
+    print(f"{'stdlib indent=4':<22} {baseline[0] / 1024:9.0f} {baseline[1] * 1000:9.1f} {baseline[2] * 1000:9.1f}")
+    for serializer, compression in (("json-pretty", "none"), ("json", "none"), ("msgpack", "none"),
+                                    ("json", "gzip"), ("json", "zstd"), ("msgpack", "zstd")):
+        size, save, load = measure(flights,
+                                   lambda: encode_flights(flights, serializer, compression),
+                                   decode_flights)
+        print(f"{serializer + '+' + compression:<22} {size / 1024:9.0f} {save * 1000:9.1f} {load * 1000:9.1f}"
+              f"   {baseline[0] / size:.1f}x smaller, save {baseline[1] / save:.1f}x, "
+              f"load {baseline[2] / load:.1f}x faster")
+
+
+if __name__ == "__main__":
+    benchmark_flight_codecs_main()
@@ -0,0 +1,244 @@
+import os
+import json
+import heapq
+from itertools import islice
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Set, Tuple
+import logging
+import logging.config
+from logging_config import LOGGING_CONFIG
+from constants import CHEAPEST_FLIGHTS_JSON_PATH, OUT_NUM_IN_TABLE, CHEAPEST_VIEW_SLACK
+from flight_data_process import FlightData
+from storage.base import FlightKey, make_flight_key
+
+
+logging.config.dictConfig(LOGGING_CONFIG)
+logger = logging.getLogger(__name__)
+
+
+# Saved views of an older format are rebuilt
+VIEW_FORMAT = "cheapest-flights-v2"
+
+# exp: ('VNO', 'BCN')
+Route = Tuple[str, str]
+
+
+# exp: (191.29, '2025-03-25 17:05:00', ('VNO', 'BCN', '2025-03-25 17:05:00'))
+SortKey = Tuple[float, str, FlightKey]
+
+
+def _sort_key(key: FlightKey, price: float) -> SortKey:
+    """Cheapest first, flights with the same price by departure."""
+    return price, key[2], key
+
+
+def _sort_key_from_json(value: list | None) -> SortKey | None:
+    """Returns: a sort key saved as JSON, exp: [191.29, '2025-03-25 17:05:00', ['VNO', 'BCN', '...']]."""
+    if value is None:
+        return None
+    price, departure, key = value
+    return float(price), str(departure), tuple(key)
+
+
+class RouteCheapest:
+    """
+    The cheapest upcoming flights of one route, `candidates` maps their keys
+    to their latest price. `floor` is a lower bound of the sort key of every
+    other upcoming flight of the route, None if there are no others, so the
+    candidates are always the cheapest flights the route has. The bound
+    holds the departure too: a flight left out at the same price may
+    depart earlier than a candidate.
+    """
+    def __init__(self, floor: SortKey | None = None):
+        self.candidates: Dict[FlightKey, float] = {}
+        self.floor = floor
+
+    def set_price(self, key: FlightKey, price: float, capacity: int) -> None:
+        """Adds or reprices a flight, keeping at most `capacity` candidates."""
+        if self.floor is not None and _sort_key(key, price) > self.floor:
+            # Flights left out may be cheaper now, it stops being a candidate
+            self.candidates.pop(key, None)
+            return
+        self.candidates[key] = price
+        while len(self.candidates) > capacity:
+            evicted = max(_sort_key(candidate, candidate_price)
+                          for candidate, candidate_price in self.candidates.items())
+            del self.candidates[evicted[2]]
+            self.floor = evicted if self.floor is None else min(self.floor, evicted)
+
+    def expire(self, today: str) -> None:
+        """Drops the candidates departing before `today`, exp: '2025-03-25'."""
+        for key in [key for key in self.candidates if key[2][:10] < today]:
+            del self.candidates[key]
+
+    def cheapest(self, num_results: int) -> List[Tuple[SortKey, FlightKey]]:
+        """Returns: [(sort key, flight key)] of the `num_results` cheapest candidates, cheapest first."""
+        return heapq.nsmallest(num_results, ((_sort_key(key, price), key) for key, price in self.candidates.items()))
+
+
+class CheapestFlightsView:
+    """
+    Materialized view of the cheapest upcoming flights of every route, kept
+    up to date by FlightStore as flights are added, repriced and deleted, so
+    the cheapest flights table is read from `size` flights per route instead
+    of parsing and sorting every stored flight.
+    Every route keeps up to `size + slack` candidates. A candidate whose price
+    rises above the cheapest flight left out is dropped, and a route left
+    with fewer than `size` candidates is rescanned from the store flights.
+    Departed flights expire when the view is read or saved.
+    The view is saved with the signature() of the storage engine, a saved
+    view of other stored data is rebuilt on load.
+    """
+    def __init__(self, json_file_path: str | None = CHEAPEST_FLIGHTS_JSON_PATH,
+                 size: int = OUT_NUM_IN_TABLE,
+                 slack: int = CHEAPEST_VIEW_SLACK):
+        """
+        Args:
+            json_file_path (str | None): Path of the view JSON file, None - the view is not saved.
+            size (int): Cheapest flights that can be read per route and overall.
+            slack (int): Extra candidates per route, so a price rise rarely needs a rescan.
+        """
+        self.path = Path(json_file_path) if json_file_path else None
+        self.size = size
+        self.capacity = size + slack
+        self.routes: Dict[Route, RouteCheapest] = {}
+
+    @staticmethod
+    def _listed_price(entry: dict) -> float | None:
+        """Latest price of an entry departing today or later, None for any other entry."""
+        flight = FlightData.from_store(entry)
+        departure_date = flight.departure_date
+        if departure_date is None or departure_date.date() < datetime.today().date():
+            return None
+        return flight.latest_price
+
+    def update(self, key: FlightKey, entry: dict) -> None:
+        """A flight was added or got a new price."""
+        price = self._listed_price(entry)
+        if price is None:
+            self.remove(key)
+            return
+        self.routes.setdefault(key[:2], RouteCheapest()).set_price(key, price, self.capacity)
+
+    def remove(self, key: FlightKey) -> None:
+        """A flight was deleted."""
+        route = self.routes.get(key[:2])
+        if route is not None:
+            route.candidates.pop(key, None)
+
+    def rebuild(self, flights: Iterable[dict], routes: Set[Route] | None = None) -> None:
+        """
+        Builds the view of `routes` from all store flights.
+        Args:
+            flights (Iterable[dict]): Every flight entry of the store.
+            routes (Set[Route] | None): Routes to rebuild, None - all routes.
+        """
+        prices_by_route: Dict[Route, List[Tuple[SortKey, FlightKey]]] = {}
+        for entry in flights:
+            key = make_flight_key(entry)
+            if routes is not None and key[:2] not in routes:
+                continue
+            price = self._listed_price(entry)
+            if price is not None:
+                prices_by_route.setdefault(key[:2], []).append((_sort_key(key, price), key))
+
+        if routes is None:
+            self.routes = {}
+        else:
+            for route in routes:
+                self.routes.pop(route, None)
+        for route, prices in prices_by_route.items():
+            cheapest = heapq.nsmallest(self.capacity + 1, prices)
+            route_cheapest = self.routes[route] = RouteCheapest(
+                cheapest[self.capacity][0] if len(cheapest) > self.capacity else None)
+            route_cheapest.candidates = {key: sort_key[0] for sort_key, key in cheapest[:self.capacity]}
+        logger.info(f"Cheapest flights view rebuilt for {len(prices_by_route)} routes.")
+
+    def stale_routes(self) -> Set[Route]:
+        """
+        Expires departed flights.
+        Returns:
+            Set[Route]: Routes with fewer than `size` candidates but other flights, to rebuild().
+        """
+        today = datetime.today().strftime("%Y-%m-%d")
+        for route in self.routes.values():
+            route.expire(today)
+        return {route_key for route_key, route in self.routes.items()
+                if route.floor is not None and len(route.candidates) < self.size}
+
+    def cheapest(self, num_results: int = OUT_NUM_IN_TABLE,
+                 departure_iata: str | None = None,
+                 arrival_iata: str | None = None) -> List[FlightKey]:
+        """
+        Keys of the cheapest flights departing today or later, ordered by the
+        latest price, ties by departure. Call stale_routes() first.
+        Args:
+            num_results (int): Number of flights, up to `size`.
+            departure_iata (str | None): Only this departure, exp: "VNO", None - all.
+            arrival_iata (str | None): Only this arrival, exp: "BCN", None - all.
+        Raises:
+            ValueError: If `num_results` is more than the view keeps.
+        """
+        if num_results > self.size:
+            raise ValueError(f"The cheapest flights view keeps {self.size} flights, {num_results} requested.")
+        cheapest = heapq.merge(*(route.cheapest(num_results) for route_key, route in self.routes.items()
+                                 if departure_iata in (None, route_key[0])
+                                 and arrival_iata in (None, route_key[1])))
+        return [key for _, key in islice(cheapest, num_results)]
+
+    def load(self, flights: Iterable[dict], signature: List[list]) -> "CheapestFlightsView":
+        """
+        Loads the saved view, or rebuilds it from `flights` if it is missing,
+        invalid or saved for other stored data.
+        Args:
+            flights (Iterable[dict]): Every flight entry of the store.
+            signature (List[list]): StorageEngine.signature() of the loaded store.
+        """
+        try:
+            if self.path is None:
+                raise FileNotFoundError
+            with open(self.path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+            if (data.get("format") != VIEW_FORMAT or data.get("size") != self.size
+                    or data.get("capacity") != self.capacity or data.get("signature") != signature):
+                raise ValueError("Saved for other stored data or settings.")
+            self.routes = {}
+            for route_data in data["routes"]:
+                route = self.routes[tuple(route_data["route"])] = RouteCheapest(
+                    _sort_key_from_json(route_data["floor"]))
+                route.candidates = {tuple(key): price for *key, price in route_data["flights"]}
+            logger.info(f"Cheapest flights view loaded from '{self.path}'.")
+        except FileNotFoundError:
+            self.rebuild(flights)
+        except (json.JSONDecodeError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Cheapest flights view '{self.path}' is not up to date ({e}), rebuilding it.")
+            self.rebuild(flights)
+        return self
+
+    def save(self, signature: List[list]) -> None:
+        """
+        Writes the view atomically, departed flights are dropped.
+        Args:
+            signature (List[list]): StorageEngine.signature() of the flushed store.
+        """
+        if self.path is None:
+            return
+        self.stale_routes()
+        data = {
+            "format": VIEW_FORMAT,
+            "size": self.size,
+            "capacity": self.capacity,
+            "signature": signature,
+            "routes": [{"route": list(route_key),
+                        "floor": route.floor,
+                        "flights": [[*key, price] for key, price in route.candidates.items()]}
+                       for route_key, route in self.routes.items()
+                       if route.candidates or route.floor is not None],
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_suffix(".tmp")
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump(data, file)
+        os.replace(temp_path, self.path)
+        logger.info(f"Cheapest flights view saved with {len(data['routes'])} routes.")
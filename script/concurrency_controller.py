@@ -0,0 +1,182 @@
+import time
+import asyncio
+import threading
+from collections import deque
+from typing import Dict
+import logging
+import logging.config
+from logging_config import LOGGING_CONFIG
+from constants import (
+                    MAX_CONCURRENT_REQUESTS_PER_HOST, ADAPTIVE_CONCURRENCY_MIN,
+                    ADAPTIVE_CONCURRENCY_MAX, ADAPTIVE_LATENCY_TARGET,
+                    ADAPTIVE_DECREASE_FACTOR, ADAPTIVE_HISTORY_SIZE)
+from http_transport import add_response_observer
+
+
+logging.config.dictConfig(LOGGING_CONFIG)
+logger = logging.getLogger(__name__)
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD controller of in-flight requests for one host.
+    Every good response below the latency target raises the limit by about
+    one per window of `limit` responses, a 429, a 5xx, a connection error or
+    a slow response cuts the limit by `decrease_factor`. At most one cut is
+    made per average response time, so one burst of errors counts once.
+    """
+    def __init__(self,
+                 initial_limit: int = MAX_CONCURRENT_REQUESTS_PER_HOST,
+                 min_limit: int = ADAPTIVE_CONCURRENCY_MIN,
+                 max_limit: int = ADAPTIVE_CONCURRENCY_MAX,
+                 latency_target: float = ADAPTIVE_LATENCY_TARGET,
+                 decrease_factor: float = ADAPTIVE_DECREASE_FACTOR,
+                 history_size: int = ADAPTIVE_HISTORY_SIZE):
+        """
+        Args:
+            initial_limit (int): Limit at start.
+            min_limit (int): Lowest limit.
+            max_limit (int): Highest limit.
+            latency_target (float): Response time in seconds above which the limit is cut.
+            decrease_factor (float): Multiplier applied to the limit on a cut.
+            history_size (int): Number of limit changes kept in `history`.
+        Raises:
+            ValueError: If the limits are not 1 <= min_limit <= max_limit.
+        """
+        if not 1 <= min_limit <= max_limit:
+            logger.error(f"Invalid concurrency limits: min={min_limit}, max={max_limit}")
+            raise ValueError("Concurrency limits must satisfy 1 <= min_limit <= max_limit.")
+
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target = latency_target
+        self.decrease_factor = decrease_factor
+        self._limit = float(min(max(initial_limit, min_limit), max_limit))
+        self._in_flight = 0
+        self._last_decrease_at = 0.0
+        self._latency_ewma = 0.0
+        self._counters = {"ok": 0, "slow": 0, "throttled": 0, "errors": 0}
+        self.history = deque(maxlen=history_size)
+        self.history.append((time.time(), int(self._limit), "start"))
+        self._lock = threading.Lock()
+        self._condition: asyncio.Condition | None = None
+        self._condition_loop = None
+
+    @property
+    def limit(self) -> int:
+        """Current number of allowed in-flight requests."""
+        return int(self._limit)
+
+    def _get_condition(self) -> asyncio.Condition:
+        """Returns a Condition bound to the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._condition_loop is not loop:
+            self._condition = asyncio.Condition()
+            self._condition_loop = loop
+        return self._condition
+
+    async def acquire(self) -> None:
+        """Waits until fewer than `limit` requests are in flight and takes a slot."""
+        condition = self._get_condition()
+        async with condition:
+            await condition.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+
+    async def release(self) -> None:
+        """Frees a slot and wakes waiting requests."""
+        condition = self._get_condition()
+        async with condition:
+            self._in_flight -= 1
+            condition.notify_all()
+
+    def record(self, status_code: int | None, latency: float) -> None:
+        """
+        Updates the limit from one observed response. Safe to call from any thread.
+        Args:
+            status_code (int | None): HTTP status, None for a connection error or timeout.
+            latency (float): Response time in seconds.
+        """
+        with self._lock:
+            self._latency_ewma = latency if not self._latency_ewma else (
+                0.8 * self._latency_ewma + 0.2 * latency)
+
+            if status_code == 429:
+                self._counters["throttled"] += 1
+                self._decrease("throttled")
+            elif status_code is None or status_code >= 500:
+                self._counters["errors"] += 1
+                self._decrease("error")
+            elif latency > self.latency_target:
+                self._counters["slow"] += 1
+                self._decrease("slow")
+            else:
+                self._counters["ok"] += 1
+                self._increase()
+
+    def _increase(self) -> None:
+        old_limit = self.limit
+        self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+        if self.limit != old_limit:
+            self.history.append((time.time(), self.limit, "increase"))
+
+    def _decrease(self, reason: str) -> None:
+        now = time.monotonic()
+        if now - self._last_decrease_at < self._latency_ewma:
+            return
+        self._last_decrease_at = now
+        self._limit = max(self.min_limit, self._limit * self.decrease_factor)
+        self.history.append((time.time(), self.limit, reason))
+        logger.info(f"Concurrency limit cut to {self.limit} ({reason}).")
+
+    def metrics(self) -> dict:
+        """
+        Returns the current state and limit history.
+        exp: {'limit': 6, 'in_flight': 2, 'latency_ewma': 0.41,
+            'counters': {'ok': 90, 'slow': 0, 'throttled': 2, 'errors': 0},
+            'history': [(1742751829.1, 8, 'start'), (1742751830.4, 4, 'throttled')]}
+        """
+        with self._lock:
+            return {
+                "limit": self.limit,
+                "in_flight": self._in_flight,
+                "latency_ewma": round(self._latency_ewma, 3),
+                "counters": dict(self._counters),
+                "history": list(self.history),
+            }
+
+
+_limiters: Dict[str, AdaptiveConcurrencyLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_concurrency_limiter(host: str) -> AdaptiveConcurrencyLimiter:
+    """
+    Returns the process-wide limiter of a host, creating it on first use.
+    """
+    with _limiters_lock:
+        if host not in _limiters:
+            _limiters[host] = AdaptiveConcurrencyLimiter()
+        return _limiters[host]
+
+
+def record_response(host: str, status_code: int | None, latency: float) -> None:
+    """HttpTransport response observer feeding the host limiter."""
+    get_concurrency_limiter(host).record(status_code, latency)
+
+
+def get_concurrency_metrics() -> Dict[str, dict]:
+    """Returns metrics() of every host limiter."""
+    with _limiters_lock:
+        limiters = dict(_limiters)
+    return {host: limiter.metrics() for host, limiter in limiters.items()}
+
+
+def log_concurrency_metrics() -> None:
+    """Logs the current limit and counters of every host limiter."""
+    for host, metrics in get_concurrency_metrics().items():
+        logger.info(f"Concurrency {host}: limit={metrics['limit']} "
+                    f"latency_ewma={metrics['latency_ewma']}s counters={metrics['counters']} "
+                    f"limit changes={len(metrics['history']) - 1}")
+
+
+add_response_observer(record_response)
@@ -8,7 +8,17 @@ LOAD_DOTENV_PATH = './script/db/.env'
 CSV_AIRPORTS_FILE_PATH = "./script/airports.csv"
 VNO_BCN_DATA_JSON_PATH = "./script/data/vno_bcn_data.json"
 LT_SPAIN_DATA_JSON_PATH = "./script/data/lt_spain_data.json"
+FARE_FINGERPRINTS_JSON_PATH = "./script/data/fare_fingerprints.json"
 DATA_FOLDER_PATH = "./script/data"
+RESPONSE_CACHE_FOLDER_PATH = "./script/data/response_cache"
+ROUTE_SCHEDULE_FOLDER_PATH = "./script/data/route_schedule"
+CHECKPOINTS_FOLDER_PATH = "./script/data/checkpoints"
+RAW_ARCHIVE_FOLDER_PATH = "./script/data/raw_archive"
+FLIGHTS_LOG_FOLDER_PATH = "./script/data/flights_log"
+BINARY_FLIGHTS_PATH = "./script/data/lt_spain_data.flights"
+SQLITE_FLIGHTS_PATH = "./script/data/lt_spain_data.sqlite3"
+SHARDED_FLIGHTS_FOLDER_PATH = "./script/data/flights_sharded"
+CHEAPEST_FLIGHTS_JSON_PATH = "./script/data/cheapest_flights.json"
 
 # Paths using in logging_config.py
 LOGS_FILE_PATH = "./script/logs/logs_all.log"
@@ -22,12 +32,122 @@ FLYGHT_ROUTES = [
     #{"departure": "KUN", "arrival": "PMI"},
     #{"departure": "KUN", "arrival": "AGP"},
 ]
+# Route arrival value matching every destination, used with FAN_OUT_BY_DEPARTURE
+# exp: {"departure": "VNO", "arrival": "*"}
+ANY_ARRIVAL = "*"
 
 # Number of months to scraping use in script/ryanair_one_way_cheap.py
 GET_DATA_MONTHS = 3
 # Number of lines otput in terminal table use in script/ryanair_one_way_cheap.py
 OUT_NUM_IN_TABLE = 20
 
+# Max concurrent API requests to one host use in script/fetch_engine.py
+# with ADAPTIVE_CONCURRENCY_ENABLED it is the starting limit
+MAX_CONCURRENT_REQUESTS_PER_HOST = 8
+
+# Adaptive (AIMD) concurrency use in script/concurrency_controller.py
+ADAPTIVE_CONCURRENCY_ENABLED = True
+ADAPTIVE_CONCURRENCY_MIN = 1
+ADAPTIVE_CONCURRENCY_MAX = 32
+ADAPTIVE_LATENCY_TARGET = 2.0  # seconds, slower responses cut the limit
+ADAPTIVE_DECREASE_FACTOR = 0.5
+ADAPTIVE_HISTORY_SIZE = 500
+
+# Fetch mode use in script/ryanair_one_way_cheap.py
+# "daily" - one request per day, "calendar" - one date range request per month
+FETCH_MODE = "daily"
+# Fan-out mode use in script/ryanair_one_way_cheap.py
+# True - one departure-only request per origin and day, split by arrival airport
+FAN_OUT_BY_DEPARTURE = False
+
+# HTTP transport settings use in script/http_transport.py
+HTTP_TIMEOUT = (5, 20)  # (connect, read) seconds
+HTTP_MAX_RETRIES = 4
+HTTP_BACKOFF_BASE = 0.5  # seconds, doubled on every retry
+HTTP_BACKOFF_MAX = 30  # seconds
+HTTP_RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+HTTP_POOL_SIZE = ADAPTIVE_CONCURRENCY_MAX  # keep-alive connections per host
+# Token bucket rate limiter: requests per second and burst size
+RATE_LIMIT_PER_SECOND = 5
+RATE_LIMIT_BURST = 10
+
+# API response cache use in script/response_cache.py
+RESPONSE_CACHE_ENABLED = True
+RESPONSE_CACHE_MAX_BYTES = 52_428_800  # 50MB
+# (days until departure, ttl seconds), first matching row is used, None - any horizon
+RESPONSE_CACHE_TTL = [
+    (3, 300),
+    (14, 900),
+    (60, 1800),
+    (None, 3600),
+]
+
+# Learned route operating days use in script/route_schedule.py
+ROUTE_SCHEDULE_ENABLED = True
+# Empty results in a row before a weekday is treated as non-operating
+SCHEDULE_MIN_EMPTY_STREAK = 3
+# Weekday stays operating this long after the last fare found
+SCHEDULE_FORGET_SECONDS = 1_209_600  # 14 days
+# Non-operating weekdays are queried again after
+SCHEDULE_REPROBE_SECONDS = 604_800  # 7 days
+# Dates without fares are not queried again for
+NEGATIVE_CACHE_TTL_SECONDS = 21_600  # 6 hours
+
+# Skip fares equal to the last fetched ones use in script/fingerprint_index.py
+FARE_FINGERPRINTS_ENABLED = True
+
+# Routes scraping processes use in script/sharded_scrape.py
+# 1 - routes are scraped one after another in the main process
+SCRAPE_PROCESSES = 1
+# Seconds a sharded run may take, has to fit the 10 minutes TIME_SETTINGS slot
+SCRAPE_DEADLINE_SECONDS = 540
+
+# Flight store use in script/flight_store.py
+# Flush the store after this many changes, 0 - only at the end of the run
+# and before scrape checkpoints
+FLIGHT_STORE_FLUSH_EVERY = 0
+
+# Flight store storage engine use in script/storage/
+# "json" - LT_SPAIN_DATA_JSON_PATH, the whole file is rewritten on every flush
+# "jsonl" - snapshot and append-only change logs in FLIGHTS_LOG_FOLDER_PATH,
+# an empty folder imports LT_SPAIN_DATA_JSON_PATH first
+# "binary" - memory-mapped BINARY_FLIGHTS_PATH, rewritten on every flush,
+# create it with script/convert_flight_store.py
+# "sqlite" - SQLITE_FLIGHTS_PATH in WAL mode, indexed by flight key, route and
+# departure time, changes are written in one transaction per flush,
+# a new database imports LT_SPAIN_DATA_JSON_PATH first
+# "sharded" - one JSON file per route and departure month in
+# SHARDED_FLIGHTS_FOLDER_PATH with a manifest, only changed shards are written,
+# departed months are frozen and not loaded,
+# an empty folder imports LT_SPAIN_DATA_JSON_PATH first
+STORAGE_ENGINE = "json"
+# The change log is compacted into the snapshot once it reaches this size
+STORAGE_COMPACT_LOG_BYTES = 4 * 1024 * 1024
+# Flights file codec of the "json" and "sharded" engines use in script/storage/codec.py,
+# every format is detected on read, a file is migrated by its next write
+# "json-pretty" - json.dump(indent=4), the format of the existing data files,
+# "json" - compact JSON, "msgpack" - MessagePack
+STORAGE_SERIALIZER = "json-pretty"
+# "none", "gzip", "zstd"
+STORAGE_COMPRESSION = "none"
+# Characters read at a time when a JSON flights file is streamed
+STREAM_CHUNK_CHARS = 64 * 1024
+
+# Cheapest flights view use in script/cheapest_view.py, it keeps OUT_NUM_IN_TABLE
+# flights per route and this many more, so a price rise of a listed flight
+# rarely needs a rescan of the route
+CHEAPEST_VIEW_SLACK = 10
+
+# Resume interrupted runs from completed (route, date) cells use in script/scrape_checkpoint.py
+SCRAPE_CHECKPOINTS_ENABLED = True
+# Older checkpoints are ignored and removed, the fares have to be fetched again
+CHECKPOINT_MAX_AGE_SECONDS = 6 * 60 * 60
+
+# Archive of raw API responses use in script/raw_archive.py and script/replay_archive.py
+RAW_ARCHIVE_ENABLED = True
+# A new segment file is started once the current one reaches this size
+RAW_ARCHIVE_SEGMENT_MAX_BYTES = 16 * 1024 * 1024
+
 # Scheduler starting time use in script/scripts_scheduler.py
 TIME_SETTINGS = [
     (1, 0), (1, 10), (1, 20), (1, 30), (1, 40), (1, 50),
@@ -0,0 +1,58 @@
+import argparse
+import logging
+import logging.config
+from logging_config import LOGGING_CONFIG
+from constants import STORAGE_ENGINE
+from count_timer import count_timer
+from storage import StorageEngine, STORAGE_ENGINES, SERIALIZERS, COMPRESSIONS, create_storage_engine
+
+
+logging.config.dictConfig(LOGGING_CONFIG)
+logger = logging.getLogger(__name__)
+
+
+@count_timer
+def convert_flight_store(source: StorageEngine, target: StorageEngine) -> int:
+    """
+    Copies every stored flight from one storage engine to another, frozen
+    shards included, replacing what the target had. The flights are read
+    in full before the target is written, so source and target may be the
+    same store, exp: to migrate a JSON file to another codec format.
+    exp: JsonFileEngine() -> BinaryFileEngine() converts LT_SPAIN_DATA_JSON_PATH
+    to BINARY_FLIGHTS_PATH.
+    Returns:
+        int: Number of converted flights.
+    """
+    flights = list(source.iter_flights())
+    target.rewrite(flights)
+    target.close()
+    logger.info(f"Converted {len(flights)} flights from '{source.path}' ({source.name}) "
+                f"to '{target.path}' ({target.name}).")
+    print(f"Converted {len(flights)} flights from '{source.path}' to '{target.path}'.")
+    return len(flights)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert the flight store between storage engines.")
+    parser.add_argument("--from", dest="source", choices=STORAGE_ENGINES, default=STORAGE_ENGINE,
+                        help="Engine to read, default - STORAGE_ENGINE.")
+    parser.add_argument("--input", default=None, help="File or folder to read, default - of the engine.")
+    parser.add_argument("--to", dest="target", choices=STORAGE_ENGINES, required=True,
+                        help="Engine to write.")
+    parser.add_argument("--output", default=None, help="File or folder to write, default - of the engine.")
+    parser.add_argument("--serializer", choices=SERIALIZERS, default=None,
+                        help="Codec of a json or sharded target, default - STORAGE_SERIALIZER.")
+    parser.add_argument("--compression", choices=COMPRESSIONS, default=None,
+                        help="Compression of a json or sharded target, default - STORAGE_COMPRESSION.")
+    args = parser.parse_args()
+
+    codec_options = {name: value for name, value in (("serializer", args.serializer),
+                                                     ("compression", args.compression)) if value}
+    if codec_options and args.target not in ("json", "sharded"):
+        parser.error("--serializer and --compression apply to json and sharded targets only.")
+    source_engine = create_storage_engine(args.source, args.input)
+    target_engine = create_storage_engine(args.target, args.output, **codec_options)
+    if (source_engine.path.resolve() == target_engine.path.resolve()
+            and source_engine.name != target_engine.name):
+        parser.error("--input and --output are the same path.")
+    convert_flight_store(source_engine, target_engine)
@@ -6,9 +6,11 @@ import pathlib
 sys.path.append(str(pathlib.Path(__file__).parent.parent))
 from count_timer import get_yesterday_timestamp
 from flight_data_process import FlightData
-from constants import LT_SPAIN_DATA_JSON_PATH, LOAD_DOTENV_PATH
-from file import read_load_json_file
-from typing import List, Tuple
+from entity_registry import get_entity_registry
+from constants import LOAD_DOTENV_PATH
+from storage import create_storage_engine
+from datetime import datetime
+from typing import Dict, Iterable, List, Tuple
 
 load_dotenv(dotenv_path=LOAD_DOTENV_PATH)
 
@@ -237,8 +239,15 @@ class CityDataInserter(DataBaseInsertion):
         Returns:
             (int) The city_id if inserted or found, otherwise None.
         """
+        registry = get_entity_registry()
+        city_key = (city_name, city_code, country_code)
+        city_id = registry.get_db_id('city', city_key)
+        if city_id:
+            return city_id
+
         city_id = self.get_existing_city_id(city_name, city_code, country_code)
         if city_id:
+            registry.set_db_id('city', city_key, city_id)
             return city_id
 
         _query_insert = """
@@ -253,6 +262,7 @@ class CityDataInserter(DataBaseInsertion):
         _city_data = (city_name, city_code, country_code)
         _table_name = 'city'
         new_city_id = self.insert_data_returning_id(_query_insert, _city_data, _table_name)
+        registry.set_db_id('city', city_key, new_city_id)
         return new_city_id
 
     def extract_city_depart_data(self, flight_data: FlightData) -> tuple:
@@ -325,6 +335,12 @@ class DepartureDataInserter(DataBaseInsertion):
         Returns:
             int | None: The departure_airport_id if inserted or found, otherwise None.
         """
+        registry = get_entity_registry()
+        airport_key = (flight_data.get_departure_airport_iata(),)
+        cached_depart_id = registry.get_db_id('departure_airport', airport_key)
+        if cached_depart_id:
+            return cached_depart_id
+
         city_inserter = CityDataInserter(self.connection)
         city_depart_data = city_inserter.extract_city_depart_data(flight_data)
         city_name, city_code, country_code = city_depart_data
@@ -347,11 +363,13 @@ class DepartureDataInserter(DataBaseInsertion):
 
         db_depart_id = self.get_depart_airport_id_from_db(depart_iata_code)
         if db_depart_id:
+            registry.set_db_id('departure_airport', airport_key, db_depart_id)
             return db_depart_id
 
         _table_name = "departure_airport"
         depart_airport_id = self.insert_data_returning_id(query, _departure_data_tuple, _table_name)
         if depart_airport_id is not None:
+            registry.set_db_id('departure_airport', airport_key, depart_airport_id)
             return depart_airport_id
         else:
             print("Error: Unable to retrieve departure airport ID.")
@@ -405,6 +423,12 @@ class ArrivalDataInserter(DataBaseInsertion):
         Returns:
             int | None: The arrival_airport_id if inserted or found, otherwise None.
         """
+        registry = get_entity_registry()
+        airport_key = (flight_data.get_arrival_airport_iata(),)
+        cached_arriv_id = registry.get_db_id('arrival_airport', airport_key)
+        if cached_arriv_id:
+            return cached_arriv_id
+
         city_inserter = CityDataInserter(self.connection)
         city_arrival_data = city_inserter.extract_city_arrival_data(flight_data)
         city_name, city_code, country_code = city_arrival_data
@@ -426,12 +450,14 @@ class ArrivalDataInserter(DataBaseInsertion):
 
         db_arriv_id = self.get_arriv_airport_id_from_db(arriv_iata_code)
         if db_arriv_id:
+            registry.set_db_id('arrival_airport', airport_key, db_arriv_id)
             return db_arriv_id
 
         _table_name = "arrival_airport"
 
         arriv_airport_id = self.insert_data_returning_id(query, _arrival_data_tuple, _table_name)
         if arriv_airport_id is not None:
+            registry.set_db_id('arrival_airport', airport_key, arriv_airport_id)
             return arriv_airport_id
         else:
             print("Error: Unable to retrieve arrival airport ID.")
@@ -796,6 +822,57 @@ class TicketDataDb(DataBaseInsertion):
         return flight_data_tuple
 
 
+class SyncedFlightsDb(DataBaseInsertion):
+    """
+    Reads what the DB already holds for every upcoming flight in one query,
+    so flights that are already in sync are not compared one by one.
+    """
+
+    def get_db_latest_prices(self, departing_from: str) -> Dict[Tuple, float | None]:
+        """
+        Latest price of every flight departing from `departing_from`, keyed
+        like TicketDataDb.get_ticket_data() looks flights up.
+        Args:
+            departing_from (str): exp: '2025-03-24 00:00:00'
+        Returns:
+            Dict[Tuple, float | None]:
+                exp: {('FR5502', '2025-05-06 18:25:00', '2025-05-06 21:50:00', 'KUN', 'AGP'): 25.99},
+                None for a flight stored more than once or without prices.
+        """
+        _query = """
+            SELECT DISTINCT ON (f.flight_id)
+                f.flight_number,
+                f.departure_date,
+                f.arrival_date,
+                da.depart_iata_code,
+                aa.arriv_iata_code,
+                tph.price
+            FROM flight f
+            JOIN departure_airport da ON f.fk_depart_airport_id = da.depart_airport_id
+            JOIN arrival_airport aa ON f.fk_arriv_airport_id = aa.arriv_airport_id
+            LEFT JOIN ticket_prices_history tph ON tph.fk_flight_id = f.flight_id
+            WHERE f.departure_date >= %s
+            ORDER BY f.flight_id, tph.price_added_date DESC
+        """
+        latest_prices = {}
+        for flight_number, departure_date, arrival_date, depart_iata, arriv_iata, price in \
+                self.fetch_data_from_db(_query, (departing_from,)):
+            key = (flight_number, departure_date, arrival_date, depart_iata.strip(), arriv_iata.strip())
+            latest_prices[key] = None if key in latest_prices else price
+        return latest_prices
+
+    @staticmethod
+    def make_key(flight_data: FlightData) -> Tuple:
+        """Returns: exp: ('FR5502', '2025-05-06 18:25:00', '2025-05-06 21:50:00', 'KUN', 'AGP')"""
+        return (
+            flight_data.get_flight_number(),
+            flight_data.get_departure_date(),
+            flight_data.get_arrival_date(),
+            flight_data.get_departure_airport_iata().strip(),
+            flight_data.get_arrival_airport_iata().strip(),
+        )
+
+
 class RunDataFlightComparison(DataBaseInsertion):
     """
     Compares input JSON flight data with existing DB data.
@@ -868,29 +945,48 @@ class RunDataFlightComparison(DataBaseInsertion):
                   f"({depart_iata_code} → {arriv_iata_code}). Skipping insert.")
             return
 
-def insert_data_to_db_main():
+def insert_data_to_db_main(flights: Iterable[dict] | None = None):
     """
-    Reads flight data from a JSON file, checks if the departure date is more
-    recent than yesterday, and inserts it into the database if it meets the criteria.
+    Reads flight data from the store, checks if the departure date is more
+    recent than yesterday, and inserts it into the database if it is not
+    there yet or its latest price differs.
+    Args:
+        flights (Iterable[dict] | None): Flight data already in memory,
+            None - the flights departing from yesterday are read from the
+            STORAGE_ENGINE store, a binary store reads only those records.
     Process:
     1. Establish a database connection.
-    2. Load flight data from the JSON file.
-    3. convert_departure_date_to_timestamp():
+    2. Read the latest price of every upcoming flight in the DB in one query.
+    3. Load flight data from the store.
+    4. convert_departure_date_to_timestamp():
         (int) - Convert each flight's departure date to a timestamp.
-    4. get_yesterday_timestamp(): (int)- yesterday's timestamp.
-    5. If the flight is recent, insert it into the database.
+    5. get_yesterday_timestamp(): (int)- yesterday's timestamp.
+    6. If the flight is recent and the DB does not hold its latest price,
+       compare it with the DB and insert it.
+    Note:
+        The skip depends only on what the DB holds, so a flight whose insert
+        failed in an earlier run is synced by the next one.
     Returns:
         None
     """
+    get_entity_registry().clear_db_ids()
     connection = db_connection(db_params)
-    read_json = read_load_json_file(LT_SPAIN_DATA_JSON_PATH)
+    yesterday_day = get_yesterday_timestamp()
+    synced_flights = SyncedFlightsDb(connection)
+    db_latest_prices = synced_flights.get_db_latest_prices(
+        datetime.fromtimestamp(yesterday_day).strftime("%Y-%m-%d %H:%M:%S"))
+    read_json = flights if flights is not None else create_storage_engine().iter_flights(
+        departing_from=yesterday_day)
+    skipped = 0
     for flight in read_json:
-        flight_data = FlightData(flight)
-        yesterday_day = get_yesterday_timestamp()
+        flight_data = FlightData.from_store(flight)
         price_updated = flight_data.convert_departure_date_to_timestamp()
-        if price_updated and price_updated > yesterday_day:
-            flight_for_compa = RunDataFlightComparison(connection)
-            flight_for_compa.compare_and_insert(flight_data)
-        else:
+        if not price_updated or price_updated <= yesterday_day:
+            continue
+        db_latest_price = db_latest_prices.get(synced_flights.make_key(flight_data))
+        if db_latest_price is not None and db_latest_price == flight_data.get_latest_price():
+            skipped += 1
             continue
-    print("Done!")
+        flight_for_compa = RunDataFlightComparison(connection)
+        flight_for_compa.compare_and_insert(flight_data)
+    print(f"Done! {skipped} flights already in sync.")
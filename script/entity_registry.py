@@ -0,0 +1,109 @@
+from typing import Dict, List, Tuple
+import logging
+import logging.config
+from logging_config import LOGGING_CONFIG
+
+
+logging.config.dictConfig(LOGGING_CONFIG)
+logger = logging.getLogger(__name__)
+
+
+class EntityRegistry:
+    """
+    Process-wide flyweight registry of airports and cities.
+    Flight entries keep their airports as nested dicts in the JSON file format;
+    interning replaces them with one shared dict per airport (by IATA code)
+    and one shared city dict per city code, so thousands of flights of the
+    same route hold a single copy. An airport or city that comes back with
+    different values becomes the new shared version.
+    The DB layer caches the ids of cities and airports here, so every flight
+    does not look the same dimension rows up again. The ids are cleared by
+    clear_db_ids() at the start of every DB sync.
+    """
+    def __init__(self):
+        self._cities: Dict[str, dict] = {}
+        self._airports: Dict[str, dict] = {}
+        self._db_ids: Dict[Tuple, int] = {}
+
+    def intern_city(self, city: dict) -> dict:
+        """
+        Returns the shared dict of a city.
+        Args:
+            city (dict): exp: {"name": "Vilnius", "code": "VILNIUS", "countryCode": "lt"}
+        """
+        code = city.get("code", "")
+        shared_city = self._cities.get(code)
+        if shared_city == city:
+            return shared_city
+        self._cities[code] = city
+        return city
+
+    def intern_airport(self, airport: dict) -> dict:
+        """
+        Returns the shared dict of an airport, its city is interned as well.
+        Args:
+            airport (dict): exp: {"countryName": "Lithuania", "iataCode": "VNO",
+                "name": "Vilnius", "city": {...}}
+        """
+        iata_code = airport.get("iataCode", "")
+        shared_airport = self._airports.get(iata_code)
+        if shared_airport == airport:
+            return shared_airport
+
+        city = airport.get("city")
+        if isinstance(city, dict):
+            shared_city = self.intern_city(city)
+            if shared_city is not city:
+                airport = {**airport, "city": shared_city}
+        self._airports[iata_code] = airport
+        return airport
+
+    def intern_flight(self, entry: dict) -> dict:
+        """
+        Replaces the departure and arrival airports of a flight entry with the shared dicts.
+        Returns:
+            dict: The same entry.
+        """
+        for airport_key in ("departureAirport", "arrivalAirport"):
+            airport = entry.get(airport_key)
+            if isinstance(airport, dict):
+                entry[airport_key] = self.intern_airport(airport)
+        return entry
+
+    def intern_flights(self, flights: List[dict]) -> List[dict]:
+        """Interns every entry of a loaded flight list in place and returns it."""
+        for entry in flights:
+            self.intern_flight(entry)
+        logger.info(f"Interned {len(flights)} flights into {len(self._airports)} airports "
+                    f"and {len(self._cities)} cities.")
+        return flights
+
+    def get_db_id(self, table_name: str, key: Tuple) -> int | None:
+        """
+        Returns a cached DB id.
+        Args:
+            table_name (str): exp: "city", "departure_airport"
+            key (Tuple): Values identifying the row, exp: ("VNO",)
+        """
+        return self._db_ids.get((table_name, *key))
+
+    def set_db_id(self, table_name: str, key: Tuple, row_id: int | None) -> None:
+        """Caches the DB id of a row, None is not cached."""
+        if row_id:
+            self._db_ids[(table_name, *key)] = row_id
+
+    def clear_db_ids(self) -> None:
+        self._db_ids.clear()
+
+
+_entity_registry: EntityRegistry | None = None
+
+
+def get_entity_registry() -> EntityRegistry:
+    """
+    Returns the process-wide EntityRegistry.
+    """
+    global _entity_registry
+    if _entity_registry is None:
+        _entity_registry = EntityRegistry()
+    return _entity_registry
@@ -0,0 +1,118 @@
+from __future__ import annotations
+import time
+from typing import Any, Dict, List
+import msgspec
+import logging
+import logging.config
+from logging_config import LOGGING_CONFIG
+
+
+logging.config.dictConfig(LOGGING_CONFIG)
+logger = logging.getLogger(__name__)
+
+
+# Typed structs with the same fields and types as script/models.py.
+# Decoding is lax like pydantic: "191.29" is accepted for a float field,
+# unknown response fields (seoName, flightKey, ...) are ignored.
+
+class City(msgspec.Struct):
+    name: str
+    code: str
+    countryCode: str
+
+
+class Airport(msgspec.Struct):
+    countryName: str
+    iataCode: str
+    name: str
+    city: City
+
+
+class FarePrice(msgspec.Struct):
+    value: float
+    currencyCode: str
+
+
+class Outbound(msgspec.Struct):
+    departureAirport: Airport
+    arrivalAirport: Airport
+    departureDate: str
+    arrivalDate: str
+    flightNumber: str
+    price: FarePrice
+    priceUpdated: int
+
+
+class PriceValue(msgspec.Struct):
+    timestamp: int
+    price: float
+
+
+class Price(msgspec.Struct):
+    prices_history: List[PriceValue]
+    currencyCode: str
+
+
+class FlightRecord(msgspec.Struct):
+    """Stored flight entry, encodes to the same JSON as FlightModel.model_dump()."""
+    departureAirport: Airport
+    arrivalAirport: Airport
+    departureDate: str
+    arrivalDate: str
+    price: Price
+    flightNumber: str
+    priceUpdated: int
+
+
+_response_decoder = msgspec.json.Decoder()
+_encoder = msgspec.json.Encoder()
+
+
+def decode_response(content: bytes) -> Dict[str, Any]:
+    """
+    Decodes API response bytes into builtin types, the faster equivalent of response.json().
+    Raises:
+        msgspec.DecodeError: If the content is not valid JSON.
+    """
+    return _response_decoder.decode(content)
+
+
+def convert_outbound(outbound: Dict[str, Any]) -> Outbound:
+    """
+    Validates the `outbound` part of one decoded fare into an Outbound struct.
+    Raises:
+        msgspec.ValidationError: If a field is missing or has a wrong type.
+    """
+    return msgspec.convert(outbound, Outbound, strict=False)
+
+
+def build_flight_record(outbound: Outbound, timestamp: int | None = None) -> FlightRecord:
+    """
+    Builds the stored flight entry of one fare with a one item price history.
+    Args:
+        outbound (Outbound): Validated outbound of the fare.
+        timestamp (int | None): Price timestamp, None - current time.
+    """
+    return FlightRecord(
+        departureAirport=outbound.departureAirport,
+        arrivalAirport=outbound.arrivalAirport,
+        departureDate=outbound.departureDate,
+        arrivalDate=outbound.arrivalDate,
+        price=Price(
+            prices_history=[PriceValue(timestamp=timestamp or int(time.time()),
+                                       price=outbound.price.value)],
+            currencyCode=outbound.price.currencyCode,
+        ),
+        flightNumber=outbound.flightNumber,
+        priceUpdated=outbound.priceUpdated,
+    )
+
+
+def flight_record_to_entry(flight_record: FlightRecord) -> Dict[str, Any]:
+    """Returns the flight entry as builtin types, the in-memory record used within a run."""
+    return msgspec.to_builtins(flight_record)
+
+
+def encode_flight_record(flight_record: FlightRecord) -> str:
+    """Returns the compact JSON string of a flight entry."""
+    return _encoder.encode(flight_record).decode("utf-8")
@@ -0,0 +1,119 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+from typing import Any, Callable, List, Tuple
+import logging
+import logging.config
+from logging_config import LOGGING_CONFIG
+from constants import (
+                    MAX_CONCURRENT_REQUESTS_PER_HOST, ADAPTIVE_CONCURRENCY_ENABLED,
+                    ADAPTIVE_CONCURRENCY_MAX)
+from concurrency_controller import get_concurrency_limiter
+
+
+logging.config.dictConfig(LOGGING_CONFIG)
+logger = logging.getLogger(__name__)
+
+
+class AsyncFetchEngine:
+    """
+    Runs blocking fetch calls concurrently on an asyncio event loop.
+    Every call is executed in a worker thread of one thread pool kept for
+    the life of the engine, and the number of calls in flight against the
+    same host is bounded by a per-host semaphore, or with `adaptive` by the
+    host AdaptiveConcurrencyLimiter.
+    The calls stay blocking on purpose: every request goes through the
+    shared HTTPTransport from script/http_transport.py, whose pooled
+    session, retries, rate limit and response observers are synchronous.
+    Attributes:
+        max_per_host (int): Maximum number of concurrent requests per host.
+        adaptive (bool): Use the adaptive limiter instead of a fixed semaphore.
+    """
+    def __init__(self, max_per_host: int = MAX_CONCURRENT_REQUESTS_PER_HOST,
+                 adaptive: bool = ADAPTIVE_CONCURRENCY_ENABLED):
+        """
+        Args:
+            max_per_host (int): Maximum number of concurrent requests per host.
+            adaptive (bool): Use the adaptive limiter instead of a fixed semaphore.
+        Raises:
+            ValueError: If max_per_host is less than 1.
+        """
+        if max_per_host < 1:
+            logger.error(f"Invalid max_per_host value: {max_per_host}")
+            raise ValueError("max_per_host must be at least 1.")
+
+        self.max_per_host = max_per_host
+        self.adaptive = adaptive
+        self._host_semaphores: dict[str, asyncio.Semaphore] = {}
+        max_workers = ADAPTIVE_CONCURRENCY_MAX if adaptive else max_per_host
+        # Threads are started on demand, so an unused engine costs nothing
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fetch")
+
+    def __enter__(self) -> "AsyncFetchEngine":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Stops the worker threads once the running calls are done."""
+        self._executor.shutdown(wait=True)
+
+    def _get_host_semaphore(self, url: str) -> asyncio.Semaphore:
+        """
+        Returns the semaphore that bounds concurrency for the host of `url`.
+        """
+        host = urlparse(url).netloc
+        if host not in self._host_semaphores:
+            self._host_semaphores[host] = asyncio.Semaphore(self.max_per_host)
+        return self._host_semaphores[host]
+
+    async def fetch(self, url: str, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        Runs one blocking fetch call in a worker thread once the host has a free slot.
+        Args:
+            url (str): URL used to pick the host concurrency limit.
+            func (Callable): Blocking function performing the request.
+            *args: Positional arguments passed to `func`.
+        Returns:
+            Any: The return value of `func`.
+        """
+        loop = asyncio.get_running_loop()
+        if not self.adaptive:
+            async with self._get_host_semaphore(url):
+                return await loop.run_in_executor(self._executor, func, *args)
+
+        limiter = get_concurrency_limiter(urlparse(url).netloc)
+        await limiter.acquire()
+        try:
+            return await loop.run_in_executor(self._executor, func, *args)
+        finally:
+            await limiter.release()
+
+    async def fetch_all(self, url: str, func: Callable[..., Any],
+                        calls_args: List[Tuple]) -> List[Any]:
+        """
+        Runs `func` once for every tuple of arguments in `calls_args` concurrently.
+        Returns:
+            List[Any]: Results in the same order as `calls_args`.
+        """
+        tasks = [self.fetch(url, func, *args) for args in calls_args]
+        return await asyncio.gather(*tasks)
+
+    def run(self, url: str, func: Callable[..., Any], calls_args: List[Tuple]) -> List[Any]:
+        """
+        Synchronous entry point: runs all calls on a fresh event loop and waits for them.
+        Args:
+            url (str): URL used to pick the host concurrency limit.
+            func (Callable): Blocking function performing the request.
+            calls_args (List[Tuple]): Arguments for each call.
+        Returns:
+            List[Any]: Results in the same order as `calls_args`.
+        """
+        self._host_semaphores = {}
+        if self.adaptive:
+            limit = get_concurrency_limiter(urlparse(url).netloc).limit
+            logger.info(f"Fetching {len(calls_args)} requests, adaptive limit {limit} per host.")
+        else:
+            logger.info(f"Fetching {len(calls_args)} requests, max {self.max_per_host} per host.")
+        return asyncio.run(self.fetch_all(url, func, calls_args))
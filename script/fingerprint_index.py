@@ -0,0 +1,128 @@
+import os
+import json
+import hashlib
+from datetime import datetime
+from pathlib import Path
+from typing import Dict
+import logging
+import logging.config
+from logging_config import LOGGING_CONFIG
+from constants import FARE_FINGERPRINTS_JSON_PATH
+
+
+logging.config.dictConfig(LOGGING_CONFIG)
+logger = logging.getLogger(__name__)
+
+
+class RunCounters:
+    """
+    Counts what happened to the fetched day responses during one run.
+    exp: {'fetched': 92, 'failed': 1, 'empty': 30, 'unchanged': 55, 'changed': 6}
+    """
+    def __init__(self):
+        self.counts: Dict[str, int] = {
+            "fetched": 0, "failed": 0, "empty": 0, "unchanged": 0, "changed": 0,
+        }
+
+    def count(self, name: str) -> None:
+        self.counts[name] = self.counts.get(name, 0) + 1
+
+    def summary(self) -> str:
+        """
+        Returns: exp: 'fetched=92 failed=1 empty=30 unchanged=55 changed=6 skipped=60%'
+        """
+        fetched = self.counts["fetched"]
+        skipped_share = self.counts["unchanged"] / fetched * 100 if fetched else 0
+        counts = " ".join(f"{name}={value}" for name, value in self.counts.items())
+        return f"{counts} skipped={skipped_share:.0f}%"
+
+
+class FareFingerprintIndex:
+    """
+    Index of the last normalized fare seen for every (route, departure day).
+    A day response with the same fingerprint as last time has nothing new,
+    so model building and the store merge are skipped for it, as long as
+    the flight store still holds the flight.
+    New fingerprints are kept in memory and written by save() at the end of
+    the run, so a run that fails before that is fully processed again.
+    """
+    def __init__(self, json_file_path: str = FARE_FINGERPRINTS_JSON_PATH):
+        """
+        Args:
+            json_file_path (str): Path of the index JSON file.
+        """
+        self.path = Path(json_file_path)
+        self.fingerprints: Dict[str, str] = {}
+        self.counters = RunCounters()
+
+    def load(self) -> "FareFingerprintIndex":
+        """Loads the index, a missing or invalid file gives an empty index."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                self.fingerprints = json.load(file)
+        except FileNotFoundError:
+            logger.info(f"Fingerprint index '{self.path}' not found. Starting empty.")
+        except json.JSONDecodeError:
+            logger.error(f"Error decoding fingerprint index '{self.path}'. Starting empty.")
+        return self
+
+    def save(self) -> None:
+        """Writes the index atomically, days already in the past are dropped."""
+        today = datetime.today().strftime("%Y-%m-%d")
+        self.fingerprints = {
+            key: fingerprint for key, fingerprint in self.fingerprints.items()
+            if key[-10:] >= today
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_suffix(".tmp")
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump(self.fingerprints, file)
+        os.replace(temp_path, self.path)
+        logger.info(f"Fingerprint index saved with {len(self.fingerprints)} entries.")
+
+    @staticmethod
+    def make_key(outbound: dict) -> str:
+        """
+        Returns: exp: 'VNO-BCN-2025-03-25'
+        """
+        return (f"{outbound['departureAirport']['iataCode']}-"
+                f"{outbound['arrivalAirport']['iataCode']}-"
+                f"{outbound['departureDate'][:10]}")
+
+    @staticmethod
+    def fingerprint(outbound: dict) -> str:
+        """
+        Hash of the outbound fields stored for a flight, `priceUpdated` is left
+        out because a new update time with the same price changes nothing.
+        """
+        normalized = (
+            outbound['departureAirport']['iataCode'],
+            outbound['arrivalAirport']['iataCode'],
+            outbound['departureDate'],
+            outbound['arrivalDate'],
+            outbound['flightNumber'],
+            outbound['price']['value'],
+            outbound['price']['currencyCode'],
+        )
+        return hashlib.blake2b(repr(normalized).encode("utf-8"), digest_size=16).hexdigest()
+
+    def is_unchanged(self, outbound: dict) -> bool:
+        """Checks if the fare is the same as the last one seen for its route and day."""
+        return self.fingerprints.get(self.make_key(outbound)) == self.fingerprint(outbound)
+
+    def update(self, outbound: dict) -> None:
+        """Stores the fare fingerprint."""
+        self.fingerprints[self.make_key(outbound)] = self.fingerprint(outbound)
+
+
+_fingerprint_index: FareFingerprintIndex | None = None
+
+
+def get_fare_fingerprint_index() -> FareFingerprintIndex:
+    """
+    Returns the process-wide FareFingerprintIndex, loading it on first use.
+    """
+    global _fingerprint_index
+    if _fingerprint_index is None:
+        _fingerprint_index = FareFingerprintIndex().load()
+    return _fingerprint_index
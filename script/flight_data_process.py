@@ -1,8 +1,36 @@
+import time
 from typing import List, Dict
 from datetime import datetime
 
 
+_UNSET = object()
+
+
+def _parse_date(date_str: str) -> datetime | None:
+    try:
+        return datetime.fromisoformat(date_str)
+    except (TypeError, ValueError):
+        return None
+
+
+def _format_date(date: datetime) -> str:
+    """Returns: '2025-05-02 11:15:00', the same as strftime('%Y-%m-%d %H:%M:%S')."""
+    if date.tzinfo is None and not date.microsecond:
+        return date.isoformat(sep=" ")
+    return date.strftime('%Y-%m-%d %H:%M:%S')
+
+
 class FlightData:
+    """
+    Read view of one flight entry in the JSON file format.
+    Dates, the departure timestamp, the direction and the latest price are
+    parsed once on first use and kept in slots. The entry dict stays the
+    stored data: new prices have to be added with append_price(),
+    which keeps the cached latest price in step.
+    """
+    __slots__ = ("json_data", "_departure_date", "_departure_timestamp",
+                 "_arrival_date", "_direction", "_latest_price")
+
     def __init__(self, json_data: Dict):
         """
         Initialize the FlightData object from provided JSON data.
@@ -10,6 +38,82 @@ class FlightData:
             json_data (Dict): JSON data structure containing flight details.
         """
         self.json_data = json_data
+        self._departure_date = _UNSET
+        self._departure_timestamp = _UNSET
+        self._arrival_date = _UNSET
+        self._direction = _UNSET
+        self._latest_price = _UNSET
+
+    @classmethod
+    def from_store(cls, entry: Dict) -> "FlightData":
+        """
+        Builds a FlightData from an entry of the flight store, the departure
+        date and latest price used by sort and compare loops are parsed right away.
+        Args:
+            entry (Dict): Flight entry in the JSON file format.
+        """
+        flight = cls(entry)
+        flight._departure_date = _parse_date(entry.get("departureDate", ""))
+        try:
+            flight._latest_price = float(entry["price"]["prices_history"][-1]["price"])
+        except (KeyError, IndexError, TypeError, ValueError):
+            pass
+        return flight
+
+    @property
+    def departure_date(self) -> datetime | None:
+        """Parsed departure date, None if it is not a valid ISO date."""
+        if self._departure_date is _UNSET:
+            self._departure_date = _parse_date(self.json_data.get("departureDate", ""))
+        return self._departure_date
+
+    @property
+    def departure_timestamp(self) -> int | None:
+        """Departure date as a Unix timestamp in local time, exp: 1744944300."""
+        if self._departure_timestamp is _UNSET:
+            departure_date = self.departure_date
+            self._departure_timestamp = int(
+                departure_date.replace(tzinfo=None, microsecond=0).timestamp()
+            ) if departure_date else None
+        return self._departure_timestamp
+
+    @property
+    def arrival_date(self) -> datetime | None:
+        """Parsed arrival date, None if it is not a valid ISO date."""
+        if self._arrival_date is _UNSET:
+            self._arrival_date = _parse_date(self.json_data.get("arrivalDate", ""))
+        return self._arrival_date
+
+    @property
+    def latest_price(self) -> float:
+        """The last price of the price history, 0.0 without valid prices."""
+        if self._latest_price is _UNSET:
+            price_list = self.get_prices_list()
+            self._latest_price = price_list[-1] if price_list else 0.0
+        return self._latest_price
+
+    @property
+    def direction(self) -> str:
+        """exp: Vilnius (VNO) -> Barcelona (BCN)"""
+        if self._direction is _UNSET:
+            self._direction = (
+                f"{self.get_departure_city_name()} ({self.get_departure_airport_iata()}) -> "
+                f"{self.get_arrival_city_name()} ({self.get_arrival_airport_iata()})")
+        return self._direction
+
+    def append_price(self, price: float, timestamp: int | None = None) -> dict:
+        """
+        Appends a price to the price history of the entry.
+        Args:
+            price (float): The new price.
+            timestamp (int | None): Time of the price, None - current time.
+        Returns:
+            dict: The added price entry, exp: {'timestamp': 1742751829, 'price': 191.29}
+        """
+        price_entry = {"timestamp": timestamp or int(time.time()), "price": price}
+        self.json_data.setdefault("price", {}).setdefault("prices_history", []).append(price_entry)
+        self._latest_price = float(price)
+        return price_entry
 
     def get_departure_country_name(self) -> str:
         return self.json_data.get("departureAirport", {}).get("countryName", "")
@@ -33,12 +137,10 @@ class FlightData:
         """
         Returns: '2025-05-02 11:15:00'
         """
-        departure_date_str = self.json_data.get("departureDate", "")
-        try:
-            departure_date = datetime.fromisoformat(departure_date_str)
-            return departure_date if not as_string else departure_date.strftime('%Y-%m-%d %H:%M:%S')
-        except ValueError:
-            return departure_date_str if as_string else None
+        departure_date = self.departure_date
+        if not as_string:
+            return departure_date
+        return _format_date(departure_date) if departure_date else self.json_data.get("departureDate", "")
 
     def convert_departure_date_to_timestamp(self) -> int:
         """
@@ -46,13 +148,7 @@ class FlightData:
         input: (str) get_departure_date() - 2025-10-05 05:45:00
         Returns: (int) 1744944300
         """
-        date_str = self.get_departure_date()
-        try:
-            departure_time = datetime.strptime(date_str, "%Y-%m-%d %H:%M:%S")
-            departure_timestamp = int(departure_time.timestamp())
-            return departure_timestamp
-        except ValueError:
-            return None
+        return self.departure_timestamp
 
     def get_arrival_country_name(self) -> str:
         return self.json_data.get("arrivalAirport", {}).get("countryName", "")
@@ -74,12 +170,10 @@ class FlightData:
 
 
     def get_arrival_date(self, as_string: bool = True) -> str:
-        arrival_date_str = self.json_data.get("arrivalDate", "")
-        try:
-            arrival_date = datetime.fromisoformat(arrival_date_str)
-            return arrival_date if not as_string else arrival_date.strftime('%Y-%m-%d %H:%M:%S')
-        except ValueError:
-            return arrival_date_str if as_string else None
+        arrival_date = self.arrival_date
+        if not as_string:
+            return arrival_date
+        return _format_date(arrival_date) if arrival_date else self.json_data.get("arrivalDate", "")
 
     def get_price_values(self) -> List[dict]:
         """ Returns:
@@ -155,8 +249,7 @@ class FlightData:
 
     def get_latest_price(self) -> float:
         """Get the latest price from the price list."""
-        price_list = self.get_prices_list()
-        return price_list[-1] if price_list else 0.0
+        return self.latest_price
 
     def get_latest_prices_timestamp(self) -> int:
         """Get the latest timestamp from the timestamp list.
@@ -168,12 +261,7 @@ class FlightData:
     def get_direction(self) -> str:
         """ Returns(str) direction
         exp: Vilnius (VNO) -> Barcelona (BCN)"""
-        departure_city = self.get_departure_city_name()
-        arrival_city = self.get_arrival_city_name()
-        departure_iata = self.get_departure_airport_iata()
-        arrival_iata = self.get_arrival_airport_iata()
-
-        return f"{departure_city} ({departure_iata}) -> {arrival_city} ({arrival_iata})"
+        return self.direction
 
     def to_table_formated_dict(self) -> Dict:
         """
@@ -0,0 +1,272 @@
+from typing import Dict, List, Set
+import logging
+import logging.config
+from logging_config import LOGGING_CONFIG
+from constants import FLIGHT_STORE_FLUSH_EVERY, OUT_NUM_IN_TABLE
+from flight_data_process import FlightData
+from json_data_process import add_price_and_timestamp_to_existing_entry_values
+from entity_registry import get_entity_registry
+from cheapest_view import CheapestFlightsView
+from storage import StorageEngine, FlightKey, make_flight_key, create_storage_engine
+
+
+logging.config.dictConfig(LOGGING_CONFIG)
+logger = logging.getLogger(__name__)
+
+
+class FlightStore:
+    """
+    Run-scoped in-memory copy of the stored flights.
+    The flights are loaded once, every scraped day is merged into memory and
+    the changes are written by flush(): at the end of the run, before scrape
+    checkpoints and, with `flush_every`, after that many changes. The
+    on-disk format is up to the StorageEngine, see STORAGE_ENGINE.
+    The cheapest flights table is read from the CheapestFlightsView kept
+    up to date with `flights`.
+    Entries are indexed by (departure iata, arrival iata, departure date) and
+    by flight number, so lookups and upserts do not scan the flights.
+    `flights` has to be changed through add(), delete() and merge() to keep
+    the indexes, the engine and the cheapest flights view in step. delete()
+    moves the last flight into the freed position, so it does not rebuild
+    the list.
+    """
+    def __init__(self, engine: StorageEngine | None = None,
+                 flush_every: int = FLIGHT_STORE_FLUSH_EVERY,
+                 cheapest_view: CheapestFlightsView | None = None):
+        """
+        Args:
+            engine (StorageEngine | None): Storage of the flights, None - STORAGE_ENGINE.
+            flush_every (int): Flush after this many changes, 0 - only on flush().
+            cheapest_view (CheapestFlightsView | None): View of the cheapest flights,
+                None - the one saved in CHEAPEST_FLIGHTS_JSON_PATH.
+        """
+        self.engine = engine or create_storage_engine()
+        self.cheapest_view = cheapest_view or CheapestFlightsView()
+        self.path = self.engine.path
+        self.flush_every = flush_every
+        self.flights: List[dict] = []
+        self._index: Dict[FlightKey, dict] = {}
+        self._keys_by_flight_number: Dict[str, Set[FlightKey]] = {}
+        self._positions: Dict[int, int] = {}
+        self._unflushed_changes = 0
+        self.changes = 0
+
+    def load(self) -> "FlightStore":
+        """Reads the stored flights, nothing stored yet gives an empty store."""
+        self.flights = get_entity_registry().intern_flights(self.engine.load())
+        self._index = {}
+        self._keys_by_flight_number = {}
+        self._positions = {id(entry): position for position, entry in enumerate(self.flights)}
+        for entry in self.flights:
+            if not self._index_entry(entry):
+                logger.warning(f"Duplicate flight {self.make_key(entry)} in '{self.path}', "
+                               f"the first entry is used.")
+        self._unflushed_changes = 0
+        self.cheapest_view.load(self.flights, self.engine.signature())
+        logger.info(f"Flight store loaded {len(self.flights)} flights from '{self.path}'.")
+        return self
+
+    @staticmethod
+    def make_key(entry: dict) -> FlightKey:
+        """
+        Returns: exp: ('VNO', 'BCN', '2025-03-25 17:05:00'), see make_flight_key().
+        """
+        return make_flight_key(entry)
+
+    def _index_entry(self, entry: dict, key: FlightKey | None = None) -> bool:
+        """Adds an entry to the indexes, False if its key is already taken."""
+        key = key or self.make_key(entry)
+        if key in self._index:
+            return False
+        self._index[key] = entry
+        flight_number = entry.get("flightNumber", "")
+        self._keys_by_flight_number.setdefault(flight_number, set()).add(key)
+        return True
+
+    def __len__(self) -> int:
+        return len(self.flights)
+
+    def __contains__(self, key: FlightKey) -> bool:
+        return key in self._index
+
+    def get(self, key: FlightKey) -> dict | None:
+        """Returns the entry of a flight key or None."""
+        return self._index.get(key)
+
+    def find(self, entry: dict) -> dict | None:
+        """Returns the stored entry of the same flight as `entry` or None."""
+        return self._index.get(self.make_key(entry))
+
+    def find_by_flight_number(self, flight_number: str) -> List[dict]:
+        """Returns the entries of a flight number, exp: "FR1787"."""
+        return [self._index[key] for key in self._keys_by_flight_number.get(flight_number, ())]
+
+    def add(self, entry: dict) -> None:
+        """
+        Appends a new flight entry.
+        Raises:
+            ValueError: If the store already has an entry with the same key.
+        """
+        key = self.make_key(entry)
+        if not self._index_entry(entry, key):
+            logger.error(f"Flight {key} is already in the store.")
+            raise ValueError("Flight is already in the store, use merge().")
+        self._positions[id(entry)] = len(self.flights)
+        self.flights.append(entry)
+        self.engine.record_add(key, entry)
+        self.cheapest_view.update(key, entry)
+        self.mark_changed()
+
+    def delete(self, key: FlightKey) -> dict | None:
+        """
+        Removes the entry of a flight key.
+        Returns:
+            dict | None: The removed entry, None if the key is not in the store.
+        """
+        entry = self._index.pop(key, None)
+        if entry is None:
+            return None
+        flight_number_keys = self._keys_by_flight_number.get(entry.get("flightNumber", ""), set())
+        flight_number_keys.discard(key)
+        if not flight_number_keys:
+            self._keys_by_flight_number.pop(entry.get("flightNumber", ""), None)
+        self._remove_from_flights(entry)
+        self.engine.record_delete(key)
+        self.cheapest_view.remove(key)
+        self.mark_changed()
+        return entry
+
+    def _remove_from_flights(self, entry: dict) -> None:
+        """Swaps the last flight into the position of `entry` and drops the last position."""
+        position = self._positions.pop(id(entry))
+        last_entry = self.flights.pop()
+        if last_entry is not entry:
+            self.flights[position] = last_entry
+            self._positions[id(last_entry)] = position
+
+    @property
+    def is_dirty(self) -> bool:
+        return self._unflushed_changes > 0
+
+    def mark_changed(self, changes: int = 1) -> None:
+        """Counts changes made through add(), delete() and merge() and flushes if due."""
+        self._unflushed_changes += changes
+        self.changes += changes
+        if self.flush_every and self._unflushed_changes >= self.flush_every:
+            self.flush()
+
+    def merge(self, new_entry: dict) -> str:
+        """
+        Merges one new flight entry in memory: a flight with a new key is
+        added, a price not yet in the price history of the stored flight is
+        appended with the timestamp of the new entry, anything else is left
+        as it is.
+        Args:
+            new_entry (dict): Flight entry from update_one_way_flight_json_schema().
+        Returns:
+            str: A message indicating whether the entry was updated or added.
+        """
+        new_flight = FlightData(new_entry)
+        new_price = new_flight.get_latest_price()
+        key = self.make_key(new_entry)
+        existing_entry = self._index.get(key)
+
+        if existing_entry is None:
+            self.add(new_entry)
+            return f"Added new entry to {self.path}, new price: {new_price}"
+
+        all_prices = FlightData(existing_entry).get_prices_list()
+        if new_price in all_prices:
+            logger.info("No update needed. The price is already in the entry.")
+            return f"No update needed. The price {new_price} is already in entry: {all_prices}"
+
+        add_price_and_timestamp_to_existing_entry_values(existing_entry,
+                                                         new_price,
+                                                         new_flight.get_latest_prices_timestamp())
+        existing_entry['priceUpdated'] = new_flight.get_price_updated_dates()
+        self.engine.record_price(key,
+                                 existing_entry['price']['prices_history'][-1],
+                                 existing_entry['priceUpdated'])
+        self.cheapest_view.update(key, existing_entry)
+        self.mark_changed()
+        return f"Updated entry with new price: {new_price} in entry: {all_prices}"
+
+    def merge_many(self, new_entries: List[dict]) -> int:
+        """
+        Merges flight entries in the given order.
+        Returns:
+            int: Number of added entries and prices.
+        """
+        changes_before = self.changes
+        for new_entry in new_entries:
+            self.merge(new_entry)
+        return self.changes - changes_before
+
+    def flush(self, force: bool = False) -> None:
+        """
+        Writes the changes made since the last flush.
+        Args:
+            force (bool): Replace everything stored with `flights`, even without changes.
+        """
+        if force:
+            self.engine.rewrite(self.flights)
+        elif self.is_dirty:
+            self.engine.flush(self.flights)
+        else:
+            return
+        logger.info(f"Flight store flushed {self._unflushed_changes} changes, "
+                    f"{len(self.flights)} flights to '{self.path}' ({self.engine.name}).")
+        self._unflushed_changes = 0
+
+    def cheapest_flights(self, num_results: int = OUT_NUM_IN_TABLE,
+                         departure_iata: str | None = None,
+                         arrival_iata: str | None = None) -> List[dict]:
+        """
+        The cheapest upcoming flights, overall or of one route, read from the
+        cheapest flights view. Routes the view can not answer any more are
+        rescanned first.
+        Args:
+            num_results (int): Number of flights, up to OUT_NUM_IN_TABLE.
+            departure_iata (str | None): Only this departure, exp: "VNO", None - all.
+            arrival_iata (str | None): Only this arrival, exp: "BCN", None - all.
+        Returns:
+            List[dict]: Flight entries, cheapest first.
+        """
+        stale_routes = self.cheapest_view.stale_routes()
+        if stale_routes:
+            self.cheapest_view.rebuild(self.flights, stale_routes)
+        return [self._index[key]
+                for key in self.cheapest_view.cheapest(num_results, departure_iata, arrival_iata)
+                if key in self._index]
+
+    def close(self) -> None:
+        """
+        Waits for background work of the storage engine, exp: a log compaction,
+        and saves the cheapest flights view if everything is flushed.
+        """
+        self.engine.close()
+        if not self.is_dirty:
+            self.cheapest_view.save(self.engine.signature())
+
+
+_flight_store: FlightStore | None = None
+
+
+def open_flight_store(engine: StorageEngine | None = None) -> FlightStore:
+    """
+    Starts the flight store of a new run, loading the stored flights again.
+    Args:
+        engine (StorageEngine | None): Storage of the flights, None - STORAGE_ENGINE.
+    """
+    global _flight_store
+    _flight_store = FlightStore(engine).load()
+    return _flight_store
+
+
+def get_flight_store() -> FlightStore:
+    """
+    Returns the flight store of the current run, opening it on first use.
+    """
+    if _flight_store is None:
+        return open_flight_store()
+    return _flight_store
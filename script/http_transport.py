@@ -0,0 +1,248 @@
+import time
+import random
+import threading
+import multiprocessing
+from urllib.parse import urlparse
+from typing import Callable, List
+import requests
+from requests.adapters import HTTPAdapter
+import logging
+import logging.config
+from logging_config import LOGGING_CONFIG
+from constants import (
+                    HTTP_TIMEOUT, HTTP_MAX_RETRIES, HTTP_BACKOFF_BASE,
+                    HTTP_BACKOFF_MAX, HTTP_RETRY_STATUS_CODES,
+                    RATE_LIMIT_PER_SECOND, RATE_LIMIT_BURST,
+                    HTTP_POOL_SIZE)
+
+
+logging.config.dictConfig(LOGGING_CONFIG)
+logger = logging.getLogger(__name__)
+
+
+ResponseObserver = Callable[[str, int | None, float], None]
+_response_observers: List[ResponseObserver] = []
+
+
+def add_response_observer(observer: ResponseObserver) -> None:
+    """
+    Registers a callback called after every request attempt of every transport
+    with (host, status code or None on connection error, latency in seconds).
+    """
+    if observer not in _response_observers:
+        _response_observers.append(observer)
+
+
+def _notify_response_observers(url: str, status_code: int | None, latency: float) -> None:
+    host = urlparse(url).netloc
+    for observer in _response_observers:
+        try:
+            observer(host, status_code, latency)
+        except Exception as e:
+            logger.error(f"Response observer {observer} failed: {e}")
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter.
+    Tokens are refilled continuously at `rate` per second up to `capacity`,
+    every request takes one token and waits while the bucket is empty.
+    """
+    def __init__(self, rate: float = RATE_LIMIT_PER_SECOND, capacity: int = RATE_LIMIT_BURST):
+        """
+        Args:
+            rate (float): Tokens added per second.
+            capacity (int): Maximum number of tokens, the allowed burst size.
+        Raises:
+            ValueError: If rate or capacity is not positive.
+        """
+        if rate <= 0 or capacity <= 0:
+            logger.error(f"Invalid token bucket settings: rate={rate}, capacity={capacity}")
+            raise ValueError("Token bucket rate and capacity must be positive.")
+
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def acquire(self) -> float:
+        """
+        Takes one token, sleeping until one is available.
+        Returns:
+            float: Seconds spent waiting for the token.
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                wait_time = (1 - self._tokens) / self.rate
+            time.sleep(wait_time)
+            waited += wait_time
+
+
+class SharedTokenBucket(TokenBucket):
+    """
+    Token bucket whose state lives in shared memory, so a pool of worker
+    processes draws from one global request budget.
+    Create it in the parent process and pass it to the workers at start,
+    exp: as ProcessPoolExecutor initargs.
+    """
+    def __init__(self, rate: float = RATE_LIMIT_PER_SECOND, capacity: int = RATE_LIMIT_BURST,
+                 mp_context=None):
+        """
+        Args:
+            rate (float): Tokens added per second for all processes together.
+            capacity (int): Maximum number of tokens, the allowed burst size.
+            mp_context: multiprocessing context used to create shared values.
+        Raises:
+            ValueError: If rate or capacity is not positive.
+        """
+        if rate <= 0 or capacity <= 0:
+            logger.error(f"Invalid token bucket settings: rate={rate}, capacity={capacity}")
+            raise ValueError("Token bucket rate and capacity must be positive.")
+
+        mp_context = mp_context or multiprocessing.get_context()
+        self.rate = rate
+        self.capacity = capacity
+        self._shared_tokens = mp_context.RawValue('d', float(capacity))
+        self._shared_updated_at = mp_context.RawValue('d', time.monotonic())
+        self._lock = mp_context.Lock()
+
+    @property
+    def _tokens(self) -> float:
+        return self._shared_tokens.value
+
+    @_tokens.setter
+    def _tokens(self, value: float) -> None:
+        self._shared_tokens.value = value
+
+    @property
+    def _updated_at(self) -> float:
+        return self._shared_updated_at.value
+
+    @_updated_at.setter
+    def _updated_at(self, value: float) -> None:
+        self._shared_updated_at.value = value
+
+
+class HttpTransport:
+    """
+    Shared HTTP transport for the scraper modules.
+    Keeps a pooled keep-alive session, applies per-request timeouts,
+    retries 429/5xx and connection errors with exponential jittered backoff
+    and passes every request through a token bucket rate limiter.
+    """
+    def __init__(self,
+                 timeout: tuple = HTTP_TIMEOUT,
+                 max_retries: int = HTTP_MAX_RETRIES,
+                 backoff_base: float = HTTP_BACKOFF_BASE,
+                 backoff_max: float = HTTP_BACKOFF_MAX,
+                 rate_limiter: TokenBucket | None = None,
+                 pool_size: int = HTTP_POOL_SIZE):
+        """
+        Args:
+            timeout (tuple): (connect, read) timeout in seconds.
+            max_retries (int): Number of retries after the first attempt.
+            backoff_base (float): First backoff delay in seconds.
+            backoff_max (float): Upper bound of one backoff delay in seconds.
+            rate_limiter (TokenBucket | None): Limiter shared by all requests,
+                a new TokenBucket from constants when None.
+            pool_size (int): Number of keep-alive connections kept per host.
+        """
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.rate_limiter = rate_limiter or TokenBucket()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def backoff_delay(self, attempt: int) -> float:
+        """
+        Exponential backoff with full jitter: random delay in [0, base * 2**attempt].
+        """
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def _retry_after_delay(self, response: requests.Response, attempt: int) -> float:
+        """
+        Uses the `Retry-After` header in seconds when the server sends one.
+        """
+        retry_after = response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return min(self.backoff_max, float(retry_after))
+        return self.backoff_delay(attempt)
+
+    def get(self, url: str, params: dict | None = None) -> requests.Response:
+        """
+        Sends a GET request with rate limiting, timeout and retries.
+        Args:
+            url (str): Request URL.
+            params (dict | None): Query parameters.
+        Returns:
+            requests.Response: Successful response.
+        Raises:
+            requests.exceptions.RequestException: When all attempts failed.
+        """
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire()
+            started_at = time.monotonic()
+            try:
+                response = self.session.get(url, params=params, timeout=self.timeout)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as err:
+                _notify_response_observers(url, None, time.monotonic() - started_at)
+                if attempt == self.max_retries:
+                    raise
+                delay = self.backoff_delay(attempt)
+                logger.warning(f"Request to {url} failed: {err}. Retry {attempt + 1} in {delay:.2f}s.")
+                time.sleep(delay)
+                continue
+
+            _notify_response_observers(url, response.status_code, time.monotonic() - started_at)
+            if response.status_code in HTTP_RETRY_STATUS_CODES and attempt < self.max_retries:
+                delay = self._retry_after_delay(response, attempt)
+                logger.warning(f"Request to {url} returned {response.status_code}. "
+                               f"Retry {attempt + 1} in {delay:.2f}s.")
+                response.close()
+                time.sleep(delay)
+                continue
+
+            response.raise_for_status()
+            return response
+
+
+_http_transport: HttpTransport | None = None
+_http_transport_lock = threading.Lock()
+
+
+def get_http_transport() -> HttpTransport:
+    """
+    Returns the process-wide HttpTransport, creating it on first use.
+    """
+    global _http_transport
+    with _http_transport_lock:
+        if _http_transport is None:
+            _http_transport = HttpTransport()
+        return _http_transport
+
+
+def configure_http_transport(rate_limiter: TokenBucket) -> HttpTransport:
+    """
+    Replaces the process-wide HttpTransport with one using `rate_limiter`,
+    exp: a SharedTokenBucket in a worker process.
+    """
+    global _http_transport
+    with _http_transport_lock:
+        _http_transport = HttpTransport(rate_limiter=rate_limiter)
+        return _http_transport
@@ -0,0 +1,47 @@
+from typing import List
+import numpy as np
+import logging
+import logging.config
+from logging_config import LOGGING_CONFIG
+
+
+logging.config.dictConfig(LOGGING_CONFIG)
+logger = logging.getLogger(__name__)
+
+
+class PriceHistory:
+    """
+    Price history of one flight in typed arrays: int64 timestamps and
+    float64 prices, in the order the prices were added, and a flag for the
+    prices that were ints in JSON, exp: 191 and not 191.0.
+    Built on the price arrays of a binary flight file and converted
+    losslessly to the JSON layout of `price.prices_history`:
+        [{"timestamp": 1742751829, "price": 191.29}, ...]
+    """
+    __slots__ = ("timestamps", "prices", "integral")
+
+    def __init__(self, timestamps: np.ndarray, prices: np.ndarray,
+                 integral: np.ndarray | None = None):
+        """
+        Args:
+            timestamps (np.ndarray): Price timestamps.
+            prices (np.ndarray): Prices, the same length as `timestamps`.
+            integral (np.ndarray | None): True for the prices written as ints,
+                None - every price is a float.
+        Raises:
+            ValueError: If the arrays have different lengths.
+        """
+        if len(timestamps) != len(prices) or (integral is not None and len(integral) != len(prices)):
+            logger.error(f"Price history arrays differ: {len(timestamps)} timestamps, {len(prices)} prices")
+            raise ValueError("timestamps, prices and integral must have the same length.")
+        self.timestamps = np.asarray(timestamps, dtype=np.int64)
+        self.prices = np.asarray(prices, dtype=np.float64)
+        self.integral = (np.zeros(len(self.prices), dtype=np.bool_) if integral is None
+                         else np.asarray(integral, dtype=np.bool_))
+
+    def to_json(self) -> List[dict]:
+        """Returns: exp: [{"timestamp": 1742751829, "price": 191.29}], ints stay ints."""
+        return [{"timestamp": timestamp, "price": int(price) if is_int else price}
+                for timestamp, price, is_int in zip(self.timestamps.tolist(),
+                                                    self.prices.tolist(),
+                                                    self.integral.tolist())]
@@ -0,0 +1,139 @@
+import os
+import gzip
+import json
+import time
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List
+import logging
+import logging.config
+from logging_config import LOGGING_CONFIG
+from constants import RAW_ARCHIVE_FOLDER_PATH, RAW_ARCHIVE_SEGMENT_MAX_BYTES
+
+
+logging.config.dictConfig(LOGGING_CONFIG)
+logger = logging.getLogger(__name__)
+
+
+INDEX_FILE_NAME = "index.json"
+
+
+class RawResponseArchive:
+    """
+    Append-only archive of raw API fare responses.
+    Records are buffered and written by flush() as one gzip member appended
+    to the current segment file, segment-000001.jsonl.gz, segment-000002.jsonl.gz, ...
+    A new segment is started once the current one reaches `segment_max_bytes`.
+    Written segments are never changed. index.json keeps the record count,
+    size and fetch time range of every segment.
+    exp record: {"fetched_at": 1742751829, "search_date": "2025-03-25", "data": {"fares": [...]}}
+    """
+    def __init__(self, folder_path: str = RAW_ARCHIVE_FOLDER_PATH,
+                 segment_max_bytes: int = RAW_ARCHIVE_SEGMENT_MAX_BYTES):
+        """
+        Args:
+            folder_path (str): Folder with segment files and the index.
+            segment_max_bytes (int): Size at which a new segment is started.
+        """
+        self.folder_path = Path(folder_path)
+        self.segment_max_bytes = segment_max_bytes
+        self.index_path = self.folder_path / INDEX_FILE_NAME
+        self.index: Dict[str, dict] = self._load_index()
+        self._buffer: List[dict] = []
+
+    def _load_index(self) -> Dict[str, dict]:
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return self._index_from_segments()
+        except json.JSONDecodeError:
+            logger.error(f"Error decoding archive index '{self.index_path}'. Rebuilding from segments.")
+            return self._index_from_segments()
+
+    def _index_from_segments(self) -> Dict[str, dict]:
+        """Index entries of segment files found on disk, counts and times unknown."""
+        return {path.name: {"records": None, "bytes": path.stat().st_size,
+                            "first_fetched_at": None, "last_fetched_at": None}
+                for path in self.segment_paths()}
+
+    def _save_index(self) -> None:
+        temp_path = self.index_path.with_suffix(".tmp")
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump(self.index, file, indent=4)
+        os.replace(temp_path, self.index_path)
+
+    def segment_paths(self) -> List[Path]:
+        """Returns segment files in the order they were written."""
+        return sorted(self.folder_path.glob("segment-*.jsonl.gz"))
+
+    def _current_segment_name(self) -> str:
+        names = sorted(self.index)
+        if names and self.index[names[-1]]["bytes"] < self.segment_max_bytes:
+            return names[-1]
+        return f"segment-{len(names) + 1:06d}.jsonl.gz"
+
+    def append(self, search_date: datetime, one_way_fares: dict) -> None:
+        """
+        Buffers one raw response, it is written on the next flush().
+        Args:
+            search_date (datetime): The date the fares were fetched for.
+            one_way_fares (dict): Response data from get_one_way_cheap_flight().
+        """
+        self._buffer.append({
+            "fetched_at": int(time.time()),
+            "search_date": search_date.strftime("%Y-%m-%d"),
+            "data": one_way_fares,
+        })
+
+    def flush(self) -> None:
+        """Appends buffered records to the current segment and updates the index."""
+        if not self._buffer:
+            return
+        self.folder_path.mkdir(parents=True, exist_ok=True)
+        segment_name = self._current_segment_name()
+        segment_path = self.folder_path / segment_name
+        payload = "".join(json.dumps(record, separators=(",", ":")) + "\n" for record in self._buffer)
+        with open(segment_path, 'ab') as file:
+            file.write(gzip.compress(payload.encode("utf-8")))
+            file.flush()
+            os.fsync(file.fileno())
+
+        segment_info = self.index.setdefault(segment_name, {
+            "records": 0, "bytes": 0,
+            "first_fetched_at": self._buffer[0]["fetched_at"], "last_fetched_at": None,
+        })
+        if segment_info["records"] is not None:
+            segment_info["records"] += len(self._buffer)
+        segment_info["bytes"] = segment_path.stat().st_size
+        segment_info["last_fetched_at"] = self._buffer[-1]["fetched_at"]
+        self._save_index()
+        logger.info(f"Archived {len(self._buffer)} raw responses to '{segment_path}'.")
+        self._buffer.clear()
+
+
+def read_segment(segment_path: str) -> Iterator[dict]:
+    """
+    Yields the records of one segment file in the order they were written.
+    A gzip member cut off by a crash ends the segment.
+    """
+    try:
+        with gzip.open(segment_path, 'rt', encoding='utf-8') as file:
+            for line in file:
+                yield json.loads(line)
+    except (EOFError, zlib.error, gzip.BadGzipFile) as e:
+        logger.warning(f"Segment '{segment_path}' ends with a damaged record: {e}")
+
+
+_raw_archive: RawResponseArchive | None = None
+
+
+def get_raw_archive() -> RawResponseArchive:
+    """
+    Returns the process-wide RawResponseArchive.
+    """
+    global _raw_archive
+    if _raw_archive is None:
+        _raw_archive = RawResponseArchive()
+    return _raw_archive
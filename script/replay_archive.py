@@ -0,0 +1,99 @@
+import os
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from typing import List
+import logging
+import logging.config
+from logging_config import LOGGING_CONFIG
+from count_timer import count_timer
+from db.create_tables import create_all_tables_main
+from db.json_data_to_db import insert_data_to_db_main
+from flight_store import FlightStore
+from cheapest_view import CheapestFlightsView
+from storage import JsonFileEngine
+from raw_archive import RawResponseArchive, read_segment
+from entity_registry import get_entity_registry
+from ryanair_one_way_cheap import extract_one_way_flight_details, update_one_way_flight_json_schema
+
+
+logging.config.dictConfig(LOGGING_CONFIG)
+logger = logging.getLogger(__name__)
+
+
+def extract_segment(segment_path: str) -> List[dict]:
+    """
+    Runs in a worker process: extracts flight entries from one archive segment,
+    with the price timestamp set to the time each response was fetched.
+    Args:
+        segment_path (str): Path of a segment file.
+    Returns:
+        List[dict]: Flight entries in fetch order.
+    """
+    flight_entries = []
+    for record in read_segment(segment_path):
+        try:
+            flight_model = extract_one_way_flight_details(record["data"], record["fetched_at"])
+            if flight_model:
+                flight_entries.append(update_one_way_flight_json_schema(flight_model))
+        except Exception as e:
+            logger.error(f"Skipping archived response of {record.get('search_date')}: {e}")
+    return flight_entries
+
+
+@count_timer
+def replay_archive(output_path: str | None = None,
+                   rebuild: bool = False,
+                   processes: int | None = None) -> int:
+    """
+    Pushes every archived response back through extraction and storage.
+    Segments are extracted in parallel across processes, the entries are then
+    merged here in archive order into a FlightStore that is flushed once.
+    Args:
+        output_path (str | None): JSON file to merge into, None - the flight store of STORAGE_ENGINE.
+        rebuild (bool): Start from an empty store instead of the existing data.
+        processes (int | None): Worker processes, None - one per CPU.
+    Returns:
+        int: Number of added entries and prices.
+    """
+    segment_paths = [str(path) for path in RawResponseArchive().segment_paths()]
+    if not segment_paths:
+        print("Raw archive is empty, nothing to replay.")
+        return 0
+
+    registry = get_entity_registry()
+    if output_path:
+        # The saved cheapest flights view belongs to the flight store, not to this file
+        store = FlightStore(JsonFileEngine(output_path), flush_every=0,
+                            cheapest_view=CheapestFlightsView(json_file_path=None))
+    else:
+        store = FlightStore(flush_every=0)
+    if not rebuild:
+        store.load()
+    merged = 0
+    with ProcessPoolExecutor(max_workers=processes or os.cpu_count()) as executor:
+        for segment_path, flight_entries in zip(segment_paths,
+                                                executor.map(extract_segment, segment_paths)):
+            merged += store.merge_many(registry.intern_flights(flight_entries))
+            logger.info(f"Replayed {len(flight_entries)} responses from '{segment_path}'.")
+
+    store.flush(force=rebuild)
+    store.close()
+    print(f"Replayed {len(segment_paths)} segments, {merged} entries and prices "
+          f"merged into '{store.path}' ({len(store.flights)} flights).")
+    return merged
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay the raw response archive into flight data.")
+    parser.add_argument("--output", default=None, help="JSON file to merge into, default - the flight store.")
+    parser.add_argument("--rebuild", action="store_true", help="Start from an empty store.")
+    parser.add_argument("--processes", type=int, default=None, help="Worker processes.")
+    parser.add_argument("--db", action="store_true", help="Sync the rebuilt flights to the DB.")
+    args = parser.parse_args()
+    if args.db and args.output:
+        parser.error("--db syncs the flight store, it can not be used with --output.")
+
+    replay_archive(args.output, args.rebuild, args.processes)
+    if args.db:
+        create_all_tables_main()
+        insert_data_to_db_main()
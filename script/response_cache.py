@@ -0,0 +1,196 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+import logging
+import logging.config
+from logging_config import LOGGING_CONFIG
+from constants import (
+                    RESPONSE_CACHE_FOLDER_PATH, RESPONSE_CACHE_MAX_BYTES,
+                    RESPONSE_CACHE_TTL)
+from file import check_or_directory_exists
+
+
+logging.config.dictConfig(LOGGING_CONFIG)
+logger = logging.getLogger(__name__)
+
+
+class _InFlightRequest:
+    """Result holder shared by callers waiting for the same request."""
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+
+
+class ResponseCache:
+    """
+    Persistent on-disk cache of API responses.
+    Every response is stored in its own JSON file named by the hash of the
+    request parameters. Entries expire by a TTL that depends on how far the
+    departure date is, the cache is kept under `max_bytes` by evicting the
+    least recently used files, and identical requests running at the same
+    time are coalesced into a single fetch.
+    """
+    def __init__(self,
+                 cache_dir: str = RESPONSE_CACHE_FOLDER_PATH,
+                 max_bytes: int = RESPONSE_CACHE_MAX_BYTES,
+                 ttl_rules: List[Tuple[int | None, int]] = RESPONSE_CACHE_TTL):
+        """
+        Args:
+            cache_dir (str): Folder for cache files.
+            max_bytes (int): Maximum total size of cache files.
+            ttl_rules (List[Tuple[int | None, int]]): (days until departure, ttl seconds)
+                rows, the first row with days >= days until departure is used,
+                None matches every horizon.
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.ttl_rules = ttl_rules
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, _InFlightRequest] = {}
+        self._lru: OrderedDict[str, int] = OrderedDict()
+        self._total_bytes = 0
+        check_or_directory_exists(cache_dir)
+        self._load_index()
+
+    def _load_index(self) -> None:
+        """Builds the LRU order from cache file modification times."""
+        files = sorted(self.cache_dir.glob("*.json"), key=lambda path: path.stat().st_mtime)
+        for path in files:
+            size = path.stat().st_size
+            self._lru[path.stem] = size
+            self._total_bytes += size
+
+    @staticmethod
+    def make_key(base_url: str, params: dict) -> str:
+        """
+        Returns a stable key for a request: sha256 of url and sorted params.
+        """
+        raw_key = json.dumps([base_url, params], sort_keys=True)
+        return hashlib.sha256(raw_key.encode("utf-8")).hexdigest()
+
+    def ttl_for(self, departure_date: datetime) -> int:
+        """
+        Returns the TTL in seconds for a departure date: near dates expire fast,
+        far dates slowly.
+        """
+        days_ahead = (departure_date.date() - datetime.today().date()).days
+        for max_days, ttl_seconds in self.ttl_rules:
+            if max_days is None or days_ahead <= max_days:
+                return ttl_seconds
+        return 0
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str, ttl: int) -> Any | None:
+        """
+        Returns cached data if the entry exists and is younger than `ttl` seconds.
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                entry = json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+        if time.time() - entry.get("stored_at", 0) > ttl:
+            return None
+
+        os.utime(path)
+        with self._lock:
+            if key in self._lru:
+                self._lru.move_to_end(key)
+        return entry.get("data")
+
+    def set(self, key: str, params: dict, data: Any) -> None:
+        """
+        Stores data atomically and evicts least recently used entries over the size limit.
+        """
+        path = self._path(key)
+        temp_path = path.with_suffix(".tmp")
+        entry = {"stored_at": int(time.time()), "params": params, "data": data}
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump(entry, file)
+        os.replace(temp_path, path)
+
+        size = path.stat().st_size
+        with self._lock:
+            self._total_bytes += size - self._lru.pop(key, 0)
+            self._lru[key] = size
+            self._evict()
+
+    def _evict(self) -> None:
+        """Removes least recently used files until the cache fits `max_bytes`."""
+        while self._total_bytes > self.max_bytes and len(self._lru) > 1:
+            key, size = self._lru.popitem(last=False)
+            self._total_bytes -= size
+            try:
+                self._path(key).unlink()
+            except FileNotFoundError:
+                pass
+            logger.info(f"Evicted response cache entry {key}.")
+
+    def get_or_fetch(self, base_url: str, params: dict, departure_date: datetime,
+                     fetch: Callable[[], Any]) -> Any | None:
+        """
+        Returns a fresh cached response or calls `fetch` and caches its result.
+        Only one fetch runs for identical requests, other callers wait for its result.
+        Args:
+            base_url (str): Request URL, part of the key.
+            params (dict): Request query parameters, part of the key.
+            departure_date (datetime): Date that picks the TTL.
+            fetch (Callable): Performs the request, returns data or None on error.
+        Returns:
+            Any | None: Response data, None results are not cached.
+        """
+        key = self.make_key(base_url, params)
+        cached = self.get(key, self.ttl_for(departure_date))
+        if cached is not None:
+            logger.info(f"Response cache hit for {params}.")
+            return cached
+
+        with self._lock:
+            inflight = self._inflight.get(key)
+            is_leader = inflight is None
+            if is_leader:
+                inflight = _InFlightRequest()
+                self._inflight[key] = inflight
+
+        if not is_leader:
+            inflight.done.wait()
+            return inflight.result
+
+        try:
+            # A leader that finished between the cache check and taking the lead has cached its result
+            inflight.result = self.get(key, self.ttl_for(departure_date))
+            if inflight.result is not None:
+                return inflight.result
+            inflight.result = fetch()
+            if inflight.result is not None:
+                self.set(key, params, inflight.result)
+            return inflight.result
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            inflight.done.set()
+
+
+_response_cache: ResponseCache | None = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """
+    Returns the process-wide ResponseCache, creating it on first use.
+    """
+    global _response_cache
+    with _response_cache_lock:
+        if _response_cache is None:
+            _response_cache = ResponseCache()
+        return _response_cache
@@ -0,0 +1,141 @@
+import os
+import json
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+import logging
+import logging.config
+from logging_config import LOGGING_CONFIG
+from constants import (
+                    ROUTE_SCHEDULE_FOLDER_PATH, SCHEDULE_MIN_EMPTY_STREAK,
+                    SCHEDULE_REPROBE_SECONDS, SCHEDULE_FORGET_SECONDS,
+                    NEGATIVE_CACHE_TTL_SECONDS)
+from file import check_or_directory_exists
+from flight_data_process import FlightData
+
+
+logging.config.dictConfig(LOGGING_CONFIG)
+logger = logging.getLogger(__name__)
+
+
+class RouteSchedule:
+    """
+    Learned operating weekdays and cache of empty results for one route.
+    A weekday is treated as non-operating after SCHEDULE_MIN_EMPTY_STREAK
+    empty results in a row with no fare found for SCHEDULE_FORGET_SECONDS;
+    its dates are skipped except for a re-probe every SCHEDULE_REPROBE_SECONDS,
+    and any fare found makes it operating again.
+    Dates that returned no fares are skipped until NEGATIVE_CACHE_TTL_SECONDS pass.
+    The state is kept in one JSON file per route, so sharded workers never
+    write the same file.
+    """
+    def __init__(self, departure_iata: str, arrival_iata: str,
+                 folder_path: str = ROUTE_SCHEDULE_FOLDER_PATH):
+        """
+        Args:
+            departure_iata (str): iata code of departure airport exp: "VNO"
+            arrival_iata (str): iata code of arrival airport exp: "BCN"
+            folder_path (str): Folder with route schedule files.
+        """
+        self.route = f"{departure_iata.upper()}-{arrival_iata.upper()}"
+        self.folder_path = folder_path
+        self.path = Path(folder_path) / f"{self.route}.json"
+        self.weekdays: Dict[str, dict] = {
+            str(weekday): {"empty_streak": 0, "last_found": 0, "last_probe": 0}
+            for weekday in range(7)
+        }
+        self.empty_dates: Dict[str, int] = {}
+        self.is_new = True
+
+    def load(self) -> "RouteSchedule":
+        """Loads the saved state, a missing or invalid file keeps the empty state."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                state = json.load(file)
+            self.weekdays.update(state.get("weekdays", {}))
+            self.empty_dates = state.get("empty_dates", {})
+            self.is_new = False
+        except FileNotFoundError:
+            logger.info(f"No schedule saved for route {self.route}.")
+        except json.JSONDecodeError:
+            logger.error(f"Error decoding route schedule '{self.path}'. Starting empty.")
+        return self
+
+    def save(self) -> None:
+        """Writes the state atomically and drops expired empty dates."""
+        now = int(time.time())
+        self.empty_dates = {
+            date_str: expires_at for date_str, expires_at in self.empty_dates.items()
+            if expires_at > now
+        }
+        check_or_directory_exists(self.folder_path)
+        temp_path = self.path.with_suffix(".tmp")
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump({"weekdays": self.weekdays, "empty_dates": self.empty_dates}, file, indent=4)
+        os.replace(temp_path, self.path)
+        self.is_new = False
+
+    def learn_from_history(self, flights: List[dict]) -> None:
+        """
+        Marks weekdays with stored flights of this route as operating.
+        Args:
+            flights (List[dict]): Flight entries from the JSON file.
+        """
+        now = int(time.time())
+        for entry in flights:
+            flight = FlightData.from_store(entry)
+            route = f"{flight.get_departure_airport_iata()}-{flight.get_arrival_airport_iata()}"
+            departure_date = flight.get_departure_date(as_string=False)
+            if route == self.route and departure_date:
+                self.weekdays[str(departure_date.weekday())]["last_found"] = now
+
+    def is_operating_weekday(self, weekday: int) -> bool:
+        weekday_state = self.weekdays[str(weekday)]
+        return (weekday_state["empty_streak"] < SCHEDULE_MIN_EMPTY_STREAK
+                or time.time() - weekday_state["last_found"] < SCHEDULE_FORGET_SECONDS)
+
+    def should_query(self, search_date: datetime) -> bool:
+        """
+        Checks if a date is worth a request: not a fresh empty result and
+        an operating weekday, or a non-operating weekday due for a re-probe.
+        """
+        now = time.time()
+        if self.empty_dates.get(search_date.strftime("%Y-%m-%d"), 0) > now:
+            return False
+
+        weekday_state = self.weekdays[str(search_date.weekday())]
+        if self.is_operating_weekday(search_date.weekday()):
+            return True
+        return now - weekday_state["last_probe"] >= SCHEDULE_REPROBE_SECONDS
+
+    def plan_dates(self, search_dates: List[datetime]) -> List[datetime]:
+        """
+        Returns the dates that should be queried.
+        """
+        planned_dates = [search_date for search_date in search_dates if self.should_query(search_date)]
+        skipped = len(search_dates) - len(planned_dates)
+        if skipped:
+            logger.info(f"Route {self.route}: skipping {skipped} of {len(search_dates)} dates "
+                        f"by learned schedule and empty results cache.")
+        return planned_dates
+
+    def record(self, search_date: datetime, has_flights: bool) -> None:
+        """
+        Records the result of one date query.
+        Args:
+            search_date (datetime): The queried date.
+            has_flights (bool): True if the response had fares.
+        """
+        now = int(time.time())
+        date_str = search_date.strftime("%Y-%m-%d")
+        weekday_state = self.weekdays[str(search_date.weekday())]
+        weekday_state["last_probe"] = now
+
+        if has_flights:
+            weekday_state["empty_streak"] = 0
+            weekday_state["last_found"] = now
+            self.empty_dates.pop(date_str, None)
+        else:
+            weekday_state["empty_streak"] += 1
+            self.empty_dates[date_str] = now + NEGATIVE_CACHE_TTL_SECONDS
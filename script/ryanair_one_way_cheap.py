@@ -1,30 +1,41 @@
-import json
-import time
+import msgspec
 import requests
 from datetime import datetime, timedelta
 from dateutil.relativedelta import relativedelta
 from constants import (
                     BASE_URL, FLYGHT_ROUTES,
-                    LT_SPAIN_DATA_JSON_PATH, DATA_FOLDER_PATH,
-                    GET_DATA_MONTHS, OUT_NUM_IN_TABLE)
+                    DATA_FOLDER_PATH,
+                    GET_DATA_MONTHS, OUT_NUM_IN_TABLE, FETCH_MODE,
+                    RESPONSE_CACHE_ENABLED, SCRAPE_PROCESSES,
+                    FAN_OUT_BY_DEPARTURE, ANY_ARRIVAL, ROUTE_SCHEDULE_ENABLED,
+                    FARE_FINGERPRINTS_ENABLED, SCRAPE_CHECKPOINTS_ENABLED,
+                    RAW_ARCHIVE_ENABLED)
 from file import check_or_directory_exists
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, List, Tuple
 import logging
 import logging.config
 from logging_config import LOGGING_CONFIG
 from rich import print
 from rich.progress import track
 from rich_process import display_chipest_flights_in_table
-from json_data_process import (
-                            get_sort_json_data_flights,
-                            prepare_flight_formated_output,
-                            check_append_price_and_write_data_to_json_file,
-                            )
+from json_data_process import prepare_flight_formated_output
 from db.create_tables import create_all_tables_main
 from db.json_data_to_db import insert_data_to_db_main
 from count_timer import count_timer
-from models import (FlightModel, DepartureAirport, ArrivalAirport,
-                    CityDeparture, CityArrival, Price, PriceValue)
+from fetch_engine import AsyncFetchEngine
+from concurrency_controller import log_concurrency_metrics
+from http_transport import get_http_transport
+from response_cache import get_response_cache
+from sharded_scrape import scrape_routes_sharded
+from route_schedule import RouteSchedule
+from fingerprint_index import RunCounters, get_fare_fingerprint_index
+from scrape_checkpoint import ScrapeCheckpoint, get_scrape_checkpoint
+from raw_archive import get_raw_archive
+from flight_store import open_flight_store, get_flight_store
+from entity_registry import get_entity_registry
+from flight_data_process import FlightData
+from fare_decoder import (FlightRecord, decode_response, convert_outbound,
+                          build_flight_record, flight_record_to_entry)
 
 
 
@@ -34,119 +45,515 @@ logger = logging.getLogger(__name__)
 
 def get_one_way_cheap_flight(base_url: str,
                              departure_iata: str,
-                             arrival_iata: str,
-                             date: datetime) -> dict:
+                             arrival_iata: str | None,
+                             date: datetime,
+                             date_to: datetime | None = None) -> dict:
     """
     Search the cheapest one-way flight information from a given departure airport
-    to an arrival airport on a specified date.
+    to an arrival airport on a specified date or date range.
+    Responses are served from the on-disk response cache while they are fresh.
     Args:
         base_url (str): The base URL of the flight API to fetch flight data.
         departure_iata (str): The IATA code for the departure airport.
-        arrival_iata (str): The IATA code for the arrival airport.
+        arrival_iata (str | None): The IATA code for the arrival airport,
+            when None fares to all destinations of the departure airport are searched.
         date (datetime): The date of departure as a datetime object.
+        date_to (datetime | None): Last date of the range, when None
+            only `date` is searched.
     Returns:
         Dict: A dictionary containing flight data and other response information
             if the request is successful;
         otherwise, returns None in case of an error.
     """
     departure_iata_airport = departure_iata.upper()
-    arrival_iata_code = arrival_iata.upper()
     date_str = date.strftime("%Y-%m-%d")
-    url = (
-        f"{base_url}?"
-        f"departureAirportIataCode={departure_iata_airport}&"
-        f"arrivalAirportIataCode={arrival_iata_code}&"
-        f"outboundDepartureDateFrom={date_str}&"
-        f"outboundDepartureDateTo={date_str}"
-    )
-    try:
-        response = requests.get(url)
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException as err:
-        logger.error(f"Failed to fetch flight data from {departure_iata}"
-                    f"to {arrival_iata} on {date_str}: {err}")
-        print(f"An error occurred: {err}")
-        return None
+    date_to_str = date_to.strftime("%Y-%m-%d") if date_to else date_str
+    params = {"departureAirportIataCode": departure_iata_airport}
+    if arrival_iata:
+        params["arrivalAirportIataCode"] = arrival_iata.upper()
+    params["outboundDepartureDateFrom"] = date_str
+    params["outboundDepartureDateTo"] = date_to_str
+
+    def fetch() -> dict:
+        try:
+            response = get_http_transport().get(base_url, params=params)
+            return decode_response(response.content)
+        except (requests.exceptions.RequestException, msgspec.DecodeError) as err:
+            logger.error(f"Failed to fetch flight data from {departure_iata}"
+                        f"to {arrival_iata} on {date_str} - {date_to_str}: {err}")
+            print(f"An error occurred: {err}")
+            return None
 
+    if not RESPONSE_CACHE_ENABLED:
+        return fetch()
+    return get_response_cache().get_or_fetch(base_url, params, date, fetch)
 
-def extract_one_way_flight_details(one_flight_data: Dict[str, Any]) -> FlightModel:
+
+def extract_one_way_flight_details(one_flight_data: Dict[str, Any],
+                                   timestamp: int | None = None) -> FlightRecord:
     """
-    Extracts flight details from the provided flight data into a FlightModel.
+    Extracts flight details from the provided flight data into a FlightRecord.
+    Args:
+        one_flight_data (Dict[str, Any]): Response data from get_one_way_cheap_flight().
+        timestamp (int | None): Price timestamp, None - current time.
+            exp: fetch time of an archived response.
     """
     fares = one_flight_data.get("fares", [])
     if not fares:
         logger.info("No fares found in the response data.")
         return None
 
-    outbound = fares[0]['outbound']
+    return build_flight_model(fares[0]['outbound'], timestamp)
+
+
+def build_flight_model(outbound: Dict[str, Any], timestamp: int | None = None) -> FlightRecord:
+    """
+    Validates the `outbound` part of one fare and builds its FlightRecord,
+    the fields and types are the same as in FlightModel from script/models.py.
+    Raises:
+        msgspec.ValidationError: If a field is missing or has a wrong type.
+    """
     try:
-        return FlightModel(
-            departureAirport = DepartureAirport(
-                countryName = outbound['departureAirport']['countryName'],
-                iataCode = outbound['departureAirport']['iataCode'],
-                name = outbound['departureAirport']['name'],
-                city = CityDeparture(
-                    name = outbound['departureAirport']['city']['name'],
-                    code = outbound['departureAirport']['city']['code'],
-                    countryCode = outbound['departureAirport']['city']['countryCode']
-                )
-            ),
-            arrivalAirport = ArrivalAirport(
-                countryName = outbound['arrivalAirport']['countryName'],
-                iataCode = outbound['arrivalAirport']['iataCode'],
-                name = outbound['arrivalAirport']['name'],
-                city = CityArrival(
-                    name = outbound['arrivalAirport']['city']['name'],
-                    code = outbound['arrivalAirport']['city']['code'],
-                    countryCode = outbound['arrivalAirport']['city']['countryCode']
-                )
-            ),
-            departureDate = outbound['departureDate'],
-            arrivalDate = outbound['arrivalDate'],
-            flightNumber = outbound['flightNumber'],
-            price = Price(
-                prices_history = [PriceValue(
-                    timestamp = int(time.time()),
-                    price = outbound['price']['value']
-                    )],
-                currencyCode = outbound['price']['currencyCode']
-            ),
-            priceUpdated=outbound['priceUpdated']
-        )
-
-    except KeyError as e:
-        logger.error(f"KeyError encountered during extraction: {e}")
-        raise
-    except TypeError as e:
-        logger.error(f"TypeError encountered during extraction: {e}")
+        return build_flight_record(convert_outbound(outbound), timestamp)
+    except msgspec.ValidationError as e:
+        logger.error(f"Validation error encountered during extraction: {e}")
         raise
     except Exception as e:
         logger.error(f"Unexpected error during extraction: {e}")
         raise
 
 
-def update_one_way_flight_json_schema(flight_model: FlightModel) -> str:
+def update_one_way_flight_json_schema(flight_record: FlightRecord) -> Dict[str, Any]:
     """
-    Update and format JSON schema with flight details.
+    Converts the flight details into the flight entry dict that is merged,
+    displayed and synced to the DB, it is encoded only when written to a file.
     """
     try:
-        json_schema = flight_model.model_dump()
-        json_schema['price']['prices_history'] = [
-            {
-                "timestamp": int(time.time()),
-                "price": json_schema['price']['prices_history'][0]['price']
-            }
-        ]
-        json_schema['price']['currencyCode'] = flight_model.price.currencyCode
-        json_schema['priceUpdated'] = flight_model.priceUpdated
+        json_schema = get_entity_registry().intern_flight(flight_record_to_entry(flight_record))
         logger.info("JSON schema successfully updated.")
-        return json.dumps(json_schema, indent=4)
+        return json_schema
     except Exception as e:
         logger.error(f"Error updating JSON schema: {e}")
         raise
 
 
+def fetch_one_way_fares_by_dates(departure_airport_iata: str,
+                                 arrival_airport_iata: str | None,
+                                 search_dates: List[datetime]) -> List[Tuple[datetime, dict]]:
+    """
+    Fetches one-way fares for every date concurrently with the AsyncFetchEngine.
+    Args:
+        departure_airport_iata (str): iata code of departure airport exp: "VNO"
+        arrival_airport_iata (str | None): iata code of arrival airport exp: "BCN",
+            None fetches all destinations.
+        search_dates (List[datetime]): Dates to fetch.
+    Returns:
+        List[Tuple[datetime, dict]]: (search_date, response data or None) pairs
+            in the same order as `search_dates`.
+    """
+    calls_args = [
+        (BASE_URL, departure_airport_iata, arrival_airport_iata, search_date)
+        for search_date in search_dates
+    ]
+    with AsyncFetchEngine() as engine:
+        responses = engine.run(BASE_URL, get_one_way_cheap_flight, calls_args)
+    return list(zip(search_dates, responses))
+
+
+def split_date_range_by_month(start_date: datetime,
+                              end_date: datetime) -> List[Tuple[datetime, datetime]]:
+    """
+    Splits a date range into calendar month windows.
+    exp: 2025-03-20 - 2025-05-05 -> [(03-20, 03-31), (04-01, 04-30), (05-01, 05-05)]
+    """
+    windows = []
+    window_start = start_date
+    while window_start <= end_date:
+        next_month_start = (window_start + relativedelta(months=1)).replace(day=1)
+        window_end = min(next_month_start - timedelta(days=1), end_date)
+        windows.append((window_start, window_end))
+        window_start = next_month_start
+    return windows
+
+
+def bisect_date_window(window: Tuple[datetime, datetime]) -> List[Tuple[datetime, datetime]]:
+    """
+    Splits a date window into two halves, used when a range response is truncated.
+    """
+    window_start, window_end = window
+    middle = window_start + timedelta(days=(window_end - window_start).days // 2)
+    return [(window_start, middle), (middle + timedelta(days=1), window_end)]
+
+
+def is_range_response_truncated(one_way_fares: dict) -> bool:
+    """
+    Checks if a date range response holds only part of the fares.
+    The API signals more results with `nextPage` or with `size` larger than
+    the number of returned fares.
+    """
+    fares = one_way_fares.get("fares") or []
+    if one_way_fares.get("nextPage"):
+        return True
+    size = one_way_fares.get("size")
+    return isinstance(size, int) and size > len(fares)
+
+
+def is_fare_unavailable(fare: dict) -> bool:
+    """
+    Checks if a range response entry says the day has no fare:
+    the entry is flagged `unavailable` or its price is null.
+    """
+    outbound = fare.get('outbound') or {}
+    price = outbound.get('price')
+    return bool(fare.get('unavailable') or outbound.get('unavailable')
+                or price is None or price.get('value') is None)
+
+
+def split_range_fares_by_day(one_way_fares: dict,
+                             window: Tuple[datetime, datetime]) -> List[Tuple[datetime, dict]]:
+    """
+    Splits a date range response into one response per day of the window,
+    in the same format as a single day response: {"fares": [...]}.
+    Only days the response mentions are returned, the cheapest fare of a day goes first.
+    A day the API marks as unavailable gets an empty fares list, a day missing
+    from the response is left out, so it is not taken for a day without flights.
+    """
+    window_start, window_end = window
+    fares_by_day: Dict[str, list] = {}
+    for fare in one_way_fares.get("fares") or []:
+        day = fare['outbound']['departureDate'][:10]
+        day_fares = fares_by_day.setdefault(day, [])
+        if not is_fare_unavailable(fare):
+            day_fares.append(fare)
+
+    day_responses = []
+    for day_offset in range((window_end - window_start).days + 1):
+        search_date = window_start + timedelta(days=day_offset)
+        day_fares = fares_by_day.get(search_date.strftime("%Y-%m-%d"))
+        if day_fares is None:
+            continue
+        day_fares.sort(key=lambda fare: fare['outbound']['price']['value'])
+        day_responses.append((search_date, {"fares": day_fares}))
+    return day_responses
+
+
+def fetch_one_way_fares_by_calendar(departure_airport_iata: str,
+                                    arrival_airport_iata: str,
+                                    start_date: datetime,
+                                    end_date: datetime) -> List[Tuple[datetime, dict]]:
+    """
+    Fetches one-way fares with one range request per calendar month and
+    splits the fares back into per-day responses.
+    Truncated windows are split in half and fetched again, down to single
+    days, so a busy month falls back to per-day queries.
+    Args:
+        departure_airport_iata (str): iata code of departure airport exp: "VNO"
+        arrival_airport_iata (str): iata code of arrival airport exp: "BCN"
+        start_date (datetime): The starting date of the date range.
+        end_date (datetime): The ending date of the date range.
+    Returns:
+        List[Tuple[datetime, dict]]: (search_date, response data or None) pairs
+            in date order. Days of a failed window are None, days a range
+            response does not mention are left out.
+    """
+    fares_by_date: Dict[datetime, dict] = {}
+    windows = split_date_range_by_month(start_date, end_date)
+
+    with AsyncFetchEngine() as engine:
+        while windows:
+            calls_args = [
+                (BASE_URL, departure_airport_iata, arrival_airport_iata, window_start, window_end)
+                for window_start, window_end in windows
+            ]
+            responses = engine.run(BASE_URL, get_one_way_cheap_flight, calls_args)
+
+            truncated_windows = []
+            for window, one_way_fares in zip(windows, responses):
+                window_start, window_end = window
+                if one_way_fares is None:
+                    for day_offset in range((window_end - window_start).days + 1):
+                        fares_by_date[window_start + timedelta(days=day_offset)] = None
+                elif window_start < window_end and is_range_response_truncated(one_way_fares):
+                    logger.info(f"Truncated response for {window_start:%Y-%m-%d} - "
+                                f"{window_end:%Y-%m-%d}, splitting the window.")
+                    truncated_windows.extend(bisect_date_window(window))
+                else:
+                    fares_by_date.update(split_range_fares_by_day(one_way_fares, window))
+            windows = truncated_windows
+
+    return sorted(fares_by_date.items())
+
+
+def split_fares_by_arrival(one_way_fares: dict) -> Dict[str, dict]:
+    """
+    Splits a departure-only response into one response per arrival airport,
+    in the same format as a single route response: {"fares": [...]}.
+    The cheapest fare of every arrival goes first.
+    exp: {"BCN": {"fares": [...]}, "ALC": {"fares": [...]}}
+    """
+    fares_by_arrival: Dict[str, dict] = {}
+    for fare in one_way_fares.get("fares") or []:
+        arrival_iata = fare['outbound']['arrivalAirport']['iataCode']
+        fares_by_arrival.setdefault(arrival_iata, {"fares": []})["fares"].append(fare)
+
+    for arrival_fares in fares_by_arrival.values():
+        arrival_fares["fares"].sort(key=lambda fare: fare['outbound']['price']['value'])
+    return fares_by_arrival
+
+
+def fetch_origin_fares(start_date: datetime,
+                       end_date: datetime,
+                       departure_airport_iata: str,
+                       arrival_airports_iata: List[str]) -> Dict[str, List[Tuple[datetime, dict]]]:
+    """
+    Fan-out fetch: one departure-only request per day for an origin, split into
+    per-route responses for the wanted arrival airports.
+    Args:
+        start_date (datetime): The starting date of the date range.
+        end_date (datetime): The ending date of the date range.
+        departure_airport_iata (str): iata code of departure airport exp: "VNO"
+        arrival_airports_iata (List[str]): Arrival airports to keep,
+            ANY_ARRIVAL keeps every destination in the responses.
+    Returns:
+        Dict[str, List[Tuple[datetime, dict]]]: Arrival iata code to
+            (search_date, response data or None) pairs, the same as fetch_route_fares().
+    """
+    search_dates = [
+        start_date + timedelta(days=search_day)
+        for search_day in range((end_date - start_date).days + 1)
+    ]
+    keep_all = ANY_ARRIVAL in arrival_airports_iata
+    schedules = {
+        arrival: load_route_schedule(departure_airport_iata, arrival)
+        for arrival in arrival_airports_iata if arrival != ANY_ARRIVAL
+    }
+    if not keep_all and all(schedules.values()):
+        planned_dates = set()
+        for schedule in schedules.values():
+            planned_dates.update(schedule.plan_dates(search_dates))
+        search_dates = sorted(planned_dates)
+    checkpoint = load_scrape_checkpoint(start_date, end_date)
+    if checkpoint and not keep_all:
+        pending_dates = set()
+        for arrival in arrival_airports_iata:
+            pending_dates.update(checkpoint.pending_dates(departure_airport_iata, arrival, search_dates))
+        search_dates = sorted(pending_dates)
+    fetched_fares = fetch_one_way_fares_by_dates(departure_airport_iata, None, search_dates)
+
+    fares_by_route: Dict[str, List[Tuple[datetime, dict]]] = {
+        arrival: [] for arrival in arrival_airports_iata if arrival != ANY_ARRIVAL
+    }
+    for search_date, one_way_fares in fetched_fares:
+        fares_by_arrival = split_fares_by_arrival(one_way_fares) if one_way_fares else {}
+        for arrival in fares_by_arrival.keys() | fares_by_route.keys():
+            if not keep_all and arrival not in fares_by_route:
+                continue
+            day_fares = None if one_way_fares is None else fares_by_arrival.get(arrival, {"fares": []})
+            fares_by_route.setdefault(arrival, []).append((search_date, day_fares))
+
+    for arrival, schedule in schedules.items():
+        if schedule:
+            record_route_schedule(schedule, fares_by_route[arrival])
+    return fares_by_route
+
+
+def group_routes_by_departure(routes: List[Dict[str, str]]) -> Dict[str, List[str]]:
+    """
+    Groups routes by departure airport.
+    exp: [{"departure": "KUN", "arrival": "ALC"}, {"departure": "KUN", "arrival": "MAD"}]
+        -> {"KUN": ["ALC", "MAD"]}
+    """
+    arrivals_by_departure: Dict[str, List[str]] = {}
+    for route in routes:
+        arrivals_by_departure.setdefault(route["departure"], []).append(route["arrival"])
+    return arrivals_by_departure
+
+
+def load_route_schedule(departure_airport_iata: str,
+                        arrival_airport_iata: str) -> RouteSchedule | None:
+    """
+    Loads the learned schedule of a route, a new schedule first learns the
+    operating weekdays from the flights in the JSON file.
+    Returns:
+        RouteSchedule | None: None when ROUTE_SCHEDULE_ENABLED is off.
+    """
+    if not ROUTE_SCHEDULE_ENABLED:
+        return None
+    schedule = RouteSchedule(departure_airport_iata, arrival_airport_iata).load()
+    if schedule.is_new:
+        schedule.learn_from_history(get_flight_store().flights)
+    return schedule
+
+
+def load_scrape_checkpoint(start_date: datetime,
+                           end_date: datetime) -> ScrapeCheckpoint | None:
+    """
+    Returns the checkpoint of the run window.
+    Returns:
+        ScrapeCheckpoint | None: None when SCRAPE_CHECKPOINTS_ENABLED is off.
+    """
+    if not SCRAPE_CHECKPOINTS_ENABLED:
+        return None
+    return get_scrape_checkpoint(start_date, end_date)
+
+
+def record_route_schedule(schedule: RouteSchedule,
+                          fetched_fares: List[Tuple[datetime, dict]]) -> None:
+    """
+    Records which fetched dates had fares and saves the route schedule.
+    Failed requests (None) are not recorded.
+    """
+    for search_date, one_way_fares in fetched_fares:
+        if one_way_fares is not None:
+            schedule.record(search_date, bool(one_way_fares.get("fares")))
+    schedule.save()
+
+
+def is_fare_stored(outbound: dict) -> bool:
+    """
+    Checks if the flight store holds the flight of a fare with its price,
+    the fingerprint index alone can not tell after the store was lost,
+    damaged or STORAGE_ENGINE was switched.
+    Args:
+        outbound (dict): `outbound` part of one fare, it has the fields of the flight key.
+    """
+    stored_entry = get_flight_store().find(outbound)
+    return stored_entry is not None and outbound["price"]["value"] in FlightData(stored_entry).get_prices_list()
+
+
+def save_one_way_fares(search_date: datetime, one_way_fares: dict) -> None:
+    """
+    Extracts flight details from one day response and merges them into the flight store.
+    With RAW_ARCHIVE_ENABLED every response with fares is archived first.
+    With FARE_FINGERPRINTS_ENABLED a fare equal to the last one seen for
+        the same route and day is skipped before any processing, as long as
+        the flight store holds the flight with that price.
+    Args:
+        search_date (datetime): The date the fares were fetched for.
+        one_way_fares (dict): Response data from get_one_way_cheap_flight().
+    """
+    fingerprints = get_fare_fingerprint_index() if FARE_FINGERPRINTS_ENABLED else None
+    try:
+        if RAW_ARCHIVE_ENABLED and one_way_fares and one_way_fares.get("fares"):
+            get_raw_archive().append(search_date, one_way_fares)
+
+        if fingerprints:
+            fingerprints.counters.count("fetched")
+            if one_way_fares is None:
+                fingerprints.counters.count("failed")
+            elif not one_way_fares.get("fares"):
+                fingerprints.counters.count("empty")
+            elif (fingerprints.is_unchanged(one_way_fares["fares"][0]["outbound"])
+                  and is_fare_stored(one_way_fares["fares"][0]["outbound"])):
+                fingerprints.counters.count("unchanged")
+                logger.info(f"Fare unchanged on {search_date.strftime('%Y-%m-%d')}, skipping.")
+                return
+
+        extracted_flight_values = extract_one_way_flight_details(one_way_fares)
+        if not extracted_flight_values:
+            return
+
+        updated_json_schema = update_one_way_flight_json_schema(extracted_flight_values)
+        if not updated_json_schema:
+            logger.info(f"No flight data available on {search_date.strftime('%Y-%m-%d')}")
+            return
+
+        result = get_flight_store().merge(updated_json_schema)
+        if result:
+            if fingerprints:
+                fingerprints.update(one_way_fares["fares"][0]["outbound"])
+                fingerprints.counters.count("changed")
+            print(search_date.strftime('%Y-%m-%d'), result)
+            logger.info(f"Flight data successfully saved for {search_date.strftime('%Y-%m-%d')}")
+        else:
+            logger.error(f"Failed to save flight data for {search_date.strftime('%Y-%m-%d')}")
+
+    except Exception as e:
+        logger.error(f"Unexpected error in def get_flights_by_date_range(): {e}")
+
+
+def fetch_route_fares(start_date: datetime,
+                      end_date: datetime,
+                      departure_airport_iata: str,
+                      arrival_airport_iata: str) -> List[Tuple[datetime, dict]]:
+    """
+    Fetches one-way fares of one route for every date of the range.
+    Requests are sent concurrently; with FETCH_MODE "calendar" one range
+        request per month is sent instead of one request per day.
+    With ROUTE_SCHEDULE_ENABLED daily requests are sent only for dates
+        the route schedule expects flights on.
+    With SCRAPE_CHECKPOINTS_ENABLED dates already saved by an interrupted
+        run of the same window are left out.
+    Args:
+        start_date (datetime): The starting date of the date range.
+        end_date (datetime): The ending date of the date range.
+        departure_airport_iata (str): iata code of airport Vilnius exp: "VNO"
+        arrival_airport_iata (str): iata code of airport Barcelona exp: "BCN"
+    Returns:
+        List[Tuple[datetime, dict]]: (search_date, response data or None) pairs in date order.
+    """
+    schedule = load_route_schedule(departure_airport_iata, arrival_airport_iata)
+    checkpoint = load_scrape_checkpoint(start_date, end_date)
+    search_dates = [
+        start_date + timedelta(days=search_day)
+        for search_day in range((end_date - start_date).days + 1)
+    ]
+    if checkpoint:
+        search_dates = checkpoint.pending_dates(departure_airport_iata,
+                                                arrival_airport_iata,
+                                                search_dates)
+        if not search_dates:
+            return []
+
+    if FETCH_MODE == "calendar":
+        fetched_fares = fetch_one_way_fares_by_calendar(departure_airport_iata,
+                                                        arrival_airport_iata,
+                                                        search_dates[0],
+                                                        search_dates[-1])
+        pending_dates = set(search_dates)
+        fetched_fares = [(search_date, one_way_fares) for search_date, one_way_fares in fetched_fares
+                         if search_date in pending_dates]
+    else:
+        if schedule:
+            search_dates = schedule.plan_dates(search_dates)
+        fetched_fares = fetch_one_way_fares_by_dates(departure_airport_iata,
+                                                     arrival_airport_iata,
+                                                     search_dates)
+    if schedule:
+        record_route_schedule(schedule, fetched_fares)
+    return fetched_fares
+
+
+def save_route_fares(start_date: datetime,
+                     end_date: datetime,
+                     departure_airport_iata: str,
+                     arrival_airport_iata: str,
+                     fetched_fares: List[Tuple[datetime, dict]]) -> None:
+    """
+    Merges fetched per-day responses of one route into the flight store in date order.
+    With SCRAPE_CHECKPOINTS_ENABLED the saved days are checkpointed after the
+        raw archive and the flight store are flushed, failed requests are left
+        to be fetched again.
+    Args:
+        start_date (datetime): The starting date of the run window.
+        end_date (datetime): The ending date of the run window.
+        departure_airport_iata (str): iata code of airport Vilnius exp: "VNO"
+        arrival_airport_iata (str): iata code of airport Barcelona exp: "BCN"
+        fetched_fares (List[Tuple[datetime, dict]]): Result of fetch_route_fares().
+    """
+    checkpoint = load_scrape_checkpoint(start_date, end_date)
+    for search_date, one_way_fares in track(fetched_fares, description='Processing ...'):
+        save_one_way_fares(search_date, one_way_fares)
+    if RAW_ARCHIVE_ENABLED:
+        get_raw_archive().flush()
+    if checkpoint:
+        get_flight_store().flush()
+        checkpoint.mark_done(departure_airport_iata,
+                             arrival_airport_iata,
+                             [search_date for search_date, one_way_fares in fetched_fares
+                              if one_way_fares is not None])
+
+
 def get_flights_by_date_range(start_date: datetime,
                               end_date: datetime,
                               departure_airport_iata: str,
@@ -154,6 +561,8 @@ def get_flights_by_date_range(start_date: datetime,
     """
     Retrieves flight information for each date within a specified date range
         and writes the data to a JSON file if available.
+    Requests for all dates are sent concurrently, the responses are then
+        processed one day at a time in date order.
     Args:
         start_date (datetime): The starting date of the date range.
         end_date (datetime): The ending date of the date range.
@@ -163,34 +572,15 @@ def get_flights_by_date_range(start_date: datetime,
         None: The function performs output operations
             (printing and writing to a file) but does not return any values.
     """
-    for search_day in track(range((end_date - start_date).days + 1), description='Processing ...'):
-        search_date = start_date + timedelta(days=search_day)
-        one_way_fares = get_one_way_cheap_flight(BASE_URL,
-                                                 departure_airport_iata,
-                                                 arrival_airport_iata,
-                                                 search_date)
-        try:
-            extracted_flight_values = extract_one_way_flight_details(one_way_fares)
-            if not extracted_flight_values:
-                continue
-
-            updated_json_schema = update_one_way_flight_json_schema(extracted_flight_values)
-            if not updated_json_schema:
-                logger.info(f"No flight data available on {search_date.strftime('%Y-%m-%d')}")
-                continue
-
-            result = check_append_price_and_write_data_to_json_file(
-                updated_json_schema,
-                LT_SPAIN_DATA_JSON_PATH
-            )
-            if result:
-                print(search_date.strftime('%Y-%m-%d'), result)
-                logger.info(f"Flight data successfully saved for {search_date.strftime('%Y-%m-%d')}")
-            else:
-                logger.error(f"Failed to save flight data for {search_date.strftime('%Y-%m-%d')}")
-
-        except Exception as e:
-            logger.error(f"Unexpected error in def get_flights_by_date_range(): {e}")
+    fetched_fares = fetch_route_fares(start_date,
+                                      end_date,
+                                      departure_airport_iata,
+                                      arrival_airport_iata)
+    save_route_fares(start_date,
+                     end_date,
+                     departure_airport_iata,
+                     arrival_airport_iata,
+                     fetched_fares)
 
 
 @count_timer
@@ -198,17 +588,44 @@ def ryanair_main():
     print(check_or_directory_exists(DATA_FOLDER_PATH))
     start_date = datetime.today().replace(hour=0, minute=0, second=0, microsecond=0)
     end_date = start_date + relativedelta(months=GET_DATA_MONTHS)
+    checkpoint = load_scrape_checkpoint(start_date, end_date)
+    store = open_flight_store()
+    if FARE_FINGERPRINTS_ENABLED:
+        # The index lives as long as the process, the scheduler runs every scrape in one process
+        get_fare_fingerprint_index().counters = RunCounters()
 
-    for route in FLYGHT_ROUTES:
-        get_flights_by_date_range(start_date,
-                                end_date,
-                                route["departure"],
-                                route["arrival"]
-                                )
+    if FAN_OUT_BY_DEPARTURE:
+        for departure, arrivals in group_routes_by_departure(FLYGHT_ROUTES).items():
+            fares_by_route = fetch_origin_fares(start_date, end_date, departure, arrivals)
+            for arrival, route_fares in fares_by_route.items():
+                save_route_fares(start_date, end_date, departure, arrival, route_fares)
+    elif SCRAPE_PROCESSES > 1:
+        scrape_routes_sharded(start_date,
+                              end_date,
+                              FLYGHT_ROUTES,
+                              fetch_route_fares,
+                              save_route_fares)
+    else:
+        for route in FLYGHT_ROUTES:
+            get_flights_by_date_range(start_date,
+                                    end_date,
+                                    route["departure"],
+                                    route["arrival"]
+                                    )
 
-    sorted_flights_info = get_sort_json_data_flights(LT_SPAIN_DATA_JSON_PATH, num_results=OUT_NUM_IN_TABLE)
+    store.flush()
+    sorted_flights_info = store.cheapest_flights(OUT_NUM_IN_TABLE)
+    store.close()
     output_chipest_fligts = prepare_flight_formated_output(sorted_flights_info)
     display_chipest_flights_in_table(output_chipest_fligts)
     logger.info("Flight data scraping complete")
+    log_concurrency_metrics()
     create_all_tables_main()
+    # Streams the flushed flights from the storage engine one at a time
     insert_data_to_db_main()
+    if FARE_FINGERPRINTS_ENABLED:
+        fingerprints = get_fare_fingerprint_index()
+        fingerprints.save()
+        logger.info(f"Fares: {fingerprints.counters.summary()}")
+    if checkpoint:
+        checkpoint.complete()
@@ -0,0 +1,129 @@
+import os
+import json
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, List, Set
+import logging
+import logging.config
+from logging_config import LOGGING_CONFIG
+from constants import CHECKPOINTS_FOLDER_PATH, CHECKPOINT_MAX_AGE_SECONDS
+
+
+logging.config.dictConfig(LOGGING_CONFIG)
+logger = logging.getLogger(__name__)
+
+
+class ScrapeCheckpoint:
+    """
+    Progress of one scrape run window, stored as completed (route, date) cells.
+    Every saved cell is appended as one line to a JSON lines file, so a killed
+    run loses at most the line being written. A run over the same window
+    started before CHECKPOINT_MAX_AGE_SECONDS pass fetches only the missing
+    cells; complete() removes the file once the run has finished.
+    exp line: {"cell": "VNO-BCN-2025-03-25", "at": 1742751829}
+    """
+    def __init__(self, start_date: datetime, end_date: datetime,
+                 folder_path: str = CHECKPOINTS_FOLDER_PATH):
+        """
+        Args:
+            start_date (datetime): The starting date of the run window.
+            end_date (datetime): The ending date of the run window.
+            folder_path (str): Folder with checkpoint files.
+        """
+        self.folder_path = folder_path
+        self.path = Path(folder_path) / (
+            f"scrape_{start_date.strftime('%Y-%m-%d')}_{end_date.strftime('%Y-%m-%d')}.jsonl")
+        self.done_cells: Set[str] = set()
+        self.resumed = False
+
+    @staticmethod
+    def make_cell(departure_iata: str, arrival_iata: str, search_date: datetime) -> str:
+        """
+        Returns: exp: 'VNO-BCN-2025-03-25'
+        """
+        return f"{departure_iata.upper()}-{arrival_iata.upper()}-{search_date.strftime('%Y-%m-%d')}"
+
+    def load(self) -> "ScrapeCheckpoint":
+        """
+        Loads completed cells of this window and removes expired checkpoint files.
+        A line cut off by a crash is ignored.
+        """
+        self._remove_expired()
+        try:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                for line in file:
+                    try:
+                        self.done_cells.add(json.loads(line)["cell"])
+                    except (json.JSONDecodeError, KeyError, TypeError):
+                        logger.warning(f"Skipping damaged checkpoint line in '{self.path}'.")
+        except FileNotFoundError:
+            return self
+
+        self.resumed = bool(self.done_cells)
+        if self.resumed:
+            logger.info(f"Resuming run from '{self.path}' with {len(self.done_cells)} completed cells.")
+        return self
+
+    def _remove_expired(self) -> None:
+        folder = Path(self.folder_path)
+        if not folder.exists():
+            return
+        for checkpoint_path in folder.glob("scrape_*.jsonl"):
+            if time.time() - checkpoint_path.stat().st_mtime > CHECKPOINT_MAX_AGE_SECONDS:
+                checkpoint_path.unlink(missing_ok=True)
+                logger.info(f"Expired checkpoint '{checkpoint_path}' removed.")
+
+    def is_done(self, departure_iata: str, arrival_iata: str, search_date: datetime) -> bool:
+        return self.make_cell(departure_iata, arrival_iata, search_date) in self.done_cells
+
+    def pending_dates(self, departure_iata: str, arrival_iata: str,
+                      search_dates: List[datetime]) -> List[datetime]:
+        """
+        Returns the dates of a route not completed yet.
+        """
+        pending = [search_date for search_date in search_dates
+                   if not self.is_done(departure_iata, arrival_iata, search_date)]
+        skipped = len(search_dates) - len(pending)
+        if skipped:
+            logger.info(f"Route {departure_iata}-{arrival_iata}: {skipped} of "
+                        f"{len(search_dates)} dates already done in this window.")
+        return pending
+
+    def mark_done(self, departure_iata: str, arrival_iata: str,
+                  search_dates: Iterable[datetime]) -> None:
+        """
+        Appends completed cells to the checkpoint file and flushes them to disk.
+        """
+        cells = [self.make_cell(departure_iata, arrival_iata, search_date)
+                 for search_date in search_dates]
+        cells = [cell for cell in cells if cell not in self.done_cells]
+        if not cells:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        now = int(time.time())
+        with open(self.path, 'a', encoding='utf-8') as file:
+            file.write("".join(json.dumps({"cell": cell, "at": now}) + "\n" for cell in cells))
+            file.flush()
+            os.fsync(file.fileno())
+        self.done_cells.update(cells)
+
+    def complete(self) -> None:
+        """Removes the checkpoint file of a finished run."""
+        self.path.unlink(missing_ok=True)
+        self.done_cells.clear()
+        logger.info(f"Run complete, checkpoint '{self.path}' removed.")
+
+
+_checkpoint: ScrapeCheckpoint | None = None
+
+
+def get_scrape_checkpoint(start_date: datetime, end_date: datetime) -> ScrapeCheckpoint:
+    """
+    Returns the process-wide ScrapeCheckpoint of a run window, loading it on first use.
+    """
+    global _checkpoint
+    checkpoint_path = ScrapeCheckpoint(start_date, end_date).path
+    if _checkpoint is None or _checkpoint.path != checkpoint_path:
+        _checkpoint = ScrapeCheckpoint(start_date, end_date).load()
+    return _checkpoint
@@ -0,0 +1,107 @@
+import time
+import multiprocessing
+from functools import partial
+from datetime import datetime
+from typing import Callable, Dict, List, Tuple
+import logging
+import logging.config
+from logging_config import LOGGING_CONFIG
+from constants import (
+                    SCRAPE_PROCESSES, SCRAPE_DEADLINE_SECONDS,
+                    RATE_LIMIT_PER_SECOND, RATE_LIMIT_BURST)
+from http_transport import SharedTokenBucket, TokenBucket, configure_http_transport
+
+
+logging.config.dictConfig(LOGGING_CONFIG)
+logger = logging.getLogger(__name__)
+
+
+FetchRoute = Callable[[datetime, datetime, str, str], List[Tuple[datetime, dict]]]
+SaveRoute = Callable[[datetime, datetime, str, str, List[Tuple[datetime, dict]]], None]
+
+
+def _init_scrape_worker(rate_limiter: TokenBucket) -> None:
+    """
+    Process pool initializer: makes the worker HTTP transport draw from
+    the rate budget shared by all workers.
+    """
+    configure_http_transport(rate_limiter)
+
+
+def _scrape_route_shard(fetch_route: FetchRoute,
+                        start_date: datetime,
+                        end_date: datetime,
+                        route: Dict[str, str]) -> Tuple[Dict[str, str], List[Tuple[datetime, dict]] | None, str | None]:
+    """
+    Runs in a worker process: fetches one route.
+    Returns:
+        Tuple: (route, per-day responses, None) or (route, None, error message),
+            so a failed shard is still matched to its route.
+    """
+    try:
+        return route, fetch_route(start_date, end_date, route["departure"], route["arrival"]), None
+    except Exception as e:
+        return route, None, f"{type(e).__name__}: {e}"
+
+
+def scrape_routes_sharded(start_date: datetime,
+                          end_date: datetime,
+                          routes: List[Dict[str, str]],
+                          fetch_route: FetchRoute,
+                          save_route: SaveRoute,
+                          processes: int = SCRAPE_PROCESSES,
+                          deadline_seconds: int = SCRAPE_DEADLINE_SECONDS) -> int:
+    """
+    Spreads routes across a process pool and merges the results in this process.
+    Workers only fetch; every finished shard is saved here one at a time,
+    so the JSON file has a single writer. All workers share one
+    SharedTokenBucket, so the combined request rate stays within
+    RATE_LIMIT_PER_SECOND.
+    Args:
+        start_date (datetime): The starting date of the date range.
+        end_date (datetime): The ending date of the date range.
+        routes (List[Dict[str, str]]): Routes exp: [{"departure": "VNO", "arrival": "BCN"}]
+        fetch_route (FetchRoute): Module level function fetching one route,
+            exp: ryanair_one_way_cheap.fetch_route_fares.
+        save_route (SaveRoute): Function saving one route result,
+            exp: ryanair_one_way_cheap.save_route_fares.
+        processes (int): Number of worker processes.
+        deadline_seconds (int): Shards not finished by then are dropped from this
+            run and the worker processes are terminated, so the deadline bounds
+            the wall time of the scrape.
+    Returns:
+        int: Number of routes saved.
+    """
+    started_at = time.monotonic()
+    deadline = started_at + deadline_seconds
+    rate_limiter = SharedTokenBucket(RATE_LIMIT_PER_SECOND, RATE_LIMIT_BURST)
+    pool = multiprocessing.Pool(processes=min(processes, len(routes)) or 1,
+                                initializer=_init_scrape_worker,
+                                initargs=(rate_limiter,))
+    results = pool.imap_unordered(partial(_scrape_route_shard, fetch_route, start_date, end_date), routes)
+    pending = [f"{route['departure']}-{route['arrival']}" for route in routes]
+    saved_routes = 0
+    try:
+        for _ in routes:
+            route, route_fares, error = results.next(timeout=max(0.0, deadline - time.monotonic()))
+            route_name = f"{route['departure']}-{route['arrival']}"
+            pending.remove(route_name)
+            if error is not None:
+                logger.error(f"Route {route_name} shard failed: {error}")
+                continue
+            try:
+                save_route(start_date, end_date, route["departure"], route["arrival"], route_fares)
+                saved_routes += 1
+                logger.info(f"Route {route_name} shard merged.")
+            except Exception as e:
+                logger.error(f"Route {route_name} shard failed: {e}")
+    except multiprocessing.TimeoutError:
+        logger.warning(f"Scrape deadline {deadline_seconds}s reached, skipping routes: {pending}")
+    finally:
+        # Workers still fetching are killed, not waited for
+        pool.terminate()
+        pool.join()
+
+    logger.info(f"Sharded scrape saved {saved_routes}/{len(routes)} routes "
+                f"in {time.monotonic() - started_at:.1f}s.")
+    return saved_routes
@@ -0,0 +1,31 @@
+from constants import STORAGE_ENGINE
+from storage.base import StorageEngine, FlightKey, make_flight_key, is_departing_from
+from storage.json_file import JsonFileEngine
+from storage.json_lines import JsonLinesEngine
+from storage.binary import BinaryFileEngine, BinaryFlightFile, write_binary_flights
+from storage.sqlite import SqliteEngine
+from storage.sharded import ShardedEngine
+from storage.codec import (SERIALIZERS, COMPRESSIONS, encode_flights, decode_flights,
+                           read_flights_file, write_flights_file, iter_json_array, iter_flights_file)
+
+
+STORAGE_ENGINES = {engine.name: engine for engine in (JsonFileEngine, JsonLinesEngine, BinaryFileEngine, SqliteEngine,
+                                                        ShardedEngine)}
+
+
+def create_storage_engine(engine_name: str = STORAGE_ENGINE, path: str | None = None,
+                          **options) -> StorageEngine:
+    """
+    Returns a storage engine.
+    Args:
+        engine_name (str): exp: "json", "jsonl", "binary", "sqlite", "sharded"
+        path (str | None): File or folder of the engine, None - its default location.
+        **options: Other arguments of the engine, exp: serializer="msgpack".
+    Raises:
+        ValueError: If the engine name is unknown.
+    """
+    if engine_name not in STORAGE_ENGINES:
+        raise ValueError(f"Unknown storage engine '{engine_name}', "
+                         f"expected one of: {', '.join(STORAGE_ENGINES)}.")
+    engine_class = STORAGE_ENGINES[engine_name]
+    return engine_class(path, **options) if path else engine_class(**options)
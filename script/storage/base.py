@@ -0,0 +1,117 @@
+from pathlib import Path
+from typing import Iterator, List, Tuple
+import logging
+import logging.config
+from logging_config import LOGGING_CONFIG
+from flight_data_process import FlightData
+
+
+logging.config.dictConfig(LOGGING_CONFIG)
+logger = logging.getLogger(__name__)
+
+
+FlightKey = Tuple[str, str, str]
+
+
+def make_flight_key(entry: dict) -> FlightKey:
+    """
+    Returns: exp: ('VNO', 'BCN', '2025-03-25 17:05:00'), departure and
+        arrival iata and the departure date, one stored entry per key.
+    """
+    flight = FlightData(entry)
+    return (flight.get_departure_airport_iata(),
+            flight.get_arrival_airport_iata(),
+            flight.get_departure_date())
+
+
+def is_departing_from(entry: dict, departing_from: int | None) -> bool:
+    """True if the flight departs at or after a Unix timestamp, always True for None."""
+    return departing_from is None or (FlightData.from_store(entry).departure_timestamp or 0) >= departing_from
+
+
+class StorageEngine:
+    """
+    On-disk format of the flight entries kept in memory by FlightStore.
+    The store reports every change through the record_*() methods as it
+    happens, flush() then makes the reported changes durable. An engine
+    may ignore the records and write the whole flight list instead.
+    """
+    name = "base"
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): File or folder of the stored flights.
+        """
+        self.path = Path(path)
+
+    def load(self) -> List[dict]:
+        """
+        Returns:
+            List[dict]: Stored flight entries, empty if nothing is stored yet.
+        """
+        raise NotImplementedError
+
+    def iter_flights(self, departing_from: int | None = None) -> Iterator[dict]:
+        """
+        Yields the stored flight entries without going through FlightStore.
+        Engines that can stream hold one flight at a time, the others
+        (exp: "jsonl", whose logs change earlier flights) load everything first.
+        Args:
+            departing_from (int | None): Only flights departing at or after
+                this Unix timestamp, None - all flights.
+        """
+        for entry in self.load():
+            if is_departing_from(entry, departing_from):
+                yield entry
+
+    def record_add(self, key: FlightKey, entry: dict) -> None:
+        """A new flight entry was added."""
+
+    def record_price(self, key: FlightKey, price_value: dict, price_updated: int) -> None:
+        """
+        A price was appended to the history of a flight.
+        Args:
+            key (FlightKey): Key of the flight.
+            price_value (dict): exp: {"timestamp": 1742751829, "price": 191.29}
+            price_updated (int): New `priceUpdated` of the flight.
+        """
+
+    def record_delete(self, key: FlightKey) -> None:
+        """A flight entry was removed."""
+
+    def flush(self, flights: List[dict]) -> None:
+        """
+        Makes the recorded changes durable.
+        Args:
+            flights (List[dict]): All flight entries after the changes.
+        """
+        raise NotImplementedError
+
+    def rewrite(self, flights: List[dict]) -> None:
+        """Replaces everything stored with `flights`."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Waits for background work of the engine."""
+
+    def signature(self) -> List[list]:
+        """
+        Cheap fingerprint of what is stored, from the file or the files of the
+        folder, it changes with every write. Used to tell if something saved
+        beside the store, exp: the cheapest flights view, is still up to date.
+        Returns:
+            List[list]: exp: [['lt_spain_data.json', 48213, 1742751829123456789]],
+                empty if nothing is stored yet.
+        """
+        if self.path.is_dir():
+            paths = sorted(path for path in self.path.iterdir() if path.is_file())
+        elif self.path.exists():
+            paths = [self.path]
+        else:
+            return []
+        signature = []
+        for path in paths:
+            stat = path.stat()
+            signature.append([path.name, stat.st_size, stat.st_mtime_ns])
+        return signature
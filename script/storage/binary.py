@@ -0,0 +1,268 @@
+import os
+import mmap
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List
+import numpy as np
+import logging
+import logging.config
+from logging_config import LOGGING_CONFIG
+from constants import BINARY_FLIGHTS_PATH
+from flight_data_process import FlightData
+from price_history import PriceHistory
+from storage.base import StorageEngine
+
+
+logging.config.dictConfig(LOGGING_CONFIG)
+logger = logging.getLogger(__name__)
+
+
+BINARY_MAGIC = b"FLYSTEP1"
+BINARY_VERSION = 2
+
+# File layout, every section is a little-endian numpy array at the offset in the header:
+# header | flights | airports | prices | string offsets | string bytes
+HEADER_DTYPE = np.dtype([
+    ("magic", "S8"), ("version", "<u4"),
+    ("flights", "<u8"), ("airports", "<u8"), ("prices", "<u8"), ("strings", "<u8"),
+    ("flights_offset", "<u8"), ("airports_offset", "<u8"), ("prices_offset", "<u8"),
+    ("string_offsets_offset", "<u8"), ("string_data_offset", "<u8"),
+])
+# Fields are ids of the string table
+AIRPORT_DTYPE = np.dtype([
+    ("country_name", "<u4"), ("iata_code", "<u4"), ("name", "<u4"),
+    ("city_name", "<u4"), ("city_code", "<u4"), ("city_country_code", "<u4"),
+])
+# Fixed-size flight record, the prices of a flight are
+# prices[prices_start:prices_start + prices_count].
+# price_updated_text: 1 - priceUpdated is stored as a string, exp: "1742734424000"
+FLIGHT_DTYPE = np.dtype([
+    ("departure_airport", "<u4"), ("arrival_airport", "<u4"),
+    ("departure_date", "<u4"), ("arrival_date", "<u4"),
+    ("flight_number", "<u4"), ("currency_code", "<u4"),
+    ("departure_timestamp", "<i8"), ("price_updated", "<i8"),
+    ("latest_price", "<f8"), ("prices_start", "<u8"), ("prices_count", "<u4"),
+    ("price_updated_text", "u1"),
+])
+# integral: 1 - the price is an int in JSON, exp: 191 and not 191.0
+PRICE_DTYPE = np.dtype([("timestamp", "<i8"), ("price", "<f8"), ("integral", "u1")])
+
+AIRPORT_FIELDS = ("country_name", "iata_code", "name", "city_name", "city_code", "city_country_code")
+
+
+def _airport_strings(airport: dict) -> tuple:
+    """Returns: exp: ('Lithuania', 'VNO', 'Vilnius', 'Vilnius', 'VILNIUS', 'lt')"""
+    city = airport.get("city") or {}
+    return (airport.get("countryName", ""), airport.get("iataCode", ""), airport.get("name", ""),
+            city.get("name", ""), city.get("code", ""), city.get("countryCode", ""))
+
+
+def write_binary_flights(flights: List[dict], path: str) -> None:
+    """
+    Writes flight entries in the JSON file format as a binary flight file, atomically.
+    Args:
+        flights (List[dict]): Flight entries.
+        path (str): Binary file path.
+    """
+    strings: Dict[str, int] = {}
+    airports: Dict[tuple, int] = {}
+
+    def string_id(value) -> int:
+        return strings.setdefault(str(value or ""), len(strings))
+
+    def airport_id(airport: dict) -> int:
+        return airports.setdefault(tuple(string_id(value) for value in _airport_strings(airport or {})),
+                                   len(airports))
+
+    def price_updated(value) -> tuple:
+        if isinstance(value, str) and value.isdigit():
+            return int(value), 1
+        return (value, 0) if isinstance(value, int) else (0, 0)
+
+    flight_records = np.zeros(len(flights), dtype=FLIGHT_DTYPE)
+    price_points = []
+    for index, entry in enumerate(flights):
+        flight = FlightData.from_store(entry)
+        price = entry.get("price") or {}
+        prices_history = price.get("prices_history") or []
+        updated, updated_text = price_updated(entry.get("priceUpdated"))
+        flight_records[index] = (
+            airport_id(entry.get("departureAirport")), airport_id(entry.get("arrivalAirport")),
+            string_id(entry.get("departureDate")), string_id(entry.get("arrivalDate")),
+            string_id(entry.get("flightNumber")), string_id(price.get("currencyCode")),
+            flight.departure_timestamp or 0, updated,
+            flight.latest_price if prices_history else np.nan,
+            len(price_points), len(prices_history), updated_text,
+        )
+        price_points.extend((item["timestamp"], item["price"], isinstance(item["price"], int))
+                            for item in prices_history)
+
+    airport_records = np.array(list(airports), dtype=AIRPORT_DTYPE)
+    price_records = np.array(price_points, dtype=PRICE_DTYPE)
+    encoded_strings = [value.encode("utf-8") for value in strings]
+    string_offsets = np.zeros(len(encoded_strings) + 1, dtype="<u8")
+    np.cumsum([len(value) for value in encoded_strings], out=string_offsets[1:])
+
+    sections = [flight_records.tobytes(), airport_records.tobytes(), price_records.tobytes(),
+                string_offsets.tobytes(), b"".join(encoded_strings)]
+    offsets = np.cumsum([HEADER_DTYPE.itemsize] + [len(section) for section in sections[:-1]])
+    header = np.array([(BINARY_MAGIC, BINARY_VERSION,
+                        len(flight_records), len(airport_records), len(price_records), len(encoded_strings),
+                        *offsets)], dtype=HEADER_DTYPE)
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_suffix(".tmp")
+    with open(temp_path, 'wb') as file:
+        file.write(header.tobytes())
+        for section in sections:
+            file.write(section)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, path)
+    logger.info(f"Wrote {len(flight_records)} flights, {len(price_records)} prices "
+                f"and {len(encoded_strings)} strings to '{path}'.")
+
+
+class BinaryFlightFile:
+    """
+    Read-only memory-mapped binary flight file.
+    Opening reads only the header, the sections are numpy views into the
+    mapping, so column scans (departure times) and price
+    histories read the page cache without parsing or copying. Flight
+    entries in the JSON file format are built only for the flights asked for.
+    """
+    def __init__(self, path: str = BINARY_FLIGHTS_PATH):
+        """
+        Raises:
+            OSError: If the file can not be opened.
+            ValueError: If the file is not a binary flight file of this version.
+        """
+        self.path = Path(path)
+        with open(self.path, 'rb') as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        header = np.frombuffer(self._mmap, HEADER_DTYPE, count=1)[0] \
+            if len(self._mmap) >= HEADER_DTYPE.itemsize else None
+        if header is None or header["magic"] != BINARY_MAGIC or header["version"] != BINARY_VERSION:
+            logger.error(f"'{self.path}' is not a binary flight file of version {BINARY_VERSION}.")
+            raise ValueError(f"'{self.path}' is not a binary flight file of version {BINARY_VERSION}.")
+
+        self.flights = self._section(FLIGHT_DTYPE, header["flights"], header["flights_offset"])
+        self.airports = self._section(AIRPORT_DTYPE, header["airports"], header["airports_offset"])
+        self.prices = self._section(PRICE_DTYPE, header["prices"], header["prices_offset"])
+        self._string_offsets = self._section(np.dtype("<u8"), header["strings"] + 1,
+                                             header["string_offsets_offset"])
+        self._string_data_offset = int(header["string_data_offset"])
+        self._strings: Dict[int, str] = {}
+        self._airport_dicts: Dict[int, dict] = {}
+
+    def _section(self, dtype: np.dtype, count, offset) -> np.ndarray:
+        return np.frombuffer(self._mmap, dtype, count=int(count), offset=int(offset))
+
+    def __len__(self) -> int:
+        return len(self.flights)
+
+    def __enter__(self) -> "BinaryFlightFile":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Unmaps the file, views handed out keep it mapped until they are released."""
+        self.flights = self.airports = self.prices = self._string_offsets = None
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass
+
+    def string(self, string_id: int) -> str:
+        """Returns a string of the string table, decoded once."""
+        value = self._strings.get(string_id)
+        if value is None:
+            start = self._string_data_offset + int(self._string_offsets[string_id])
+            end = self._string_data_offset + int(self._string_offsets[string_id + 1])
+            value = self._strings[string_id] = self._mmap[start:end].decode("utf-8")
+        return value
+
+    def airport(self, airport_id: int) -> dict:
+        """
+        Returns the airport in the JSON file format, one shared dict per airport.
+        exp: {"countryName": "Lithuania", "iataCode": "VNO", "name": "Vilnius",
+              "city": {"name": "Vilnius", "code": "VILNIUS", "countryCode": "lt"}}
+        """
+        airport = self._airport_dicts.get(airport_id)
+        if airport is None:
+            country_name, iata_code, name, city_name, city_code, city_country_code = (
+                self.string(int(self.airports[airport_id][field])) for field in AIRPORT_FIELDS)
+            airport = self._airport_dicts[airport_id] = {
+                "countryName": country_name, "iataCode": iata_code, "name": name,
+                "city": {"name": city_name, "code": city_code, "countryCode": city_country_code},
+            }
+        return airport
+
+    def price_history(self, index: int) -> PriceHistory:
+        """Returns the prices of one flight, the arrays are views into the file."""
+        start = int(self.flights[index]["prices_start"])
+        end = start + int(self.flights[index]["prices_count"])
+        return PriceHistory(self.prices["timestamp"][start:end], self.prices["price"][start:end],
+                            self.prices["integral"][start:end])
+
+    def entry(self, index: int) -> dict:
+        """Returns one flight in the JSON file format."""
+        record = self.flights[index]
+        price_updated = int(record["price_updated"])
+        return {
+            "departureAirport": self.airport(int(record["departure_airport"])),
+            "arrivalAirport": self.airport(int(record["arrival_airport"])),
+            "departureDate": self.string(int(record["departure_date"])),
+            "arrivalDate": self.string(int(record["arrival_date"])),
+            "price": {
+                "prices_history": self.price_history(index).to_json(),
+                "currencyCode": self.string(int(record["currency_code"])),
+            },
+            "flightNumber": self.string(int(record["flight_number"])),
+            "priceUpdated": str(price_updated) if record["price_updated_text"] else price_updated,
+        }
+
+    def entries(self, indexes: Iterable[int]) -> Iterator[dict]:
+        """Yields the flights of the given indexes in the JSON file format."""
+        for index in indexes:
+            yield self.entry(int(index))
+
+    def __iter__(self) -> Iterator[dict]:
+        return self.entries(range(len(self)))
+
+    def departing_from(self, timestamp: int) -> np.ndarray:
+        """Indexes of the flights departing at or after a Unix timestamp, in file order."""
+        return np.flatnonzero(self.flights["departure_timestamp"] >= timestamp)
+
+
+class BinaryFileEngine(StorageEngine):
+    """
+    Flights in one memory-mapped binary file, see BinaryFlightFile.
+    FlightStore gets every entry in the JSON file format, every flush
+    rewrites the file atomically like the JSON file engine.
+    """
+    name = "binary"
+
+    def __init__(self, binary_file_path: str = BINARY_FLIGHTS_PATH):
+        super().__init__(binary_file_path)
+
+    def load(self) -> List[dict]:
+        """A missing file gives an empty list."""
+        return list(self.iter_flights())
+
+    def iter_flights(self, departing_from: int | None = None) -> Iterator[dict]:
+        """Decodes only the records departing from `departing_from`, found by a column scan."""
+        if not self.path.exists():
+            return
+        with BinaryFlightFile(str(self.path)) as flight_file:
+            indexes = range(len(flight_file)) if departing_from is None \
+                else flight_file.departing_from(departing_from)
+            yield from flight_file.entries(indexes)
+
+    def flush(self, flights: List[dict]) -> None:
+        self.rewrite(flights)
+
+    def rewrite(self, flights: List[dict]) -> None:
+        write_binary_flights(flights, str(self.path))
@@ -0,0 +1,189 @@
+import io
+import os
+import gzip
+import json
+from pathlib import Path
+from typing import IO, Iterator, List
+import msgspec
+import zstandard
+import logging
+import logging.config
+from logging_config import LOGGING_CONFIG
+from constants import STORAGE_SERIALIZER, STORAGE_COMPRESSION, STREAM_CHUNK_CHARS
+
+
+logging.config.dictConfig(LOGGING_CONFIG)
+logger = logging.getLogger(__name__)
+
+
+# "json-pretty" - stdlib json.dump(indent=4), the format written before the codec layer
+# "json" - compact JSON by msgspec
+# "msgpack" - MessagePack by msgspec
+SERIALIZERS = ("json-pretty", "json", "msgpack")
+COMPRESSIONS = ("none", "gzip", "zstd")
+
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+JSON_FIRST_BYTES = b"[{ \t\r\n"
+
+_json_encoder = msgspec.json.Encoder()
+_msgpack_encoder = msgspec.msgpack.Encoder()
+
+
+def encode_flights(flights: List[dict],
+                   serializer: str = STORAGE_SERIALIZER,
+                   compression: str = STORAGE_COMPRESSION) -> bytes:
+    """
+    Args:
+        flights (List[dict]): Flight entries.
+        serializer (str): One of SERIALIZERS.
+        compression (str): One of COMPRESSIONS.
+    Raises:
+        ValueError: If the serializer or compression is unknown.
+    """
+    if serializer == "json-pretty":
+        data = json.dumps(flights, indent=4).encode("utf-8")
+    elif serializer == "json":
+        data = _json_encoder.encode(flights)
+    elif serializer == "msgpack":
+        data = _msgpack_encoder.encode(flights)
+    else:
+        raise ValueError(f"Unknown serializer '{serializer}', expected one of: {', '.join(SERIALIZERS)}.")
+
+    if compression == "gzip":
+        return gzip.compress(data, compresslevel=6)
+    if compression == "zstd":
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    if compression != "none":
+        raise ValueError(f"Unknown compression '{compression}', expected one of: {', '.join(COMPRESSIONS)}.")
+    return data
+
+
+def decode_flights(data: bytes) -> list:
+    """
+    Decodes stored flights of any SERIALIZERS and COMPRESSIONS combination,
+    detected from the first bytes.
+    Raises:
+        msgspec.DecodeError: If the data is damaged.
+    """
+    if data.startswith(GZIP_MAGIC):
+        data = gzip.decompress(data)
+    elif data.startswith(ZSTD_MAGIC):
+        data = zstandard.ZstdDecompressor().decompress(data)
+    if not data.strip():
+        return []
+    if data[0] in JSON_FIRST_BYTES:
+        return msgspec.json.decode(data)
+    return msgspec.msgpack.decode(data)
+
+
+def read_flights_file(path: str) -> list:
+    """
+    Reads a flights file in any codec format. Like read_load_json_file(),
+    a missing, empty or invalid file gives an empty list.
+    Args:
+        path (str): Path of the file, exp: LT_SPAIN_DATA_JSON_PATH.
+    """
+    try:
+        with open(path, 'rb') as file:
+            flights = decode_flights(file.read())
+    except FileNotFoundError:
+        logger.warning(f"File '{path}' not found. Returning an empty list.")
+        return []
+    except (msgspec.DecodeError, OSError, EOFError, zstandard.ZstdError) as e:
+        logger.error(f"Error decoding flights in file '{path}': {e}. Returning an empty list.")
+        return []
+    logger.info(f"Successfully loaded data from '{path}'.")
+    return flights
+
+
+def iter_json_array(text_stream: IO[str], chunk_chars: int = STREAM_CHUNK_CHARS) -> Iterator:
+    """
+    Yields the items of a top-level JSON array one at a time, reading the
+    stream in chunks, so only one chunk and one item are held in memory.
+    Args:
+        text_stream (IO[str]): Text stream positioned at the array.
+        chunk_chars (int): Characters read at a time.
+    Raises:
+        json.JSONDecodeError: If the stream is not a JSON array or is damaged.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    is_eof = False
+    started = False
+
+    while True:
+        while position < len(buffer) and buffer[position] in " \t\r\n,":
+            position += 1
+        if position < len(buffer):
+            if not started:
+                if buffer[position] != "[":
+                    raise json.JSONDecodeError("Expecting '['", buffer, position)
+                started = True
+                position += 1
+                continue
+            if buffer[position] == "]":
+                return
+            try:
+                item, end = decoder.raw_decode(buffer, position)
+                # A number cut by the chunk end, exp: "2." of "2.5", decodes too,
+                # so an item counts only when a delimiter follows it
+                if is_eof or (end < len(buffer) and buffer[end] in " \t\r\n,]"):
+                    yield item
+                    position = end
+                    continue
+            except json.JSONDecodeError:
+                if is_eof:
+                    raise
+        elif is_eof:
+            if started:
+                raise json.JSONDecodeError("Unterminated array", buffer, position)
+            return
+        chunk = text_stream.read(chunk_chars)
+        is_eof = not chunk
+        buffer = buffer[position:] + chunk
+        position = 0
+
+
+def iter_flights_file(path: str, chunk_chars: int = STREAM_CHUNK_CHARS) -> Iterator[dict]:
+    """
+    Streams the flights of a flights file in any codec format. JSON is
+    parsed incrementally through gzip or zstd decompression, MessagePack
+    has no streaming decoder here and is decoded whole.
+    A missing file yields nothing.
+    Raises:
+        json.JSONDecodeError, msgspec.DecodeError: If the file is damaged.
+    """
+    try:
+        raw_file = open(path, 'rb')
+    except FileNotFoundError:
+        logger.warning(f"File '{path}' not found. Nothing to stream.")
+        return
+    with raw_file:
+        magic = raw_file.read(len(ZSTD_MAGIC))
+        raw_file.seek(0)
+        if magic.startswith(GZIP_MAGIC):
+            binary_stream = gzip.GzipFile(fileobj=raw_file)
+        elif magic.startswith(ZSTD_MAGIC):
+            binary_stream = io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(raw_file))
+        else:
+            binary_stream = io.BufferedReader(raw_file)
+        first_bytes = binary_stream.peek(1)[:1]
+        if first_bytes and first_bytes not in JSON_FIRST_BYTES:
+            yield from decode_flights(binary_stream.read())
+            return
+        yield from iter_json_array(io.TextIOWrapper(binary_stream, encoding="utf-8"), chunk_chars)
+
+
+def write_flights_file(flights: List[dict], path: str,
+                       serializer: str = STORAGE_SERIALIZER,
+                       compression: str = STORAGE_COMPRESSION) -> None:
+    """Writes a flights file atomically, see encode_flights()."""
+    data = encode_flights(flights, serializer, compression)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_suffix(".tmp")
+    with open(temp_path, 'wb') as file:
+        file.write(data)
+    os.replace(temp_path, path)
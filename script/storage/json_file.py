@@ -0,0 +1,60 @@
+import json
+from typing import Iterator, List
+import msgspec
+import zstandard
+import logging
+import logging.config
+from logging_config import LOGGING_CONFIG
+from constants import LT_SPAIN_DATA_JSON_PATH, STORAGE_SERIALIZER, STORAGE_COMPRESSION
+from storage.base import StorageEngine, is_departing_from
+from storage.codec import read_flights_file, write_flights_file, iter_flights_file
+
+
+logging.config.dictConfig(LOGGING_CONFIG)
+logger = logging.getLogger(__name__)
+
+
+class JsonFileEngine(StorageEngine):
+    """
+    All flights in one file, exp: LT_SPAIN_DATA_JSON_PATH, encoded by the
+    codec layer. Any codec format is read, the file is written in the
+    configured one, so the next flush migrates an older file.
+    Every flush rewrites the whole file atomically, so its cost grows with
+    the stored history, not with the number of changes.
+    """
+    name = "json"
+
+    def __init__(self, json_file_path: str = LT_SPAIN_DATA_JSON_PATH,
+                 serializer: str = STORAGE_SERIALIZER,
+                 compression: str = STORAGE_COMPRESSION):
+        """
+        Args:
+            json_file_path (str): Path of the flights file.
+            serializer (str): exp: "json", "json-pretty", "msgpack"
+            compression (str): exp: "none", "gzip", "zstd"
+        """
+        super().__init__(json_file_path)
+        self.serializer = serializer
+        self.compression = compression
+
+    def load(self) -> List[dict]:
+        """A missing or invalid file gives an empty list."""
+        return read_flights_file(str(self.path))
+
+    def iter_flights(self, departing_from: int | None = None) -> Iterator[dict]:
+        """
+        Streams the file one flight at a time, a damaged file ends the
+        stream at the damage like load() gives an empty list.
+        """
+        try:
+            for entry in iter_flights_file(str(self.path)):
+                if is_departing_from(entry, departing_from):
+                    yield entry
+        except (json.JSONDecodeError, msgspec.DecodeError, OSError, EOFError, zstandard.ZstdError) as e:
+            logger.error(f"Error streaming flights from '{self.path}': {e}. The stream ends here.")
+
+    def flush(self, flights: List[dict]) -> None:
+        self.rewrite(flights)
+
+    def rewrite(self, flights: List[dict]) -> None:
+        write_flights_file(flights, str(self.path), self.serializer, self.compression)
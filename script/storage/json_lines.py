@@ -0,0 +1,270 @@
+import os
+import re
+import json
+import threading
+from pathlib import Path
+from typing import Dict, List, Tuple
+import logging
+import logging.config
+from logging_config import LOGGING_CONFIG
+from constants import (FLIGHTS_LOG_FOLDER_PATH, LT_SPAIN_DATA_JSON_PATH,
+                       STORAGE_COMPACT_LOG_BYTES)
+from storage.base import StorageEngine, FlightKey, make_flight_key
+from storage.codec import read_flights_file
+
+
+logging.config.dictConfig(LOGGING_CONFIG)
+logger = logging.getLogger(__name__)
+
+
+SNAPSHOT_FILE_NAME = "snapshot.jsonl"
+SNAPSHOT_FORMAT = "flights-jsonl"
+LOG_FILE_PATTERN = re.compile(r"^log-(\d{6})\.jsonl$")
+
+
+class JsonLinesEngine(StorageEngine):
+    """
+    Flights as a snapshot and append-only change logs in JSON Lines:
+        snapshot.jsonl    {"format": "flights-jsonl", "log_seq": 3, "flights": 812}
+                          one flight entry per line
+        log-000004.jsonl  {"op": "add", "entry": {...}}
+                          {"op": "price", "key": ["VNO", "BCN", "2025-03-25 17:05:00"],
+                           "price": {"timestamp": 1742751829, "price": 191.29},
+                           "priceUpdated": 1742734424000}
+                          {"op": "delete", "key": [...]}
+    flush() appends and fsyncs only the changes recorded since the previous
+    flush, so a new price costs one short line, not a rewrite of the history.
+    Once the current log reaches `compact_log_bytes` new changes go to the
+    next log, and a background thread folds the snapshot and the finished
+    logs into a new snapshot, replaced atomically. `log_seq` of the snapshot
+    is the last log it contains, load() replays only the newer logs and
+    drops a torn last line, so whatever a crash leaves behind can be loaded.
+    """
+    name = "jsonl"
+
+    def __init__(self, folder: str = FLIGHTS_LOG_FOLDER_PATH,
+                 compact_log_bytes: int = STORAGE_COMPACT_LOG_BYTES,
+                 import_json_path: str | None = LT_SPAIN_DATA_JSON_PATH):
+        """
+        Args:
+            folder (str): Folder of the snapshot and the logs.
+            compact_log_bytes (int): Log size that starts a compaction.
+            import_json_path (str | None): JSON file imported into an empty folder, None - no import.
+        """
+        super().__init__(folder)
+        self.compact_log_bytes = compact_log_bytes
+        self.import_json_path = import_json_path
+        self.snapshot_path = self.path / SNAPSHOT_FILE_NAME
+        self._log_seq = 1
+        self._pending: List[str] = []
+        self._compaction: threading.Thread | None = None
+
+    def _log_path(self, log_seq: int) -> Path:
+        """Returns: exp: folder/log-000004.jsonl"""
+        return self.path / f"log-{log_seq:06d}.jsonl"
+
+    def _log_seqs(self) -> List[int]:
+        """Sequence numbers of the log files on disk, in order."""
+        if not self.path.is_dir():
+            return []
+        return sorted(int(match.group(1)) for path in self.path.iterdir()
+                      if (match := LOG_FILE_PATTERN.match(path.name)))
+
+    def _read_snapshot(self) -> Tuple[int, List[dict]]:
+        """
+        Returns:
+            Tuple[int, List[dict]]: `log_seq` and the flights of the snapshot, (0, []) without one.
+        Raises:
+            ValueError: If the snapshot is damaged. It is only ever replaced
+                atomically, so it is not dropped like a torn log line.
+        """
+        if not self.snapshot_path.exists():
+            return 0, []
+        with open(self.snapshot_path, 'r', encoding='utf-8') as file:
+            try:
+                header = json.loads(file.readline())
+                flights = [json.loads(line) for line in file]
+            except json.JSONDecodeError as e:
+                logger.error(f"Invalid flight snapshot '{self.snapshot_path}': {e}")
+                raise ValueError(f"Invalid flight snapshot '{self.snapshot_path}'.") from e
+        if not isinstance(header, dict) or header.get("format") != SNAPSHOT_FORMAT:
+            logger.error(f"Unknown flight snapshot header in '{self.snapshot_path}': {header}")
+            raise ValueError(f"Unknown flight snapshot format in '{self.snapshot_path}'.")
+        return header["log_seq"], flights
+
+    def _write_snapshot(self, flights: List[dict], log_seq: int) -> None:
+        """Replaces the snapshot atomically and removes the logs it contains."""
+        self.path.mkdir(parents=True, exist_ok=True)
+        temp_path = self.snapshot_path.with_suffix(".tmp")
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            file.write(json.dumps({"format": SNAPSHOT_FORMAT,
+                                   "log_seq": log_seq,
+                                   "flights": len(flights)}) + "\n")
+            for entry in flights:
+                file.write(json.dumps(entry) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, self.snapshot_path)
+        for seq in self._log_seqs():
+            if seq <= log_seq:
+                self._log_path(seq).unlink(missing_ok=True)
+
+    @staticmethod
+    def _index_flights(flights: List[dict]) -> Dict[FlightKey, dict]:
+        index = {}
+        for entry in flights:
+            index.setdefault(make_flight_key(entry), entry)
+        return index
+
+    def _apply(self, record: dict, flights: List[dict], index: Dict[FlightKey, dict]) -> None:
+        """Applies one log record to the flights and their index."""
+        op = record.get("op")
+        if op == "add":
+            entry = record["entry"]
+            key = make_flight_key(entry)
+            if key in index:
+                logger.warning(f"Log adds flight {key} that is already stored, skipping.")
+                return
+            index[key] = entry
+            flights.append(entry)
+        elif op == "price":
+            entry = index.get(tuple(record["key"]))
+            if entry is None:
+                logger.warning(f"Log updates price of unknown flight {record['key']}, skipping.")
+                return
+            entry["price"]["prices_history"].append(record["price"])
+            entry["priceUpdated"] = record["priceUpdated"]
+        elif op == "delete":
+            entry = index.pop(tuple(record["key"]), None)
+            if entry is not None:
+                flights[:] = [flight for flight in flights if flight is not entry]
+        else:
+            logger.warning(f"Unknown log record op: {op}, skipping.")
+
+    def _replay_log(self, log_path: Path, flights: List[dict], index: Dict[FlightKey, dict]) -> int:
+        """
+        Applies the records of one log, stopping at the first torn or invalid line.
+        Returns:
+            int: Length in bytes of the applied lines.
+        """
+        valid_bytes = 0
+        with open(log_path, 'rb') as file:
+            for line in file:
+                if not line.endswith(b"\n"):
+                    logger.warning(f"Dropping torn last line of '{log_path}'.")
+                    break
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"Dropping invalid line of '{log_path}' and the lines after it.")
+                    break
+                self._apply(record, flights, index)
+                valid_bytes += len(line)
+        return valid_bytes
+
+    def load(self) -> List[dict]:
+        """
+        Reads the snapshot and replays the newer logs. An empty folder first
+        imports `import_json_path` as the snapshot.
+        Raises:
+            ValueError: If the snapshot is damaged.
+        """
+        self.close()
+        log_seqs = self._log_seqs()
+        if (not log_seqs and not self.snapshot_path.exists()
+                and self.import_json_path and os.path.exists(self.import_json_path)):
+            imported = read_flights_file(self.import_json_path)
+            self._write_snapshot(imported, 0)
+            logger.info(f"Imported {len(imported)} flights from '{self.import_json_path}' into '{self.path}'.")
+
+        snapshot_seq, flights = self._read_snapshot()
+        index = self._index_flights(flights)
+        for seq in log_seqs:
+            log_path = self._log_path(seq)
+            if seq <= snapshot_seq:
+                # Left behind by a compaction interrupted after the snapshot was replaced
+                log_path.unlink(missing_ok=True)
+                continue
+            valid_bytes = self._replay_log(log_path, flights, index)
+            if valid_bytes < log_path.stat().st_size:
+                with open(log_path, 'r+b') as file:
+                    file.truncate(valid_bytes)
+
+        self._log_seq = max([snapshot_seq + 1, *log_seqs])
+        self._pending = []
+        return flights
+
+    def record_add(self, key: FlightKey, entry: dict) -> None:
+        self._pending.append(json.dumps({"op": "add", "entry": entry}))
+
+    def record_price(self, key: FlightKey, price_value: dict, price_updated: int) -> None:
+        self._pending.append(json.dumps({"op": "price",
+                                         "key": list(key),
+                                         "price": price_value,
+                                         "priceUpdated": price_updated}))
+
+    def record_delete(self, key: FlightKey) -> None:
+        self._pending.append(json.dumps({"op": "delete", "key": list(key)}))
+
+    def flush(self, flights: List[dict]) -> None:
+        """Appends the recorded changes to the current log and starts a compaction when it is due."""
+        if not self._pending:
+            return
+        self.path.mkdir(parents=True, exist_ok=True)
+        log_path = self._log_path(self._log_seq)
+        with open(log_path, 'a', encoding='utf-8') as file:
+            file.write("\n".join(self._pending) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+            log_bytes = file.tell()
+        logger.info(f"Appended {len(self._pending)} changes to '{log_path}'.")
+        self._pending = []
+        if log_bytes >= self.compact_log_bytes:
+            self.start_compaction()
+
+    def start_compaction(self) -> bool:
+        """
+        Finishes the current log and compacts it in a background thread.
+        Returns:
+            bool: False if a compaction is still running.
+        """
+        if self._compaction is not None and self._compaction.is_alive():
+            return False
+        through_seq = self._log_seq
+        self._log_seq += 1
+        self._compaction = threading.Thread(target=self.compact,
+                                            args=(through_seq,),
+                                            name="flight-log-compaction",
+                                            daemon=True)
+        self._compaction.start()
+        return True
+
+    def compact(self, through_seq: int) -> None:
+        """
+        Folds the snapshot and the logs up to `through_seq` into a new snapshot.
+        Works on the files only, so changes can be appended to newer logs meanwhile.
+        """
+        try:
+            snapshot_seq, flights = self._read_snapshot()
+            index = self._index_flights(flights)
+            for seq in self._log_seqs():
+                if snapshot_seq < seq <= through_seq:
+                    self._replay_log(self._log_path(seq), flights, index)
+            self._write_snapshot(flights, through_seq)
+            logger.info(f"Compacted '{self.path}' through log {through_seq}, {len(flights)} flights.")
+        except (OSError, ValueError) as e:
+            logger.error(f"Compaction of '{self.path}' failed: {e}")
+
+    def rewrite(self, flights: List[dict]) -> None:
+        """Writes `flights` as the snapshot, dropping the logs and the unflushed changes."""
+        self.close()
+        self._pending = []
+        # Without load(), exp: replay_archive --rebuild, the logs on disk are not counted yet
+        self._log_seq = max([self._log_seq, *self._log_seqs()])
+        self._write_snapshot(flights, self._log_seq)
+        self._log_seq += 1
+
+    def close(self) -> None:
+        if self._compaction is not None:
+            self._compaction.join()
+            self._compaction = None
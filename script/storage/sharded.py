@@ -0,0 +1,263 @@
+import os
+import re
+import json
+import time
+from datetime import datetime
+from typing import Dict, Iterator, List, Set
+import logging
+import logging.config
+from logging_config import LOGGING_CONFIG
+from constants import (SHARDED_FLIGHTS_FOLDER_PATH, LT_SPAIN_DATA_JSON_PATH,
+                       STORAGE_SERIALIZER, STORAGE_COMPRESSION)
+from flight_data_process import FlightData
+from storage.base import StorageEngine, FlightKey, make_flight_key, is_departing_from
+from storage.json_file import JsonFileEngine
+from storage.codec import read_flights_file
+
+
+logging.config.dictConfig(LOGGING_CONFIG)
+logger = logging.getLogger(__name__)
+
+
+MANIFEST_FILE_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+UNKNOWN_MONTH = "unknown"
+MONTH_PATTERN = re.compile(r"^\d{4}-\d{2}")
+SHARD_FILE_PATTERN = re.compile(r"^(?P<departure>[^-]*)-(?P<arrival>[^-]*)-(?P<month>\d{4}-\d{2}|unknown)\.json$")
+
+
+def shard_id(key: FlightKey) -> str:
+    """
+    Returns: exp: 'VNO-BCN-2025-03' for ('VNO', 'BCN', '2025-03-25 17:05:00'),
+        'VNO-BCN-unknown' for a flight without a valid departure date.
+    """
+    month = key[2][:7] if MONTH_PATTERN.match(key[2]) else UNKNOWN_MONTH
+    return f"{key[0]}-{key[1]}-{month}"
+
+
+def _current_month() -> str:
+    return datetime.today().strftime("%Y-%m")
+
+
+class ShardedEngine(StorageEngine):
+    """
+    Flights split into JSON files by (departure iata, arrival iata, departure month):
+        manifest.json     {"version": 1, "shards": {"VNO-BCN-2025-03": {"departure": "VNO",
+                           "arrival": "BCN", "month": "2025-03", "flights": 31, "prices": 94,
+                           "frozen": false, "updated_at": 1742751829}}}
+        VNO-BCN-2025-03.json
+    flush() rewrites only the shards changed since the previous flush and
+    then the manifest. Shards of months before the current one have only
+    departed flights: they are marked frozen in the manifest and load()
+    skips them, so the run keeps and writes the open months only.
+    iter_flights() and route_flights() pick the shards to read from the
+    manifest.
+    """
+    name = "sharded"
+
+    def __init__(self, folder: str = SHARDED_FLIGHTS_FOLDER_PATH,
+                 import_json_path: str | None = LT_SPAIN_DATA_JSON_PATH,
+                 serializer: str = STORAGE_SERIALIZER,
+                 compression: str = STORAGE_COMPRESSION):
+        """
+        Args:
+            folder (str): Folder of the manifest and the shards.
+            import_json_path (str | None): JSON file imported into an empty folder, None - no import.
+            serializer (str): Codec serializer of the shards, exp: "json".
+            compression (str): Codec compression of the shards, exp: "zstd".
+        """
+        super().__init__(folder)
+        self.import_json_path = import_json_path
+        self.serializer = serializer
+        self.compression = compression
+        self.manifest_path = self.path / MANIFEST_FILE_NAME
+        self.manifest: Dict[str, dict] = {}
+        self._shards: Dict[str, List[dict]] = {}
+        self._dirty: Set[str] = set()
+
+    def _shard_engine(self, shard: str) -> JsonFileEngine:
+        return JsonFileEngine(str(self.path / f"{shard}.json"), self.serializer, self.compression)
+
+    def _read_manifest(self) -> Dict[str, dict]:
+        """
+        Returns the shards of the manifest. Shard files missing from it, exp:
+        written just before a crash, are added with unknown counts.
+        """
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as file:
+                manifest = json.load(file).get("shards", {})
+        except FileNotFoundError:
+            manifest = {}
+        except (json.JSONDecodeError, AttributeError) as e:
+            logger.warning(f"Invalid shard manifest '{self.manifest_path}', rebuilding it from the files: {e}")
+            manifest = {}
+
+        if self.path.is_dir():
+            for path in self.path.iterdir():
+                match = SHARD_FILE_PATTERN.match(path.name)
+                if match and path.stem not in manifest:
+                    manifest[path.stem] = {"departure": match["departure"], "arrival": match["arrival"],
+                                           "month": match["month"], "flights": None, "prices": None,
+                                           "frozen": False, "updated_at": int(path.stat().st_mtime)}
+        return manifest
+
+    def _write_manifest(self) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        temp_path = self.manifest_path.with_suffix(".tmp")
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump({"version": MANIFEST_VERSION, "shards": dict(sorted(self.manifest.items()))}, file, indent=4)
+        os.replace(temp_path, self.manifest_path)
+
+    def _write_shard(self, shard: str, entries: List[dict], key: FlightKey) -> None:
+        """Writes one shard and its manifest item, an empty shard is removed."""
+        shard_engine = self._shard_engine(shard)
+        if not entries:
+            shard_engine.path.unlink(missing_ok=True)
+            self.manifest.pop(shard, None)
+            return
+        shard_engine.rewrite(entries)
+        month = shard[len(key[0]) + len(key[1]) + 2:]
+        self.manifest[shard] = {
+            "departure": key[0], "arrival": key[1], "month": month,
+            "flights": len(entries),
+            "prices": sum(len(FlightData(entry).get_price_values()) for entry in entries),
+            "frozen": self._is_past_month(month),
+            "updated_at": int(time.time()),
+        }
+
+    @staticmethod
+    def _is_past_month(month: str) -> bool:
+        return month != UNKNOWN_MONTH and month < _current_month()
+
+    def _freeze_departed(self) -> bool:
+        """Marks shards of past months frozen, True if the manifest changed."""
+        changed = False
+        for shard_info in self.manifest.values():
+            if not shard_info.get("frozen") and self._is_past_month(shard_info["month"]):
+                shard_info["frozen"] = True
+                changed = True
+        return changed
+
+    def _select_shards(self, departure_iata: str | None = None, arrival_iata: str | None = None,
+                       departing_from: int | None = None) -> List[str]:
+        """Shards of the manifest that can hold the flights asked for, in name order."""
+        from_month = datetime.fromtimestamp(departing_from).strftime("%Y-%m") if departing_from is not None else None
+        return [shard for shard, shard_info in sorted(self.manifest.items())
+                if (departure_iata is None or shard_info["departure"] == departure_iata)
+                and (arrival_iata is None or shard_info["arrival"] == arrival_iata)
+                and (from_month is None or shard_info["month"] == UNKNOWN_MONTH or shard_info["month"] >= from_month)]
+
+    def load(self) -> List[dict]:
+        """
+        Reads the shards that are not frozen. An empty folder first imports
+        `import_json_path`.
+        """
+        self.manifest = self._read_manifest()
+        if not self.manifest and self.import_json_path and os.path.exists(self.import_json_path):
+            imported = read_flights_file(self.import_json_path)
+            self.rewrite(imported)
+            logger.info(f"Imported {len(imported)} flights from '{self.import_json_path}' "
+                        f"into {len(self.manifest)} shards in '{self.path}'.")
+        if self._freeze_departed():
+            self._write_manifest()
+
+        self._shards = {}
+        self._dirty = set()
+        flights = []
+        for shard, shard_info in sorted(self.manifest.items()):
+            if shard_info["frozen"]:
+                continue
+            self._shards[shard] = self._shard_engine(shard).load()
+            flights.extend(self._shards[shard])
+        logger.info(f"Loaded {len(self._shards)} of {len(self.manifest)} shards from '{self.path}', "
+                    f"{len(self.manifest) - len(self._shards)} frozen.")
+        return flights
+
+    def iter_flights(self, departing_from: int | None = None) -> Iterator[dict]:
+        """Streams the flights shard by shard, frozen shards included, reading only the shards needed."""
+        self.manifest = self._read_manifest()
+        for shard in self._select_shards(departing_from=departing_from):
+            yield from self._shard_engine(shard).iter_flights(departing_from)
+
+    def route_flights(self, departure_iata: str, arrival_iata: str,
+                      departing_from: int | None = None) -> List[dict]:
+        """
+        Returns the flights of one route, reading only its shards.
+        Args:
+            departure_iata (str): exp: "VNO"
+            arrival_iata (str): exp: "BCN"
+            departing_from (int | None): Earliest departure Unix timestamp, None - all months.
+        """
+        self.manifest = self._read_manifest()
+        return [entry for shard in self._select_shards(departure_iata, arrival_iata, departing_from)
+                for entry in self._shard_engine(shard).load()
+                if is_departing_from(entry, departing_from)]
+
+    def _open_shard(self, key: FlightKey) -> str | None:
+        """Shard of a changed flight, None for a frozen one, which is not written."""
+        shard = shard_id(key)
+        if shard in self._shards:
+            return shard
+        if self.manifest.get(shard, {}).get("frozen") or self._is_past_month(shard[-7:]):
+            logger.warning(f"Change of departed flight {key} is not written, shard '{shard}' is frozen.")
+            return None
+        self._shards[shard] = []
+        return shard
+
+    def record_add(self, key: FlightKey, entry: dict) -> None:
+        shard = self._open_shard(key)
+        if shard is not None:
+            self._shards[shard].append(entry)
+            self._dirty.add(shard)
+
+    def record_price(self, key: FlightKey, price_value: dict, price_updated: int) -> None:
+        """The entry is changed in place, its shard only has to be written."""
+        shard = self._open_shard(key)
+        if shard is not None:
+            self._dirty.add(shard)
+
+    def record_delete(self, key: FlightKey) -> None:
+        shard = self._open_shard(key)
+        if shard is not None:
+            self._shards[shard] = [entry for entry in self._shards[shard] if make_flight_key(entry) != key]
+            self._dirty.add(shard)
+
+    def flush(self, flights: List[dict]) -> None:
+        """Rewrites the changed shards, then the manifest."""
+        if not self._dirty:
+            return
+        for shard in sorted(self._dirty):
+            entries = self._shards.get(shard, [])
+            self._write_shard(shard, entries, make_flight_key(entries[0]) if entries else ("", "", ""))
+        logger.info(f"Wrote {len(self._dirty)} shards to '{self.path}'.")
+        self._dirty = set()
+        self._write_manifest()
+
+    def rewrite(self, flights: List[dict]) -> None:
+        """
+        Replaces the stored flights with `flights`. Frozen shards are only
+        extended: load() did not read them, so their flights missing from
+        `flights` are kept and the ones in it replace the stored ones.
+        """
+        self.manifest = self._read_manifest()
+        grouped: Dict[str, List[dict]] = {}
+        keys: Dict[str, FlightKey] = {}
+        for entry in flights:
+            key = make_flight_key(entry)
+            shard = shard_id(key)
+            grouped.setdefault(shard, []).append(entry)
+            keys.setdefault(shard, key)
+
+        for shard, shard_info in list(self.manifest.items()):
+            if shard not in grouped and not shard_info.get("frozen"):
+                self._write_shard(shard, [], ("", "", ""))
+        for shard, entries in grouped.items():
+            if self.manifest.get(shard, {}).get("frozen"):
+                frozen_entries = {make_flight_key(entry): entry for entry in self._shard_engine(shard).load()}
+                frozen_entries.update((make_flight_key(entry), entry) for entry in entries)
+                entries = list(frozen_entries.values())
+            self._write_shard(shard, entries, keys[shard])
+        self._shards = {shard: entries for shard, entries in grouped.items()
+                        if not self.manifest[shard]["frozen"]}
+        self._dirty = set()
+        self._write_manifest()
@@ -0,0 +1,265 @@
+import json
+import sqlite3
+from itertools import groupby
+from typing import Dict, Iterator, List
+import logging
+import logging.config
+from logging_config import LOGGING_CONFIG
+from constants import SQLITE_FLIGHTS_PATH, LT_SPAIN_DATA_JSON_PATH
+from flight_data_process import FlightData
+from storage.base import StorageEngine, FlightKey, make_flight_key
+from storage.codec import read_flights_file
+
+
+logging.config.dictConfig(LOGGING_CONFIG)
+logger = logging.getLogger(__name__)
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS airports (
+    id INTEGER PRIMARY KEY,
+    data TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS flights (
+    id INTEGER PRIMARY KEY,
+    departure_iata TEXT NOT NULL,
+    arrival_iata TEXT NOT NULL,
+    departure_key TEXT NOT NULL,
+    departure_timestamp INTEGER,
+    departure_airport_id INTEGER NOT NULL REFERENCES airports (id),
+    arrival_airport_id INTEGER NOT NULL REFERENCES airports (id),
+    departure_date TEXT NOT NULL,
+    arrival_date TEXT NOT NULL,
+    flight_number TEXT NOT NULL,
+    currency_code TEXT NOT NULL,
+    price_updated,
+    UNIQUE (departure_iata, arrival_iata, departure_key)
+);
+CREATE INDEX IF NOT EXISTS flights_route_departure
+    ON flights (departure_iata, arrival_iata, departure_timestamp);
+CREATE INDEX IF NOT EXISTS flights_departure_timestamp ON flights (departure_timestamp);
+CREATE INDEX IF NOT EXISTS flights_flight_number ON flights (flight_number);
+CREATE TABLE IF NOT EXISTS price_points (
+    flight_id INTEGER NOT NULL REFERENCES flights (id) ON DELETE CASCADE,
+    seq INTEGER NOT NULL,
+    timestamp INTEGER NOT NULL,
+    price NOT NULL,
+    PRIMARY KEY (flight_id, seq)
+) WITHOUT ROWID;
+"""
+
+FLIGHT_COLUMNS = ("id, departure_airport_id, arrival_airport_id, departure_date, arrival_date, "
+                  "flight_number, currency_code, price_updated")
+KEY_CONDITION = "departure_iata = ? AND arrival_iata = ? AND departure_key = ?"
+
+
+class SqliteEngine(StorageEngine):
+    """
+    Flights in an embedded SQLite database in WAL mode, so the store can be
+    read by other processes while a run writes it.
+    Flights are unique and indexed by the flight key, and indexed by route
+    and departure time and by flight number. Price points are rows of their
+    own. The changes recorded since the previous flush are written by flush()
+    in one transaction, consecutive price points with one executemany().
+    The `price_updated` and `price` columns have no type, so the int, float
+    or string value of an entry is kept as it is, exp: 191 is not read back as 191.0.
+    """
+    name = "sqlite"
+
+    def __init__(self, database_path: str = SQLITE_FLIGHTS_PATH,
+                 import_json_path: str | None = LT_SPAIN_DATA_JSON_PATH):
+        """
+        Args:
+            database_path (str): SQLite database file.
+            import_json_path (str | None): JSON file imported into a new database, None - no import.
+        """
+        super().__init__(database_path)
+        self.import_json_path = import_json_path
+        self._connection: sqlite3.Connection | None = None
+        self._pending: List[tuple] = []
+        self._airport_ids: Dict[str, int] = {}
+        self._airports: Dict[int, dict] = {}
+
+    def connect(self) -> sqlite3.Connection:
+        """Opens the database on first use, creating the schema and importing the JSON file if it is new."""
+        if self._connection is not None:
+            return self._connection
+        is_new = not self.path.exists()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(self.path)
+        self._connection.execute("PRAGMA journal_mode = WAL")
+        self._connection.execute("PRAGMA synchronous = NORMAL")
+        self._connection.execute("PRAGMA foreign_keys = ON")
+        self._connection.executescript(SCHEMA)
+        if is_new and self.import_json_path:
+            imported = read_flights_file(self.import_json_path)
+            if imported:
+                self.rewrite(imported)
+                logger.info(f"Imported {len(imported)} flights from '{self.import_json_path}' into '{self.path}'.")
+        return self._connection
+
+    def _airport_id(self, airport: dict) -> int:
+        data = json.dumps(airport or {}, sort_keys=True)
+        airport_id = self._airport_ids.get(data)
+        if airport_id is None:
+            self._connection.execute("INSERT OR IGNORE INTO airports (data) VALUES (?)", (data,))
+            airport_id = self._connection.execute("SELECT id FROM airports WHERE data = ?", (data,)).fetchone()[0]
+            self._airport_ids[data] = airport_id
+        return airport_id
+
+    def _airport(self, airport_id: int) -> dict:
+        """Returns the airport dict, one shared dict per airport row."""
+        airport = self._airports.get(airport_id)
+        if airport is None:
+            data = self._connection.execute("SELECT data FROM airports WHERE id = ?", (airport_id,)).fetchone()[0]
+            airport = self._airports[airport_id] = json.loads(data)
+        return airport
+
+    def _insert_flight(self, key: FlightKey, entry: dict, prices_history: List[dict]) -> None:
+        """Inserts a flight and its price points, replacing a flight with the same key."""
+        price = entry.get("price") or {}
+        self._connection.execute(f"DELETE FROM flights WHERE {KEY_CONDITION}", key)
+        cursor = self._connection.execute(
+            "INSERT INTO flights (departure_iata, arrival_iata, departure_key, departure_timestamp, "
+            "departure_airport_id, arrival_airport_id, departure_date, arrival_date, "
+            "flight_number, currency_code, price_updated) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (*key, FlightData(entry).departure_timestamp,
+             self._airport_id(entry.get("departureAirport")), self._airport_id(entry.get("arrivalAirport")),
+             entry.get("departureDate", ""), entry.get("arrivalDate", ""),
+             entry.get("flightNumber", ""), price.get("currencyCode", ""), entry.get("priceUpdated")))
+        self._connection.executemany(
+            "INSERT INTO price_points (flight_id, seq, timestamp, price) VALUES (?, ?, ?, ?)",
+            [(cursor.lastrowid, seq, item["timestamp"], item["price"])
+             for seq, item in enumerate(prices_history)])
+
+    def _rows_to_entries(self, rows: List[tuple]) -> List[dict]:
+        """Builds flight entries in the JSON file format from flights rows of FLIGHT_COLUMNS."""
+        if not rows:
+            return []
+        prices: Dict[int, List[dict]] = {row[0]: [] for row in rows}
+        for chunk_start in range(0, len(rows), 500):
+            flight_ids = [row[0] for row in rows[chunk_start:chunk_start + 500]]
+            for flight_id, timestamp, price in self._connection.execute(
+                    "SELECT flight_id, timestamp, price FROM price_points "
+                    f"WHERE flight_id IN ({', '.join('?' * len(flight_ids))}) ORDER BY flight_id, seq",
+                    flight_ids):
+                prices[flight_id].append({"timestamp": timestamp, "price": price})
+        return [{
+            "departureAirport": self._airport(departure_airport_id),
+            "arrivalAirport": self._airport(arrival_airport_id),
+            "departureDate": departure_date,
+            "arrivalDate": arrival_date,
+            "price": {"prices_history": prices[flight_id], "currencyCode": currency_code},
+            "flightNumber": flight_number,
+            "priceUpdated": price_updated,
+        } for (flight_id, departure_airport_id, arrival_airport_id, departure_date, arrival_date,
+               flight_number, currency_code, price_updated) in rows]
+
+    def load(self) -> List[dict]:
+        connection = self.connect()
+        self._pending = []
+        return self._rows_to_entries(connection.execute(f"SELECT {FLIGHT_COLUMNS} FROM flights ORDER BY id").fetchall())
+
+    def iter_flights(self, departing_from: int | None = None) -> Iterator[dict]:
+        """Yields the flights in batches, with `departing_from` through the departure time index."""
+        connection = self.connect()
+        if departing_from is None:
+            cursor = connection.execute(f"SELECT {FLIGHT_COLUMNS} FROM flights ORDER BY id")
+        else:
+            cursor = connection.execute(f"SELECT {FLIGHT_COLUMNS} FROM flights "
+                                        "WHERE departure_timestamp >= ? ORDER BY id", (departing_from,))
+        while rows := cursor.fetchmany(500):
+            yield from self._rows_to_entries(rows)
+
+    def get_flight(self, key: FlightKey) -> dict | None:
+        """Returns the stored flight of a flight key, exp: ('VNO', 'BCN', '2025-03-25 17:05:00'), or None."""
+        rows = self.connect().execute(f"SELECT {FLIGHT_COLUMNS} FROM flights WHERE {KEY_CONDITION}",
+                                      key).fetchall()
+        return self._rows_to_entries(rows)[0] if rows else None
+
+    def route_flights(self, departure_iata: str, arrival_iata: str,
+                      departing_from: int | None = None, departing_until: int | None = None) -> List[dict]:
+        """
+        Returns the flights of one route through the route index, ordered by departure.
+        Args:
+            departure_iata (str): exp: "VNO"
+            arrival_iata (str): exp: "BCN"
+            departing_from (int | None): Earliest departure Unix timestamp, None - no limit.
+            departing_until (int | None): Latest departure Unix timestamp, None - no limit.
+        """
+        rows = self.connect().execute(
+            f"SELECT {FLIGHT_COLUMNS} FROM flights WHERE departure_iata = ? AND arrival_iata = ? "
+            "AND departure_timestamp BETWEEN ? AND ? ORDER BY departure_timestamp, id",
+            (departure_iata, arrival_iata,
+             departing_from if departing_from is not None else -2 ** 63,
+             departing_until if departing_until is not None else 2 ** 63 - 1)).fetchall()
+        return self._rows_to_entries(rows)
+
+    def record_add(self, key: FlightKey, entry: dict) -> None:
+        prices_history = list((entry.get("price") or {}).get("prices_history") or [])
+        self._pending.append(("add", key, entry, prices_history))
+
+    def record_price(self, key: FlightKey, price_value: dict, price_updated: int) -> None:
+        self._pending.append(("price", key, price_value, price_updated))
+
+    def record_delete(self, key: FlightKey) -> None:
+        self._pending.append(("delete", key))
+
+    def flush(self, flights: List[dict]) -> None:
+        """Writes the recorded changes in one transaction."""
+        if not self._pending:
+            return
+        connection = self.connect()
+        with connection:
+            for op, changes in groupby(self._pending, key=lambda change: change[0]):
+                changes = list(changes)
+                if op == "add":
+                    for _, key, entry, prices_history in changes:
+                        self._insert_flight(key, entry, prices_history)
+                elif op == "price":
+                    connection.executemany(
+                        "INSERT INTO price_points (flight_id, seq, timestamp, price) "
+                        "SELECT id, (SELECT COUNT(*) FROM price_points WHERE flight_id = flights.id), ?, ? "
+                        f"FROM flights WHERE {KEY_CONDITION}",
+                        [(price_value["timestamp"], price_value["price"], *key)
+                         for _, key, price_value, _ in changes])
+                    connection.executemany(
+                        f"UPDATE flights SET price_updated = ? WHERE {KEY_CONDITION}",
+                        [(price_updated, *key) for _, key, _, price_updated in changes])
+                elif op == "delete":
+                    connection.executemany(f"DELETE FROM flights WHERE {KEY_CONDITION}",
+                                           [key for _, key in changes])
+        logger.info(f"Wrote {len(self._pending)} changes to '{self.path}'.")
+        self._pending = []
+
+    def rewrite(self, flights: List[dict]) -> None:
+        """Replaces every stored flight with `flights` in one transaction."""
+        connection = self.connect()
+        self._pending = []
+        with connection:
+            connection.execute("DELETE FROM price_points")
+            connection.execute("DELETE FROM flights")
+            connection.execute("DELETE FROM airports")
+            self._airport_ids = {}
+            self._airports = {}
+            keys = set()
+            for entry in flights:
+                key = make_flight_key(entry)
+                if key in keys:
+                    logger.warning(f"Duplicate flight {key}, the first entry is stored.")
+                    continue
+                keys.add(key)
+                self._insert_flight(key, entry, (entry.get("price") or {}).get("prices_history") or [])
+
+    def signature(self) -> List[list]:
+        """Includes the WAL file, which holds the commits not yet checkpointed into the database."""
+        signature = super().signature()
+        wal_path = self.path.with_name(self.path.name + "-wal")
+        if wal_path.exists() and (stat := wal_path.stat()).st_size:
+            signature.append([wal_path.name, stat.st_size, stat.st_mtime_ns])
+        return signature
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
@@ -0,0 +1,76 @@
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+import pytest
+
+
+# Modules of script/ import each other flat, exp: `from constants import ...`
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "script"))
+
+import constants  # noqa: E402
+
+# Every module configures logging on import, the test logs go to a temporary
+# folder instead of the tracked script/logs files
+_LOGS_FOLDER = Path(tempfile.mkdtemp(prefix="fly_step_test_logs_"))
+constants.LOGS_FILE_PATH = str(_LOGS_FOLDER / "logs_all.log")
+constants.LOGS_WARNINGS_FILE_PATH = str(_LOGS_FOLDER / "logs_warning.log")
+
+
+def future_day(days: int) -> str:
+    """Returns: exp: '2030-03-25', `days` after today."""
+    return (datetime.today() + timedelta(days=days)).strftime("%Y-%m-%d")
+
+
+def airport(iata_code: str) -> dict:
+    """Returns an airport of a fare response, exp: airport("VNO")."""
+    return {"countryName": f"Country {iata_code}", "iataCode": iata_code, "name": f"Airport {iata_code}",
+            "seoName": iata_code.lower(),
+            "city": {"name": f"City {iata_code}", "code": iata_code, "countryCode": iata_code[:2].lower()}}
+
+
+def make_outbound(day: str, price: float = 191.29, arrival_iata: str = "BCN",
+                  departure_iata: str = "VNO", time: str = "17:05:00",
+                  flight_number: str = "FR1787", price_updated: int = 1742734424000) -> dict:
+    """Returns the `outbound` part of one fare of the fare API response."""
+    return {
+        "departureAirport": airport(departure_iata),
+        "arrivalAirport": airport(arrival_iata),
+        "departureDate": f"{day}T{time}",
+        "arrivalDate": f"{day}T23:40:00",
+        "price": {"value": price, "valueMainUnit": str(int(price)), "valueFractionalUnit": "00",
+                  "currencyCode": "EUR", "currencySymbol": "€"},
+        "flightKey": f"{flight_number}~{day}", "flightNumber": flight_number,
+        "previousPrice": None, "priceUpdated": price_updated,
+    }
+
+
+def make_entry(day: str, price: float = 191.29, arrival_iata: str = "BCN",
+               departure_iata: str = "VNO", time: str = "17:05:00",
+               flight_number: str = "FR1787", timestamp: int = 1742751829,
+               price_updated: int | str = 1742734424000) -> dict:
+    """Returns a flight entry in the JSON file format with one price."""
+    outbound = make_outbound(day, price, arrival_iata, departure_iata, time, flight_number)
+    return {
+        "departureAirport": {key: value for key, value in outbound["departureAirport"].items() if key != "seoName"},
+        "arrivalAirport": {key: value for key, value in outbound["arrivalAirport"].items() if key != "seoName"},
+        "departureDate": outbound["departureDate"],
+        "arrivalDate": outbound["arrivalDate"],
+        "price": {"prices_history": [{"timestamp": timestamp, "price": price}], "currencyCode": "EUR"},
+        "flightNumber": flight_number,
+        "priceUpdated": price_updated,
+    }
+
+
+@pytest.fixture
+def store_factory(tmp_path):
+    """Returns a function that opens a FlightStore on a JSON file in `tmp_path`, without a saved view."""
+    from cheapest_view import CheapestFlightsView
+    from flight_store import FlightStore
+    from storage import JsonFileEngine
+
+    def open_store(engine=None, view_size: int = constants.OUT_NUM_IN_TABLE, view_slack: int = 2):
+        engine = engine or JsonFileEngine(str(tmp_path / "flights.json"))
+        view = CheapestFlightsView(None, size=view_size, slack=view_slack)
+        return FlightStore(engine, flush_every=0, cheapest_view=view).load()
+    return open_store
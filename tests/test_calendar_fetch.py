@@ -0,0 +1,94 @@
+from datetime import datetime
+
+import ryanair_one_way_cheap
+from conftest import make_outbound
+from route_schedule import RouteSchedule
+from ryanair_one_way_cheap import (bisect_date_window, fetch_one_way_fares_by_calendar,
+                                   is_range_response_truncated, record_route_schedule,
+                                   split_date_range_by_month, split_range_fares_by_day)
+
+
+def test_split_date_range_by_month():
+    windows = split_date_range_by_month(datetime(2025, 3, 20), datetime(2025, 5, 5))
+
+    assert windows == [(datetime(2025, 3, 20), datetime(2025, 3, 31)),
+                       (datetime(2025, 4, 1), datetime(2025, 4, 30)),
+                       (datetime(2025, 5, 1), datetime(2025, 5, 5))]
+
+
+def test_bisect_date_window_covers_the_window():
+    assert bisect_date_window((datetime(2025, 4, 1), datetime(2025, 4, 30))) == [
+        (datetime(2025, 4, 1), datetime(2025, 4, 15)),
+        (datetime(2025, 4, 16), datetime(2025, 4, 30)),
+    ]
+
+
+def test_is_range_response_truncated():
+    fares = [{"outbound": make_outbound("2025-04-01")}]
+
+    assert not is_range_response_truncated({"fares": fares, "size": 1})
+    assert is_range_response_truncated({"fares": fares, "size": 5})
+    assert is_range_response_truncated({"fares": fares, "nextPage": 2})
+
+
+def test_split_range_fares_by_day_leaves_out_days_missing_from_the_response():
+    one_way_fares = {"fares": [
+        {"outbound": make_outbound("2025-04-01", price=50.0, flight_number="FR1")},
+        {"outbound": make_outbound("2025-04-01", price=20.0, flight_number="FR2")},
+        {"outbound": make_outbound("2025-04-03", price=30.0)},
+    ]}
+
+    day_responses = split_range_fares_by_day(one_way_fares, (datetime(2025, 4, 1), datetime(2025, 4, 3)))
+
+    assert [search_date for search_date, _ in day_responses] == [datetime(2025, 4, 1), datetime(2025, 4, 3)]
+    first_day_prices = [fare["outbound"]["price"]["value"] for fare in day_responses[0][1]["fares"]]
+    assert first_day_prices == [20.0, 50.0]
+
+
+def test_split_range_fares_by_day_keeps_days_marked_unavailable_as_empty():
+    null_price = make_outbound("2025-04-02")
+    null_price["price"] = None
+    one_way_fares = {"fares": [
+        {"outbound": make_outbound("2025-04-01")},
+        {"outbound": null_price},
+        {"outbound": make_outbound("2025-04-03"), "unavailable": True},
+    ]}
+
+    day_responses = dict(split_range_fares_by_day(one_way_fares, (datetime(2025, 4, 1), datetime(2025, 4, 4))))
+
+    assert sorted(day_responses) == [datetime(2025, 4, 1), datetime(2025, 4, 2), datetime(2025, 4, 3)]
+    assert day_responses[datetime(2025, 4, 2)] == {"fares": []}
+    assert day_responses[datetime(2025, 4, 3)] == {"fares": []}
+
+
+def test_fetch_by_calendar_bisects_truncated_windows(monkeypatch):
+    calls = []
+
+    def fake_get(url, departure_iata, arrival_iata, window_start, window_end):
+        calls.append((window_start, window_end))
+        if window_start == datetime(2025, 4, 1) and window_end == datetime(2025, 4, 4):
+            return {"fares": [], "nextPage": 2}
+        if window_start == datetime(2025, 4, 3):
+            return None
+        return {"fares": [{"outbound": make_outbound(f"{window_start:%Y-%m-%d}")}]}
+    monkeypatch.setattr(ryanair_one_way_cheap, "get_one_way_cheap_flight", fake_get)
+
+    fetched_fares = fetch_one_way_fares_by_calendar("VNO", "BCN", datetime(2025, 4, 1), datetime(2025, 4, 4))
+
+    assert calls[0] == (datetime(2025, 4, 1), datetime(2025, 4, 4))
+    assert [search_date.day for search_date, _ in fetched_fares] == [1, 3, 4]
+    assert fetched_fares[1][1] is None
+
+
+def test_record_route_schedule_skips_days_left_out(tmp_path):
+    schedule = RouteSchedule("VNO", "BCN", folder_path=str(tmp_path))
+    one_way_fares = {"fares": [
+        {"outbound": make_outbound("2030-04-01")},
+        {"outbound": make_outbound("2030-04-02"), "unavailable": True},
+    ]}
+
+    record_route_schedule(schedule, split_range_fares_by_day(one_way_fares,
+                                                             (datetime(2030, 4, 1), datetime(2030, 4, 3))))
+
+    assert list(schedule.empty_dates) == ["2030-04-02"]
+    assert schedule.should_query(datetime(2030, 4, 3))
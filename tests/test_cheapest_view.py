@@ -0,0 +1,139 @@
+import json
+import random
+import pytest
+from conftest import future_day, make_entry
+from cheapest_view import CheapestFlightsView
+from flight_data_process import FlightData
+from flight_store import FlightStore
+from storage import JsonFileEngine
+
+
+ROUTES = [("VNO", "BCN"), ("VNO", "AGP"), ("KUN", "BCN"), ("KUN", "PMI")]
+
+
+def full_sort_keys(flights, num_results, departure_iata=None, arrival_iata=None):
+    """The cheapest flights table the view stands for: every upcoming flight sorted."""
+    upcoming = []
+    for entry in flights:
+        key = FlightStore.make_key(entry)
+        flight = FlightData.from_store(entry)
+        if departure_iata not in (None, key[0]) or arrival_iata not in (None, key[1]):
+            continue
+        if flight.departure_date.date() < FlightData.from_store(make_entry(future_day(0))).departure_date.date():
+            continue
+        upcoming.append(((flight.latest_price, key[2], key), key))
+    return [key for _, key in sorted(upcoming)[:num_results]]
+
+
+def view_keys(store, num_results, departure_iata=None, arrival_iata=None):
+    return [FlightStore.make_key(entry)
+            for entry in store.cheapest_flights(num_results, departure_iata, arrival_iata)]
+
+
+def random_entry(rng, day_offsets=range(-3, 30)):
+    departure_iata, arrival_iata = rng.choice(ROUTES)
+    return make_entry(future_day(rng.choice(day_offsets)), price=rng.choice([9.99, 15, 20.5, 35, 49.99, 120]),
+                      departure_iata=departure_iata, arrival_iata=arrival_iata,
+                      time=rng.choice(["06:00:00", "17:05:00"]), timestamp=rng.randrange(1, 10 ** 9))
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_view_matches_a_full_sort_after_random_changes(store_factory, seed):
+    rng = random.Random(seed)
+    store = store_factory(view_size=4, view_slack=1)
+    for step in range(300):
+        if store.flights and rng.random() < 0.15:
+            store.delete(FlightStore.make_key(rng.choice(store.flights)))
+        else:
+            # Mostly new prices of stored flights: they rise and fall
+            store.merge(random_entry(rng))
+        if step % 25 == 0:
+            for num_results in (1, 4):
+                assert view_keys(store, num_results) == full_sort_keys(store.flights, num_results)
+
+    for num_results in (1, 2, 4):
+        assert view_keys(store, num_results) == full_sort_keys(store.flights, num_results)
+    for departure_iata, arrival_iata in ROUTES + [("VNO", None), (None, "BCN")]:
+        assert view_keys(store, 4, departure_iata, arrival_iata) == \
+            full_sort_keys(store.flights, 4, departure_iata, arrival_iata)
+
+
+def test_price_rise_brings_back_a_flight_left_out(store_factory):
+    store = store_factory(view_size=2, view_slack=0)
+    for day, price in ((1, 10), (2, 20), (3, 30), (4, 40)):
+        store.merge(make_entry(future_day(day), price=price, timestamp=day))
+    assert view_keys(store, 2) == full_sort_keys(store.flights, 2)
+
+    store.merge(make_entry(future_day(1), price=100, timestamp=10))
+    store.merge(make_entry(future_day(2), price=90, timestamp=11))
+    assert view_keys(store, 2) == full_sort_keys(store.flights, 2)
+    assert [entry["price"]["prices_history"][-1]["price"] for entry in store.cheapest_flights(2)] == [30, 40]
+
+
+def test_departed_flights_are_not_listed(store_factory):
+    store = store_factory()
+    store.merge(make_entry(future_day(-1), price=1))
+    store.merge(make_entry(future_day(1), price=50))
+    assert [entry["price"]["prices_history"][-1]["price"] for entry in store.cheapest_flights(5)] == [50]
+
+
+def test_more_results_than_the_view_keeps_are_rejected(store_factory):
+    store = store_factory(view_size=3)
+    with pytest.raises(ValueError):
+        store.cheapest_flights(4)
+
+
+def open_saved_view_store(tmp_path) -> FlightStore:
+    view = CheapestFlightsView(str(tmp_path / "cheapest_flights.json"), size=3, slack=1)
+    return FlightStore(JsonFileEngine(str(tmp_path / "flights.json")), flush_every=0, cheapest_view=view).load()
+
+
+def test_saved_view_is_loaded_when_the_store_did_not_change(tmp_path, monkeypatch):
+    store = open_saved_view_store(tmp_path)
+    rng = random.Random(1)
+    for _ in range(40):
+        store.merge(random_entry(rng, range(1, 20)))
+    store.flush()
+    expected = view_keys(store, 3)
+    store.close()
+
+    rebuilds = []
+    monkeypatch.setattr(CheapestFlightsView, "rebuild", lambda self, *args: rebuilds.append(args))
+    reopened = open_saved_view_store(tmp_path)
+    assert rebuilds == []
+    assert view_keys(reopened, 3) == expected
+
+
+def test_saved_view_is_rebuilt_for_other_stored_data(tmp_path):
+    store = open_saved_view_store(tmp_path)
+    for day, price in ((1, 10), (2, 20), (3, 30)):
+        store.merge(make_entry(future_day(day), price=price))
+    store.flush()
+    store.close()
+
+    # Another process rewrites the flights file after the view was saved
+    changed_flights = [make_entry(future_day(day), price=price) for day, price in ((1, 99), (2, 5), (4, 1))]
+    JsonFileEngine(str(tmp_path / "flights.json")).rewrite(changed_flights)
+
+    reopened = open_saved_view_store(tmp_path)
+    assert view_keys(reopened, 3) == full_sort_keys(changed_flights, 3)
+
+
+def test_a_dirty_store_does_not_save_the_view(tmp_path):
+    store = open_saved_view_store(tmp_path)
+    store.merge(make_entry(future_day(1)))
+    store.close()
+    assert not (tmp_path / "cheapest_flights.json").exists()
+
+
+def test_damaged_saved_view_is_rebuilt(tmp_path):
+    store = open_saved_view_store(tmp_path)
+    store.merge(make_entry(future_day(1), price=10))
+    store.flush()
+    store.close()
+    view_path = tmp_path / "cheapest_flights.json"
+    saved = json.loads(view_path.read_text(encoding="utf-8"))
+    view_path.write_text(json.dumps(saved)[:-20], encoding="utf-8")
+
+    reopened = open_saved_view_store(tmp_path)
+    assert view_keys(reopened, 3) == full_sort_keys(reopened.flights, 3)
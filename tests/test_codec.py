@@ -0,0 +1,69 @@
+import gzip
+import json
+import itertools
+import msgspec
+import pytest
+from conftest import future_day, make_entry
+from storage import (SERIALIZERS, COMPRESSIONS, JsonFileEngine, encode_flights, decode_flights,
+                     read_flights_file, write_flights_file)
+from storage.codec import GZIP_MAGIC, ZSTD_MAGIC
+
+
+CODECS = list(itertools.product(SERIALIZERS, COMPRESSIONS))
+MAGIC = {"none": b"", "gzip": GZIP_MAGIC, "zstd": ZSTD_MAGIC}
+
+
+def sample_entries():
+    return [make_entry(future_day(day), price=price)
+            for day, price in ((3, 191.29), (4, 20), (5, 1e-05), (6, 2.5))]
+
+
+@pytest.mark.parametrize("serializer, compression", CODECS)
+def test_encode_decode_round_trip(serializer, compression):
+    data = encode_flights(sample_entries(), serializer, compression)
+    assert data.startswith(MAGIC[compression])
+    assert decode_flights(data) == sample_entries()
+
+
+@pytest.mark.parametrize("serializer, compression", CODECS)
+def test_file_round_trip(serializer, compression, tmp_path):
+    path = str(tmp_path / "flights.json")
+    write_flights_file(sample_entries(), path, serializer, compression)
+
+    assert read_flights_file(path) == sample_entries()
+
+
+def test_json_pretty_is_the_json_dump_layout(tmp_path):
+    path = tmp_path / "flights.json"
+    write_flights_file(sample_entries(), str(path), "json-pretty", "none")
+    assert path.read_text(encoding="utf-8") == json.dumps(sample_entries(), indent=4)
+
+
+def test_damaged_file_reads_empty(tmp_path):
+    path = tmp_path / "flights.json"
+    path.write_bytes(encode_flights(sample_entries(), "json", "zstd")[:-10])
+    assert read_flights_file(str(path)) == []
+    path.write_text('[{"departureDate": ', encoding="utf-8")
+    assert read_flights_file(str(path)) == []
+    with pytest.raises(msgspec.DecodeError):
+        decode_flights(b'[{"departureDate": ')
+
+
+def test_missing_file_reads_empty(tmp_path):
+    assert read_flights_file(str(tmp_path / "missing.json")) == []
+
+
+def test_json_engine_migrates_the_file_to_its_codec(tmp_path):
+    path = tmp_path / "flights.json"
+    write_flights_file(sample_entries(), str(path), "json-pretty", "none")
+    engine = JsonFileEngine(str(path), "msgpack", "gzip")
+    engine.flush(engine.load())
+    assert msgspec.msgpack.decode(gzip.decompress(path.read_bytes())) == sample_entries()
+    assert engine.load() == sample_entries()
+
+
+def test_unknown_codec_is_rejected():
+    with pytest.raises(ValueError):
+        encode_flights(sample_entries(), "yaml", "none")
+    with pytest.raises(ValueError):
+        encode_flights(sample_entries(), "json", "lzma")
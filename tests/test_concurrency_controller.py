@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+
+import concurrency_controller
+from concurrency_controller import AdaptiveConcurrencyLimiter
+
+
+def make_limiter(initial_limit: int = 4) -> AdaptiveConcurrencyLimiter:
+    return AdaptiveConcurrencyLimiter(initial_limit=initial_limit, min_limit=1, max_limit=8,
+                                      latency_target=1.0, decrease_factor=0.5)
+
+
+def test_good_responses_raise_the_limit_additively():
+    limiter = make_limiter(initial_limit=4)
+
+    for _ in range(4):
+        limiter.record(200, 0.1)
+    assert limiter.limit == 4
+    limiter.record(200, 0.1)
+
+    assert limiter.limit == 5
+    assert limiter.history[-1][1:] == (5, "increase")
+
+
+def test_throttling_errors_and_slow_responses_cut_the_limit(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(concurrency_controller.time, "monotonic", lambda: clock[0])
+    limiter = make_limiter(initial_limit=8)
+
+    limiter.record(429, 0.1)
+    assert limiter.limit == 4
+    clock[0] += 10
+    limiter.record(None, 0.1)
+    assert limiter.limit == 2
+    clock[0] += 10
+    limiter.record(200, 5.0)
+    assert limiter.limit == 1
+    assert limiter.metrics()["counters"] == {"ok": 0, "slow": 1, "throttled": 1, "errors": 1}
+
+
+def test_one_burst_of_errors_is_cut_once(monkeypatch):
+    monkeypatch.setattr(concurrency_controller.time, "monotonic", lambda: 1000.0)
+    limiter = make_limiter(initial_limit=8)
+
+    for _ in range(5):
+        limiter.record(503, 0.5)
+
+    assert limiter.limit == 4
+
+
+def test_limit_stays_within_bounds(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(concurrency_controller.time, "monotonic", lambda: clock[0])
+    limiter = make_limiter(initial_limit=2)
+
+    for _ in range(200):
+        limiter.record(200, 0.1)
+    assert limiter.limit == 8
+    for _ in range(10):
+        clock[0] += 10
+        limiter.record(429, 0.1)
+    assert limiter.limit == 1
+
+
+def test_acquire_waits_for_a_free_slot():
+    limiter = make_limiter(initial_limit=2)
+    running = []
+    max_running = []
+
+    async def request():
+        await limiter.acquire()
+        running.append(1)
+        max_running.append(len(running))
+        await asyncio.sleep(0.01)
+        running.pop()
+        await limiter.release()
+
+    async def run_requests():
+        await asyncio.gather(*(request() for _ in range(6)))
+    asyncio.run(run_requests())
+
+    assert max(max_running) == 2
+
+
+def test_invalid_limits_are_rejected():
+    with pytest.raises(ValueError):
+        AdaptiveConcurrencyLimiter(min_limit=5, max_limit=2)
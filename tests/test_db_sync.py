@@ -0,0 +1,64 @@
+import db.json_data_to_db as json_data_to_db
+from conftest import future_day, make_entry
+from db.json_data_to_db import SyncedFlightsDb, insert_data_to_db_main
+from flight_data_process import FlightData
+
+
+class FakeCursor:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def execute(self, query, values=()):
+        pass
+
+    def fetchall(self):
+        return self.rows
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    """Answers every query with the same rows of (flight number, dates, iata codes, price)."""
+    def __init__(self, rows):
+        self.rows = rows
+
+    def cursor(self):
+        return FakeCursor(self.rows)
+
+
+def db_row(entry: dict, price: float) -> tuple:
+    return (*SyncedFlightsDb.make_key(FlightData(entry)), price)
+
+
+def test_latest_prices_of_duplicated_flights_are_unknown():
+    entry = make_entry(future_day(10))
+    rows = [db_row(entry, 20.0), db_row(entry, 25.0),
+            db_row(make_entry(future_day(11)), 30.0)]
+
+    latest_prices = SyncedFlightsDb(FakeConnection(rows)).get_db_latest_prices("2030-01-01 00:00:00")
+
+    assert latest_prices[SyncedFlightsDb.make_key(FlightData(entry))] is None
+    assert latest_prices[SyncedFlightsDb.make_key(FlightData(make_entry(future_day(11))))] == 30.0
+
+
+def test_only_flights_out_of_sync_are_compared(monkeypatch):
+    in_sync = make_entry(future_day(10), price=20.0)
+    repriced = make_entry(future_day(11), price=15.0)
+    new = make_entry(future_day(12))
+    departed = make_entry(future_day(-5))
+    connection = FakeConnection([db_row(in_sync, 20.0), db_row(repriced, 30.0)])
+    compared = []
+    monkeypatch.setattr(json_data_to_db, "db_connection", lambda params: connection)
+    monkeypatch.setattr(json_data_to_db.RunDataFlightComparison, "compare_and_insert",
+                        lambda self, flight_data: compared.append(flight_data.get_departure_date()))
+
+    insert_data_to_db_main([in_sync, repriced, new, departed])
+
+    assert compared == [FlightData(repriced).get_departure_date(), FlightData(new).get_departure_date()]
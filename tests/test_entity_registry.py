@@ -0,0 +1,99 @@
+import json
+
+import pytest
+
+import entity_registry
+from conftest import future_day, make_entry
+from db.json_data_to_db import ArrivalDataInserter, DepartureDataInserter
+from entity_registry import EntityRegistry
+from flight_data_process import FlightData
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def execute(self, query, values=()):
+        self.connection.queries.append(" ".join(query.split()))
+
+    def fetchone(self):
+        return (7,)
+
+    def fetchall(self):
+        return []
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    """Records the executed queries, every SELECT and INSERT ... RETURNING finds id 7."""
+    def __init__(self):
+        self.queries = []
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    registry = EntityRegistry()
+    monkeypatch.setattr(entity_registry, "_entity_registry", registry)
+    return registry
+
+
+def test_flights_of_a_route_share_airport_dicts(registry):
+    first = registry.intern_flight(make_entry(future_day(10)))
+    second = registry.intern_flight(make_entry(future_day(11)))
+
+    assert first["departureAirport"] is second["departureAirport"]
+    assert first["arrivalAirport"]["city"] is second["arrivalAirport"]["city"]
+    assert json.dumps(second) == json.dumps(make_entry(future_day(11)))
+
+
+def test_changed_airport_becomes_the_shared_version(registry):
+    registry.intern_flight(make_entry(future_day(10)))
+    renamed = make_entry(future_day(11))
+    renamed["departureAirport"]["name"] = "Vilnius International"
+
+    interned = registry.intern_flight(renamed)
+    later = registry.intern_flight(make_entry(future_day(12)))
+
+    assert interned["departureAirport"]["name"] == "Vilnius International"
+    assert later["departureAirport"]["name"] == "Airport VNO"
+
+
+def test_db_ids_are_cached_until_cleared(registry):
+    registry.set_db_id("city", ("Vilnius", "VILNIUS", "lt"), 3)
+    registry.set_db_id("city", ("Kaunas", "KAUNAS", "lt"), None)
+
+    assert registry.get_db_id("city", ("Vilnius", "VILNIUS", "lt")) == 3
+    assert registry.get_db_id("city", ("Kaunas", "KAUNAS", "lt")) is None
+    registry.clear_db_ids()
+    assert registry.get_db_id("city", ("Vilnius", "VILNIUS", "lt")) is None
+
+
+def test_airports_are_looked_up_once_per_sync(registry):
+    connection = FakeConnection()
+    departure_inserter = DepartureDataInserter(connection)
+    arrival_inserter = ArrivalDataInserter(connection)
+
+    for day in range(50):
+        flight_data = FlightData(make_entry(future_day(day + 1)))
+        assert departure_inserter.insert_to_departure_airport(flight_data) == 7
+        assert arrival_inserter.insert_to_arrival_airport(flight_data) == 7
+
+    assert len(connection.queries) == 4
+    assert all(query.startswith("SELECT") for query in connection.queries)
@@ -0,0 +1,49 @@
+from datetime import datetime
+
+import ryanair_one_way_cheap
+from conftest import make_outbound
+from constants import ANY_ARRIVAL
+from ryanair_one_way_cheap import fetch_origin_fares, group_routes_by_departure, split_fares_by_arrival
+
+
+def test_group_routes_by_departure():
+    routes = [{"departure": "KUN", "arrival": "ALC"}, {"departure": "VNO", "arrival": "BCN"},
+              {"departure": "KUN", "arrival": "MAD"}]
+
+    assert group_routes_by_departure(routes) == {"KUN": ["ALC", "MAD"], "VNO": ["BCN"]}
+
+
+def test_split_fares_by_arrival_puts_the_cheapest_first():
+    one_way_fares = {"fares": [
+        {"outbound": make_outbound("2030-04-01", price=80.0, arrival_iata="BCN")},
+        {"outbound": make_outbound("2030-04-01", price=15.0, arrival_iata="ALC")},
+        {"outbound": make_outbound("2030-04-01", price=40.0, arrival_iata="BCN", flight_number="FR2")},
+    ]}
+
+    fares_by_arrival = split_fares_by_arrival(one_way_fares)
+
+    assert sorted(fares_by_arrival) == ["ALC", "BCN"]
+    assert [fare["outbound"]["price"]["value"] for fare in fares_by_arrival["BCN"]["fares"]] == [40.0, 80.0]
+
+
+def test_fetch_origin_fares_fans_one_request_out_to_routes(monkeypatch):
+    monkeypatch.setattr(ryanair_one_way_cheap, "ROUTE_SCHEDULE_ENABLED", False)
+    monkeypatch.setattr(ryanair_one_way_cheap, "SCRAPE_CHECKPOINTS_ENABLED", False)
+    requested = []
+
+    def fake_fetch(departure_iata, arrival_iata, search_dates):
+        requested.append((departure_iata, arrival_iata, search_dates))
+        return [(datetime(2030, 4, 1), {"fares": [{"outbound": make_outbound("2030-04-01", arrival_iata="BCN")},
+                                                  {"outbound": make_outbound("2030-04-01", arrival_iata="ALC")}]}),
+                (datetime(2030, 4, 2), None)]
+    monkeypatch.setattr(ryanair_one_way_cheap, "fetch_one_way_fares_by_dates", fake_fetch)
+
+    fares_by_route = fetch_origin_fares(datetime(2030, 4, 1), datetime(2030, 4, 2), "VNO", ["BCN", "MAD"])
+
+    assert requested == [("VNO", None, [datetime(2030, 4, 1), datetime(2030, 4, 2)])]
+    assert sorted(fares_by_route) == ["BCN", "MAD"]
+    assert len(fares_by_route["BCN"][0][1]["fares"]) == 1
+    assert fares_by_route["MAD"] == [(datetime(2030, 4, 1), {"fares": []}), (datetime(2030, 4, 2), None)]
+
+    all_arrivals = fetch_origin_fares(datetime(2030, 4, 1), datetime(2030, 4, 2), "VNO", [ANY_ARRIVAL])
+    assert sorted(all_arrivals) == ["ALC", "BCN"]
@@ -0,0 +1,40 @@
+import json
+
+import msgspec
+import pytest
+
+from conftest import make_entry, make_outbound
+from fare_decoder import (build_flight_record, convert_outbound, decode_response,
+                          encode_flight_record, flight_record_to_entry)
+from models import FlightModel
+
+DAY = "2030-04-01"
+
+
+def test_decode_response_matches_json_loads():
+    content = json.dumps({"fares": [{"outbound": make_outbound(DAY)}], "size": 1}).encode("utf-8")
+
+    assert decode_response(content) == json.loads(content)
+
+
+def test_convert_outbound_is_lax_like_pydantic():
+    outbound = make_outbound(DAY)
+    outbound["price"]["value"] = "191.29"
+
+    assert convert_outbound(outbound).price.value == 191.29
+
+
+def test_convert_outbound_rejects_a_missing_field():
+    outbound = make_outbound(DAY)
+    del outbound["flightNumber"]
+
+    with pytest.raises(msgspec.ValidationError):
+        convert_outbound(outbound)
+
+
+def test_flight_record_is_the_stored_entry():
+    record = build_flight_record(convert_outbound(make_outbound(DAY)), timestamp=1742751829)
+    entry = flight_record_to_entry(record)
+
+    assert entry == make_entry(DAY, timestamp=1742751829)
+    assert json.loads(encode_flight_record(record)) == FlightModel(**entry).model_dump()
@@ -0,0 +1,67 @@
+import threading
+import time
+import pytest
+from fetch_engine import AsyncFetchEngine
+
+
+URL = "https://www.ryanair.com/api/farfnd/v4/oneWayFares"
+
+
+class CallRecorder:
+    """Blocking fetch function that records how many calls run at once."""
+    def __init__(self, delay: float = 0.02):
+        self.delay = delay
+        self.running = 0
+        self.max_running = 0
+        self.thread_names = set()
+        self._lock = threading.Lock()
+
+    def __call__(self, value: int) -> int:
+        with self._lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+            self.thread_names.add(threading.current_thread().name)
+        time.sleep(self.delay)
+        with self._lock:
+            self.running -= 1
+        return value * 2
+
+
+def test_results_keep_the_order_of_the_calls():
+    recorder = CallRecorder()
+    with AsyncFetchEngine(max_per_host=4, adaptive=False) as engine:
+        results = engine.run(URL, recorder, [(value,) for value in range(10)])
+    assert results == [value * 2 for value in range(10)]
+
+
+def test_calls_run_concurrently_up_to_the_host_limit():
+    recorder = CallRecorder()
+    with AsyncFetchEngine(max_per_host=3, adaptive=False) as engine:
+        started = time.monotonic()
+        engine.run(URL, recorder, [(value,) for value in range(9)])
+        elapsed = time.monotonic() - started
+    assert recorder.max_running == 3
+    assert elapsed < 9 * recorder.delay
+
+
+def test_one_thread_pool_serves_every_run():
+    recorder = CallRecorder(delay=0.0)
+    with AsyncFetchEngine(max_per_host=2, adaptive=False) as engine:
+        for _ in range(3):
+            engine.run(URL, recorder, [(value,) for value in range(4)])
+    assert len(recorder.thread_names) <= 2
+    assert all(name.startswith("fetch") for name in recorder.thread_names)
+
+
+def test_an_error_of_one_call_is_raised():
+    def fail(value: int) -> int:
+        raise RuntimeError(f"call {value} failed")
+
+    with AsyncFetchEngine(max_per_host=2, adaptive=False) as engine:
+        with pytest.raises(RuntimeError):
+            engine.run(URL, fail, [(1,)])
+
+
+def test_max_per_host_must_be_positive():
+    with pytest.raises(ValueError):
+        AsyncFetchEngine(max_per_host=0, adaptive=False)
@@ -0,0 +1,153 @@
+from datetime import datetime
+import pytest
+from conftest import future_day, make_entry, make_outbound
+import fingerprint_index
+import flight_store
+import ryanair_one_way_cheap
+from fingerprint_index import FareFingerprintIndex
+from flight_data_process import FlightData
+from ryanair_one_way_cheap import is_fare_stored, ryanair_main, save_one_way_fares
+
+
+DAY = future_day(10)
+SEARCH_DATE = datetime.strptime(DAY, "%Y-%m-%d")
+
+
+def response(price: float = 191.29, price_updated: int = 1742734424000) -> dict:
+    outbound = make_outbound(DAY, price)
+    outbound["priceUpdated"] = price_updated
+    return {"fares": [{"outbound": outbound}], "size": 1}
+
+
+@pytest.fixture
+def fingerprints(tmp_path, monkeypatch):
+    index = FareFingerprintIndex(str(tmp_path / "fare_fingerprints.json"))
+    monkeypatch.setattr(fingerprint_index, "_fingerprint_index", index)
+    monkeypatch.setattr(ryanair_one_way_cheap, "FARE_FINGERPRINTS_ENABLED", True)
+    monkeypatch.setattr(ryanair_one_way_cheap, "RAW_ARCHIVE_ENABLED", False)
+    return index
+
+
+@pytest.fixture
+def use_store(store_factory, monkeypatch):
+    """Returns a function that makes a new store the flight store of the run."""
+    def use(entries=()):
+        store = store_factory()
+        for entry in entries:
+            store.merge(entry)
+        monkeypatch.setattr(flight_store, "_flight_store", store)
+        return store
+    return use
+
+
+def prices(store) -> list:
+    return FlightData(store.find(make_outbound(DAY))).get_prices_list()
+
+
+def test_is_fare_stored(use_store):
+    use_store([make_entry(DAY, price=191.29)])
+    assert is_fare_stored(make_outbound(DAY, 191.29))
+    assert not is_fare_stored(make_outbound(DAY, 150))
+    assert not is_fare_stored(make_outbound(future_day(11), 191.29))
+
+
+def test_first_fare_is_merged_and_fingerprinted(fingerprints, use_store):
+    store = use_store()
+    save_one_way_fares(SEARCH_DATE, response())
+
+    assert prices(store) == [191.29]
+    assert fingerprints.is_unchanged(response()["fares"][0]["outbound"])
+    assert fingerprints.counters.counts["changed"] == 1
+
+
+def test_same_fare_is_skipped(fingerprints, use_store):
+    store = use_store()
+    save_one_way_fares(SEARCH_DATE, response())
+    changes = store.changes
+    save_one_way_fares(SEARCH_DATE, response(price_updated=1742734999000))
+
+    assert store.changes == changes
+    assert fingerprints.counters.counts["unchanged"] == 1
+
+
+def test_same_fare_is_merged_when_the_store_lost_the_flight(fingerprints, use_store):
+    use_store()
+    save_one_way_fares(SEARCH_DATE, response())
+
+    # exp: the data file was removed or STORAGE_ENGINE switched to an empty store
+    store = use_store()
+    save_one_way_fares(SEARCH_DATE, response())
+
+    assert prices(store) == [191.29]
+    assert fingerprints.counters.counts["unchanged"] == 0
+    assert fingerprints.counters.counts["changed"] == 2
+
+
+def test_same_fare_is_merged_when_the_store_lacks_the_price(fingerprints, use_store):
+    use_store()
+    save_one_way_fares(SEARCH_DATE, response())
+
+    # The stored flight was restored from a backup taken before the price
+    store = use_store([make_entry(DAY, price=150)])
+    save_one_way_fares(SEARCH_DATE, response())
+
+    assert prices(store) == [150, 191.29]
+
+
+def test_new_price_is_merged(fingerprints, use_store):
+    store = use_store()
+    save_one_way_fares(SEARCH_DATE, response(191.29))
+    save_one_way_fares(SEARCH_DATE, response(150))
+
+    assert prices(store) == [191.29, 150]
+    assert fingerprints.counters.counts["changed"] == 2
+
+
+def test_empty_and_failed_responses_are_counted(fingerprints, use_store):
+    store = use_store()
+    save_one_way_fares(SEARCH_DATE, None)
+    save_one_way_fares(SEARCH_DATE, {"fares": []})
+
+    assert len(store) == 0
+    assert fingerprints.counters.counts == {"fetched": 2, "failed": 1, "empty": 1, "unchanged": 0, "changed": 0}
+
+
+def test_fingerprint_ignores_price_updated():
+    outbound = make_outbound(DAY)
+    updated = dict(outbound, priceUpdated=outbound["priceUpdated"] + 1)
+    repriced = dict(outbound, price=dict(outbound["price"], value=150))
+
+    assert FareFingerprintIndex.fingerprint(updated) == FareFingerprintIndex.fingerprint(outbound)
+    assert FareFingerprintIndex.fingerprint(repriced) != FareFingerprintIndex.fingerprint(outbound)
+
+
+def test_save_drops_departed_days(tmp_path):
+    index = FareFingerprintIndex(str(tmp_path / "fare_fingerprints.json"))
+    index.update(make_outbound(future_day(-1)))
+    index.update(make_outbound(future_day(0)))
+    index.update(make_outbound(future_day(1)))
+    index.save()
+
+    loaded = FareFingerprintIndex(str(tmp_path / "fare_fingerprints.json")).load()
+    assert sorted(loaded.fingerprints) == [f"VNO-BCN-{future_day(0)}", f"VNO-BCN-{future_day(1)}"]
+    assert loaded.is_unchanged(make_outbound(future_day(1)))
+
+
+def test_counters_start_over_on_every_run(fingerprints, use_store, monkeypatch):
+    # scripts_scheduler runs ryanair_main again and again in one process
+    monkeypatch.setattr(ryanair_one_way_cheap, "FLYGHT_ROUTES", [{"departure": "VNO", "arrival": "BCN"}])
+    monkeypatch.setattr(ryanair_one_way_cheap, "FAN_OUT_BY_DEPARTURE", False)
+    monkeypatch.setattr(ryanair_one_way_cheap, "SCRAPE_PROCESSES", 1)
+    monkeypatch.setattr(ryanair_one_way_cheap, "SCRAPE_CHECKPOINTS_ENABLED", False)
+    monkeypatch.setattr(ryanair_one_way_cheap, "open_flight_store", lambda: use_store())
+    monkeypatch.setattr(ryanair_one_way_cheap, "get_flights_by_date_range",
+                        lambda *route: save_one_way_fares(SEARCH_DATE, response()))
+    for name in ("check_or_directory_exists", "display_chipest_flights_in_table", "log_concurrency_metrics",
+                 "create_all_tables_main", "insert_data_to_db_main"):
+        monkeypatch.setattr(ryanair_one_way_cheap, name, lambda *args: None)
+
+    ryanair_main()
+    assert fingerprints.counters.counts["changed"] == 1
+
+    ryanair_main()
+    assert fingerprints.counters.counts == {"fetched": 1, "failed": 0, "empty": 0, "unchanged": 1, "changed": 0}
@@ -0,0 +1,48 @@
+from datetime import datetime
+
+import pytest
+
+from conftest import make_entry
+from flight_data_process import FlightData
+
+DAY = "2030-04-01"
+
+
+def test_dates_are_parsed_once():
+    flight = FlightData(make_entry(DAY, time="06:30:00"))
+
+    assert flight.departure_date == datetime(2030, 4, 1, 6, 30)
+    assert flight.departure_date is flight.departure_date
+    assert flight.get_departure_date() == "2030-04-01 06:30:00"
+    assert flight.departure_timestamp == int(datetime(2030, 4, 1, 6, 30).timestamp())
+    assert flight.get_arrival_date(as_string=False) == datetime(2030, 4, 1, 23, 40)
+
+
+def test_invalid_date_is_kept_as_is():
+    entry = make_entry(DAY)
+    entry["departureDate"] = "soon"
+    flight = FlightData(entry)
+
+    assert flight.departure_date is None
+    assert flight.departure_timestamp is None
+    assert flight.get_departure_date() == "soon"
+
+
+def test_append_price_keeps_the_latest_price_in_step():
+    flight = FlightData.from_store(make_entry(DAY, price=191.29))
+    assert flight.latest_price == 191.29
+
+    assert flight.append_price(150, timestamp=1742760000) == {"timestamp": 1742760000, "price": 150}
+
+    assert flight.latest_price == 150.0
+    assert flight.get_prices_list() == [191.29, 150.0]
+    assert flight.json_data["price"]["prices_history"][-1] == {"timestamp": 1742760000, "price": 150}
+
+
+def test_direction():
+    assert FlightData(make_entry(DAY)).direction == "City VNO (VNO) -> City BCN (BCN)"
+
+
+def test_flight_data_has_no_instance_dict():
+    with pytest.raises(AttributeError):
+        FlightData(make_entry(DAY)).extra = 1
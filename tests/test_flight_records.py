@@ -0,0 +1,37 @@
+from conftest import make_entry, make_outbound
+from json_data_process import add_price_and_timestamp_to_existing_entry_values, prepare_flight_formated_output
+from ryanair_one_way_cheap import extract_one_way_flight_details, update_one_way_flight_json_schema
+
+DAY = "2030-04-01"
+
+
+def test_scraped_fare_is_passed_on_as_a_dict():
+    flight_record = extract_one_way_flight_details({"fares": [{"outbound": make_outbound(DAY)}]},
+                                                   timestamp=1742751829)
+
+    entry = update_one_way_flight_json_schema(flight_record)
+
+    assert isinstance(entry, dict)
+    assert entry == make_entry(DAY, timestamp=1742751829)
+
+
+def test_empty_response_gives_no_record():
+    assert extract_one_way_flight_details({"fares": []}) is None
+
+
+def test_new_price_is_added_to_the_entry_in_place():
+    entry = make_entry(DAY, price=191.29, timestamp=1742751829)
+
+    add_price_and_timestamp_to_existing_entry_values(entry, 150, timestamp=1742760000)
+    add_price_and_timestamp_to_existing_entry_values(entry, "free")
+
+    assert entry["price"]["prices_history"] == [{"timestamp": 1742751829, "price": 191.29},
+                                                {"timestamp": 1742760000, "price": 150}]
+
+
+def test_formated_output_of_entries():
+    output = prepare_flight_formated_output([make_entry(DAY, price=20.5)])
+
+    assert len(output) == 1
+    assert output[0]["price"] == 20.5
+    assert output[0]["direction"] == "City VNO (VNO) -> City BCN (BCN)"
@@ -0,0 +1,158 @@
+import json
+import random
+import pytest
+import flight_store
+from conftest import future_day, make_entry
+from cheapest_view import CheapestFlightsView
+from flight_store import FlightStore
+from storage import JsonFileEngine
+
+
+def test_make_key_normalizes_the_departure_date():
+    day = future_day(10)
+    assert FlightStore.make_key(make_entry(day)) == ("VNO", "BCN", f"{day} 17:05:00")
+
+
+def test_add_indexes_the_entry(store_factory):
+    store = store_factory()
+    entry = make_entry(future_day(10))
+    store.add(entry)
+
+    assert len(store) == 1
+    assert FlightStore.make_key(entry) in store
+    assert store.get(FlightStore.make_key(entry)) is entry
+    assert store.find(make_entry(future_day(10), price=5)) is entry
+    assert store.find(make_entry(future_day(11))) is None
+    assert store.find_by_flight_number("FR1787") == [entry]
+    assert store.is_dirty
+
+
+def test_add_rejects_a_stored_flight(store_factory):
+    store = store_factory()
+    store.add(make_entry(future_day(10)))
+    with pytest.raises(ValueError):
+        store.add(make_entry(future_day(10), price=20))
+    assert len(store) == 1
+
+
+def test_find_by_flight_number_keeps_every_day(store_factory):
+    store = store_factory()
+    first = make_entry(future_day(10))
+    second = make_entry(future_day(11))
+    other = make_entry(future_day(10), flight_number="FR9999", time="06:00:00")
+    for entry in (first, second, other):
+        store.add(entry)
+
+    assert sorted(store.find_by_flight_number("FR1787"), key=FlightStore.make_key) == [first, second]
+    assert store.find_by_flight_number("FR9999") == [other]
+    assert store.find_by_flight_number("FR0000") == []
+
+
+def test_delete_removes_the_entry_from_every_index(store_factory):
+    store = store_factory()
+    entry = make_entry(future_day(10))
+    store.add(entry)
+    key = FlightStore.make_key(entry)
+
+    assert store.delete(key) is entry
+    assert key not in store
+    assert store.flights == []
+    assert store.find_by_flight_number("FR1787") == []
+    assert store.delete(key) is None
+
+
+def test_delete_in_any_order_keeps_the_other_flights(store_factory):
+    store = store_factory()
+    entries = [make_entry(future_day(day)) for day in range(1, 41)]
+    store.merge_many(entries)
+    keys = [FlightStore.make_key(entry) for entry in entries]
+    random.Random(7).shuffle(keys)
+
+    for deleted, key in enumerate(keys, start=1):
+        store.delete(key)
+        remaining = keys[deleted:]
+        assert len(store) == len(remaining)
+        assert sorted(map(FlightStore.make_key, store.flights)) == sorted(remaining)
+
+    store.add(entries[0])
+    assert store.flights == [entries[0]]
+
+
+def test_delete_after_load_with_duplicate_entries(store_factory, tmp_path):
+    first = make_entry(future_day(10), price=10)
+    duplicate = make_entry(future_day(10), price=20)
+    other = make_entry(future_day(11))
+    (tmp_path / "flights.json").write_text(json.dumps([first, other, duplicate]), encoding="utf-8")
+    store = store_factory()
+
+    store.delete(FlightStore.make_key(other))
+
+    assert store.flights == [first, duplicate]
+
+
+def test_merge_adds_appends_and_skips(store_factory):
+    store = store_factory()
+    day = future_day(10)
+
+    assert store.merge(make_entry(day, price=191.29, timestamp=1)).startswith("Added new entry")
+    assert store.merge(make_entry(day, price=150, timestamp=2, price_updated=1742734425000)).startswith("Updated")
+    assert store.merge(make_entry(day, price=191.29, timestamp=3)).startswith("No update needed")
+
+    stored = store.find(make_entry(day))
+    assert stored["price"]["prices_history"] == [{"timestamp": 1, "price": 191.29},
+                                                 {"timestamp": 2, "price": 150}]
+    # An updated entry keeps priceUpdated as a string, like the stored data
+    assert stored["priceUpdated"] == "1742734425000"
+    assert len(store) == 1
+    assert store.changes == 2
+
+
+def test_merge_many_counts_the_changes(store_factory):
+    store = store_factory()
+    entries = [make_entry(future_day(10)), make_entry(future_day(10), price=20), make_entry(future_day(11))]
+    assert store.merge_many(entries) == 3
+    assert store.merge_many(entries) == 0
+
+
+def test_flush_writes_and_load_reads_back(store_factory):
+    store = store_factory()
+    store.merge(make_entry(future_day(10)))
+    store.merge(make_entry(future_day(11), arrival_iata="AGP"))
+    assert store.is_dirty
+    store.flush()
+    assert not store.is_dirty
+
+    reloaded = store_factory()
+    assert reloaded.flights == store.flights
+    assert reloaded.find(make_entry(future_day(11), arrival_iata="AGP")) is not None
+    assert len(reloaded.find_by_flight_number("FR1787")) == 2
+
+
+def test_load_keeps_the_first_of_duplicate_entries(store_factory, tmp_path):
+    first = make_entry(future_day(10), price=10)
+    duplicate = make_entry(future_day(10), price=20)
+    (tmp_path / "flights.json").write_text(json.dumps([first, duplicate]), encoding="utf-8")
+
+    store = store_factory()
+    assert store.find(first)["price"]["prices_history"][0]["price"] == 10
+
+
+def test_flush_every_writes_after_that_many_changes(tmp_path):
+    engine = JsonFileEngine(str(tmp_path / "flights.json"))
+    store = FlightStore(engine, flush_every=2, cheapest_view=CheapestFlightsView(None)).load()
+    store.merge(make_entry(future_day(10)))
+    assert not engine.path.exists()
+    store.merge(make_entry(future_day(11)))
+    assert len(engine.load()) == 2
+    assert not store.is_dirty
+
+
+def test_open_flight_store_starts_a_new_run(tmp_path, monkeypatch):
+    monkeypatch.setattr(flight_store, "_flight_store", None)
+    engine = JsonFileEngine(str(tmp_path / "flights.json"))
+    engine.rewrite([make_entry(future_day(10))])
+
+    store = flight_store.open_flight_store(engine)
+
+    assert flight_store.get_flight_store() is store
+    assert len(store) == 1
@@ -0,0 +1,109 @@
+import io
+
+import pytest
+import requests
+
+import http_transport
+from http_transport import HttpTransport, TokenBucket
+
+
+def make_response(status_code: int, headers: dict | None = None) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    response.url = "https://example.test/fares"
+    response.raw = io.BytesIO(b"{}")
+    return response
+
+
+class FakeSession:
+    """Stands in for requests.Session, returns or raises the queued results in order."""
+    def __init__(self, results: list):
+        self.results = list(results)
+        self.calls = 0
+
+    def get(self, url, params=None, timeout=None):
+        self.calls += 1
+        result = self.results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Records the delays the transport sleeps for instead of sleeping."""
+    delays = []
+    monkeypatch.setattr(http_transport.time, "sleep", delays.append)
+    return delays
+
+
+def make_transport(results: list, max_retries: int = 3) -> HttpTransport:
+    transport = HttpTransport(max_retries=max_retries, backoff_base=0.5, backoff_max=30,
+                              rate_limiter=TokenBucket(rate=1000, capacity=1000))
+    transport.session = FakeSession(results)
+    return transport
+
+
+def test_get_retries_5xx_and_connection_errors(sleeps):
+    transport = make_transport([make_response(503),
+                                requests.exceptions.ConnectionError("reset"),
+                                make_response(200)])
+
+    response = transport.get("https://example.test/fares")
+
+    assert response.status_code == 200
+    assert transport.session.calls == 3
+    assert len(sleeps) == 2
+    assert 0 <= sleeps[0] <= 0.5 and 0 <= sleeps[1] <= 1.0
+
+
+def test_get_waits_for_retry_after_seconds(sleeps):
+    transport = make_transport([make_response(429, {"Retry-After": "7"}), make_response(200)])
+
+    transport.get("https://example.test/fares")
+
+    assert sleeps == [7.0]
+
+
+def test_retry_after_is_capped_by_backoff_max(sleeps):
+    transport = make_transport([make_response(429, {"Retry-After": "600"}), make_response(200)])
+
+    transport.get("https://example.test/fares")
+
+    assert sleeps == [30]
+
+
+def test_get_raises_when_retries_run_out(sleeps):
+    transport = make_transport([make_response(500), make_response(500)], max_retries=1)
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        transport.get("https://example.test/fares")
+    assert transport.session.calls == 2
+
+
+def test_get_does_not_retry_client_errors(sleeps):
+    transport = make_transport([make_response(404)])
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        transport.get("https://example.test/fares")
+    assert sleeps == []
+
+
+def test_token_bucket_allows_the_burst_then_waits(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(http_transport.time, "monotonic", lambda: clock[0])
+
+    def fake_sleep(seconds):
+        clock[0] += seconds
+    monkeypatch.setattr(http_transport.time, "sleep", fake_sleep)
+    bucket = TokenBucket(rate=2, capacity=3)
+
+    assert [bucket.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.acquire() == pytest.approx(0.5)
+    assert clock[0] == pytest.approx(100.5)
+
+
+def test_token_bucket_rejects_invalid_settings():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0, capacity=1)
@@ -0,0 +1,20 @@
+import numpy as np
+import pytest
+
+from price_history import PriceHistory
+
+
+def test_to_json_keeps_int_prices():
+    price_history = PriceHistory(np.array([1, 2, 3]), np.array([20.0, 20.5, 191.0]),
+                                 np.array([True, False, False]))
+
+    prices_history = price_history.to_json()
+
+    assert prices_history == [{"timestamp": 1, "price": 20}, {"timestamp": 2, "price": 20.5},
+                              {"timestamp": 3, "price": 191.0}]
+    assert [type(item["price"]) for item in prices_history] == [int, float, float]
+
+
+def test_arrays_of_different_length_are_rejected():
+    with pytest.raises(ValueError):
+        PriceHistory(np.array([1, 2]), np.array([20.0]))
@@ -0,0 +1,61 @@
+from datetime import datetime
+
+from raw_archive import INDEX_FILE_NAME, RawResponseArchive, read_segment
+
+SEARCH_DATE = datetime(2030, 4, 1)
+
+
+def read_all(archive: RawResponseArchive) -> list:
+    return [record for path in archive.segment_paths() for record in read_segment(str(path))]
+
+
+def test_flushed_records_are_read_back_in_order(tmp_path):
+    archive = RawResponseArchive(str(tmp_path))
+    archive.append(SEARCH_DATE, {"fares": [1]})
+    archive.flush()
+    archive.append(SEARCH_DATE, {"fares": [2]})
+    archive.append(SEARCH_DATE, {"fares": [3]})
+    archive.flush()
+
+    records = read_all(archive)
+
+    assert [record["data"] for record in records] == [{"fares": [1]}, {"fares": [2]}, {"fares": [3]}]
+    assert records[0]["search_date"] == "2030-04-01"
+    assert archive.index["segment-000001.jsonl.gz"]["records"] == 3
+
+
+def test_full_segment_starts_a_new_one(tmp_path):
+    archive = RawResponseArchive(str(tmp_path), segment_max_bytes=1)
+    for fares in range(3):
+        archive.append(SEARCH_DATE, {"fares": [fares]})
+        archive.flush()
+
+    assert [path.name for path in archive.segment_paths()] == [
+        "segment-000001.jsonl.gz", "segment-000002.jsonl.gz", "segment-000003.jsonl.gz"]
+    assert len(read_all(RawResponseArchive(str(tmp_path), segment_max_bytes=1))) == 3
+
+
+def test_missing_index_is_rebuilt_from_segments(tmp_path):
+    archive = RawResponseArchive(str(tmp_path))
+    archive.append(SEARCH_DATE, {"fares": []})
+    archive.flush()
+    (tmp_path / INDEX_FILE_NAME).unlink()
+
+    reopened = RawResponseArchive(str(tmp_path))
+
+    assert list(reopened.index) == ["segment-000001.jsonl.gz"]
+    assert reopened.index["segment-000001.jsonl.gz"]["records"] is None
+
+
+def test_record_cut_off_by_a_crash_ends_the_segment(tmp_path):
+    archive = RawResponseArchive(str(tmp_path))
+    archive.append(SEARCH_DATE, {"fares": [1]})
+    archive.flush()
+    segment_path = archive.segment_paths()[0]
+    intact_size = segment_path.stat().st_size
+    archive.append(SEARCH_DATE, {"fares": [2] * 100})
+    archive.flush()
+    with open(segment_path, 'r+b') as file:
+        file.truncate(intact_size + 20)
+
+    assert [record["data"] for record in read_segment(str(segment_path))] == [{"fares": [1]}]
@@ -0,0 +1,102 @@
+import threading
+from datetime import datetime, timedelta
+
+import response_cache
+from response_cache import ResponseCache
+
+URL = "https://example.test/fares"
+TTL_RULES = [(3, 60), (30, 3600), (None, 86400)]
+
+
+def make_cache(tmp_path, max_bytes: int = 10 ** 6) -> ResponseCache:
+    return ResponseCache(cache_dir=str(tmp_path / "cache"), max_bytes=max_bytes, ttl_rules=TTL_RULES)
+
+
+def test_ttl_depends_on_days_until_departure(tmp_path):
+    cache = make_cache(tmp_path)
+    today = datetime.today()
+
+    assert cache.ttl_for(today + timedelta(days=1)) == 60
+    assert cache.ttl_for(today + timedelta(days=20)) == 3600
+    assert cache.ttl_for(today + timedelta(days=200)) == 86400
+
+
+def test_entry_expires_after_ttl(tmp_path, monkeypatch):
+    cache = make_cache(tmp_path)
+    key = cache.make_key(URL, {"date": "2030-04-01"})
+    cache.set(key, {"date": "2030-04-01"}, {"fares": []})
+    stored_at = response_cache.time.time()
+
+    monkeypatch.setattr(response_cache.time, "time", lambda: stored_at + 59)
+    assert cache.get(key, ttl=60) == {"fares": []}
+    monkeypatch.setattr(response_cache.time, "time", lambda: stored_at + 120)
+    assert cache.get(key, ttl=60) is None
+
+
+def test_get_or_fetch_caches_results_but_not_failures(tmp_path):
+    cache = make_cache(tmp_path)
+    departure_date = datetime.today() + timedelta(days=10)
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return {"fares": [1]} if len(calls) > 1 else None
+
+    assert cache.get_or_fetch(URL, {"date": "a"}, departure_date, fetch) is None
+    assert cache.get_or_fetch(URL, {"date": "a"}, departure_date, fetch) == {"fares": [1]}
+    assert cache.get_or_fetch(URL, {"date": "a"}, departure_date, fetch) == {"fares": [1]}
+    assert len(calls) == 2
+
+
+def test_identical_requests_share_one_fetch(tmp_path):
+    cache = make_cache(tmp_path)
+    departure_date = datetime.today() + timedelta(days=10)
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        release.wait(timeout=5)
+        return {"fares": ["shared"]}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(
+        cache.get_or_fetch(URL, {"date": "a"}, departure_date, fetch))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    while not calls:
+        pass
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert results == [{"fares": ["shared"]}] * 5
+    assert len(calls) == 1
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = make_cache(tmp_path, max_bytes=250)
+    keys = [cache.make_key(URL, {"date": str(day)}) for day in range(3)]
+    for day, key in enumerate(keys):
+        cache.set(key, {"date": str(day)}, {"fares": ["x" * 50]})
+
+    assert cache.get(keys[0], ttl=60) is None
+    assert cache.get(keys[2], ttl=60) == {"fares": ["x" * 50]}
+
+
+def test_leader_uses_a_result_cached_after_its_cache_check(tmp_path, monkeypatch):
+    cache = make_cache(tmp_path)
+    departure_date = datetime.today() + timedelta(days=10)
+    key = cache.make_key(URL, {"date": "a"})
+    cache.set(key, {"date": "a"}, {"fares": ["first leader"]})
+    cache_get = cache.get
+    gets = []
+
+    def get_missing_first(key, ttl):
+        # The first check ran before the previous leader stored its result
+        gets.append(key)
+        return None if len(gets) == 1 else cache_get(key, ttl)
+    monkeypatch.setattr(cache, "get", get_missing_first)
+
+    assert cache.get_or_fetch(URL, {"date": "a"}, departure_date, lambda: {"fares": ["again"]}) == {
+        "fares": ["first leader"]}
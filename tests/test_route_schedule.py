@@ -0,0 +1,50 @@
+from datetime import datetime, timedelta
+
+import route_schedule
+from constants import NEGATIVE_CACHE_TTL_SECONDS, SCHEDULE_MIN_EMPTY_STREAK, SCHEDULE_REPROBE_SECONDS
+from route_schedule import RouteSchedule
+
+MONDAY = datetime(2030, 4, 1)
+
+
+def test_empty_date_is_skipped_until_the_cache_expires(tmp_path, monkeypatch):
+    now = [1_900_000_000.0]
+    monkeypatch.setattr(route_schedule.time, "time", lambda: now[0])
+    schedule = RouteSchedule("VNO", "BCN", folder_path=str(tmp_path))
+
+    schedule.record(MONDAY, has_flights=False)
+    assert not schedule.should_query(MONDAY)
+
+    now[0] += NEGATIVE_CACHE_TTL_SECONDS + 1
+    assert schedule.should_query(MONDAY)
+
+
+def test_weekday_without_flights_is_reprobed_only_weekly(tmp_path, monkeypatch):
+    now = [1_900_000_000.0]
+    monkeypatch.setattr(route_schedule.time, "time", lambda: now[0])
+    schedule = RouteSchedule("VNO", "BCN", folder_path=str(tmp_path))
+    mondays = [MONDAY + timedelta(weeks=week) for week in range(SCHEDULE_MIN_EMPTY_STREAK + 1)]
+
+    for monday in mondays[:-1]:
+        schedule.record(monday, has_flights=False)
+
+    assert not schedule.is_operating_weekday(MONDAY.weekday())
+    assert schedule.plan_dates([mondays[-1], mondays[-1] + timedelta(days=1)]) == [mondays[-1] + timedelta(days=1)]
+    now[0] += SCHEDULE_REPROBE_SECONDS
+    assert schedule.should_query(mondays[-1])
+
+    schedule.record(mondays[-1], has_flights=True)
+    assert schedule.is_operating_weekday(MONDAY.weekday())
+
+
+def test_state_survives_save_and_load(tmp_path):
+    schedule = RouteSchedule("VNO", "BCN", folder_path=str(tmp_path))
+    schedule.record(MONDAY, has_flights=False)
+    schedule.save()
+
+    loaded = RouteSchedule("vno", "bcn", folder_path=str(tmp_path)).load()
+
+    assert not loaded.is_new
+    assert loaded.empty_dates == schedule.empty_dates
+    assert loaded.weekdays[str(MONDAY.weekday())]["empty_streak"] == 1
+    assert RouteSchedule("VNO", "ALC", folder_path=str(tmp_path)).load().is_new
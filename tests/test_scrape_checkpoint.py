@@ -0,0 +1,82 @@
+import os
+import time
+from datetime import datetime, timedelta
+import scrape_checkpoint
+from scrape_checkpoint import ScrapeCheckpoint
+
+
+START_DATE = datetime(2030, 3, 1)
+END_DATE = datetime(2030, 3, 31)
+SEARCH_DATES = [START_DATE + timedelta(days=day) for day in range(5)]
+
+
+def open_checkpoint(tmp_path) -> ScrapeCheckpoint:
+    return ScrapeCheckpoint(START_DATE, END_DATE, str(tmp_path)).load()
+
+
+def test_make_cell():
+    assert ScrapeCheckpoint.make_cell("vno", "bcn", datetime(2025, 3, 25)) == "VNO-BCN-2025-03-25"
+
+
+def test_new_run_has_every_date_pending(tmp_path):
+    checkpoint = open_checkpoint(tmp_path)
+    assert not checkpoint.resumed
+    assert checkpoint.pending_dates("VNO", "BCN", SEARCH_DATES) == SEARCH_DATES
+
+
+def test_killed_run_resumes_with_the_missing_cells(tmp_path):
+    checkpoint = open_checkpoint(tmp_path)
+    checkpoint.mark_done("VNO", "BCN", SEARCH_DATES[:3])
+    checkpoint.mark_done("VNO", "AGP", SEARCH_DATES[:1])
+    # The process is killed here, the next run opens the same window
+
+    resumed = open_checkpoint(tmp_path)
+    assert resumed.resumed
+    assert resumed.pending_dates("VNO", "BCN", SEARCH_DATES) == SEARCH_DATES[3:]
+    assert resumed.pending_dates("VNO", "AGP", SEARCH_DATES) == SEARCH_DATES[1:]
+    assert resumed.pending_dates("KUN", "BCN", SEARCH_DATES) == SEARCH_DATES
+
+
+def test_other_window_does_not_resume(tmp_path):
+    open_checkpoint(tmp_path).mark_done("VNO", "BCN", SEARCH_DATES)
+    other = ScrapeCheckpoint(START_DATE, END_DATE + timedelta(days=1), str(tmp_path)).load()
+    assert not other.resumed
+    assert other.pending_dates("VNO", "BCN", SEARCH_DATES) == SEARCH_DATES
+
+
+def test_mark_done_appends_each_cell_once(tmp_path):
+    checkpoint = open_checkpoint(tmp_path)
+    checkpoint.mark_done("VNO", "BCN", SEARCH_DATES[:2])
+    checkpoint.mark_done("VNO", "BCN", SEARCH_DATES[:3])
+    assert len(checkpoint.path.read_text(encoding="utf-8").splitlines()) == 3
+
+
+def test_cut_off_last_line_is_ignored(tmp_path):
+    checkpoint = open_checkpoint(tmp_path)
+    checkpoint.mark_done("VNO", "BCN", SEARCH_DATES[:2])
+    with open(checkpoint.path, "a", encoding="utf-8") as file:
+        file.write('{"cell": "VNO-BCN-2030-03-0')
+
+    resumed = open_checkpoint(tmp_path)
+    assert resumed.pending_dates("VNO", "BCN", SEARCH_DATES) == SEARCH_DATES[2:]
+
+
+def test_complete_removes_the_checkpoint(tmp_path):
+    checkpoint = open_checkpoint(tmp_path)
+    checkpoint.mark_done("VNO", "BCN", SEARCH_DATES)
+    checkpoint.complete()
+
+    assert not checkpoint.path.exists()
+    assert open_checkpoint(tmp_path).pending_dates("VNO", "BCN", SEARCH_DATES) == SEARCH_DATES
+
+
+def test_expired_checkpoint_is_not_resumed(tmp_path, monkeypatch):
+    checkpoint = open_checkpoint(tmp_path)
+    checkpoint.mark_done("VNO", "BCN", SEARCH_DATES)
+    old = time.time() - 3600
+    os.utime(checkpoint.path, (old, old))
+    monkeypatch.setattr(scrape_checkpoint, "CHECKPOINT_MAX_AGE_SECONDS", 60)
+
+    resumed = open_checkpoint(tmp_path)
+    assert not resumed.resumed
+    assert not checkpoint.path.exists()
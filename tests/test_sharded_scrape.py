@@ -0,0 +1,47 @@
+import time
+from datetime import datetime
+
+from sharded_scrape import scrape_routes_sharded
+
+START_DATE = datetime(2030, 4, 1)
+END_DATE = datetime(2030, 4, 2)
+
+
+def fake_fetch_route(start_date, end_date, departure_iata, arrival_iata):
+    """Runs in the worker processes, so it has to be a module level function."""
+    if arrival_iata == "ERR":
+        raise RuntimeError("API down")
+    if arrival_iata == "SLOW":
+        time.sleep(30)
+    return [(start_date, {"fares": [arrival_iata]})]
+
+
+def make_routes(*arrivals: str) -> list:
+    return [{"departure": "VNO", "arrival": arrival} for arrival in arrivals]
+
+
+def test_every_shard_is_saved_in_the_parent_process():
+    saved = []
+
+    def save_route(start_date, end_date, departure_iata, arrival_iata, route_fares):
+        saved.append((departure_iata, arrival_iata, route_fares))
+
+    saved_routes = scrape_routes_sharded(START_DATE, END_DATE, make_routes("BCN", "ALC", "ERR"),
+                                         fake_fetch_route, save_route, processes=2, deadline_seconds=30)
+
+    assert saved_routes == 2
+    assert sorted(saved) == [("VNO", "ALC", [(START_DATE, {"fares": ["ALC"]})]),
+                             ("VNO", "BCN", [(START_DATE, {"fares": ["BCN"]})])]
+
+
+def test_deadline_drops_unfinished_shards():
+    saved = []
+    started_at = time.monotonic()
+
+    saved_routes = scrape_routes_sharded(START_DATE, END_DATE, make_routes("BCN", "SLOW"),
+                                         fake_fetch_route, lambda *args: saved.append(args[3]),
+                                         processes=2, deadline_seconds=2)
+
+    assert saved_routes == 1
+    assert saved == ["BCN"]
+    assert time.monotonic() - started_at < 15
@@ -0,0 +1,197 @@
+import numpy as np
+import pytest
+from conftest import future_day, make_entry
+from cheapest_view import CheapestFlightsView
+from flight_data_process import FlightData
+from flight_store import FlightStore
+from storage import (JsonFileEngine, JsonLinesEngine, BinaryFileEngine, SqliteEngine, ShardedEngine,
+                     BinaryFlightFile, write_binary_flights, create_storage_engine)
+from storage.binary import BINARY_MAGIC, HEADER_DTYPE
+
+
+ENGINE_FACTORIES = {
+    "json": lambda tmp_path: JsonFileEngine(str(tmp_path / "flights.json")),
+    "json-msgpack-zstd": lambda tmp_path: JsonFileEngine(str(tmp_path / "flights.json"), "msgpack", "zstd"),
+    "jsonl": lambda tmp_path: JsonLinesEngine(str(tmp_path / "flights_log"), import_json_path=None),
+    "jsonl-compacting": lambda tmp_path: JsonLinesEngine(str(tmp_path / "flights_log"), compact_log_bytes=1,
+                                                         import_json_path=None),
+    "binary": lambda tmp_path: BinaryFileEngine(str(tmp_path / "flights.bin")),
+    "sqlite": lambda tmp_path: SqliteEngine(str(tmp_path / "flights.sqlite3"), import_json_path=None),
+    "sharded": lambda tmp_path: ShardedEngine(str(tmp_path / "flights_sharded"), import_json_path=None),
+}
+
+
+@pytest.fixture(params=list(ENGINE_FACTORIES))
+def engine_factory(request, tmp_path):
+    engines = []
+
+    def create():
+        engine = ENGINE_FACTORIES[request.param](tmp_path)
+        engines.append(engine)
+        return engine
+    yield create
+    for engine in engines:
+        engine.close()
+
+
+def open_store(engine) -> FlightStore:
+    return FlightStore(engine, flush_every=0, cheapest_view=CheapestFlightsView(None)).load()
+
+
+def by_key(flights):
+    return sorted(flights, key=FlightStore.make_key)
+
+
+def price_types(flights):
+    """exp: [[float], [int]], `==` alone can not tell 191 from 191.0."""
+    return [[type(item["price"]) for item in entry["price"]["prices_history"]] for entry in by_key(flights)]
+
+
+def sample_entries():
+    """Flights of two routes and two months, int and float prices, int and string priceUpdated."""
+    return [
+        make_entry(future_day(5), price=191.29),
+        make_entry(future_day(5), price=20, arrival_iata="AGP", time="06:10:00", flight_number="FR2000"),
+        make_entry(future_day(40), price=35.5, price_updated="1742734424000"),
+        make_entry(future_day(41), price=17, flight_number="FR3000"),
+    ]
+
+
+def test_round_trip_keeps_every_entry_as_it_was(engine_factory):
+    store = open_store(engine_factory())
+    for entry in sample_entries():
+        store.merge(entry)
+    store.flush()
+    store.close()
+
+    loaded = engine_factory().load()
+    assert by_key(loaded) == by_key(sample_entries())
+    assert price_types(loaded) == price_types(sample_entries())
+    assert [type(entry["priceUpdated"]) for entry in by_key(loaded)] == \
+        [type(entry["priceUpdated"]) for entry in by_key(sample_entries())]
+
+
+def test_round_trip_of_added_prices_and_deletes(engine_factory):
+    store = open_store(engine_factory())
+    for entry in sample_entries():
+        store.merge(entry)
+    store.flush()
+
+    repriced = make_entry(future_day(5), price=150.5, timestamp=1742751900, price_updated=1742734500000)
+    store.merge(repriced)
+    store.delete(FlightStore.make_key(make_entry(future_day(41), flight_number="FR3000")))
+    store.flush()
+    expected = by_key(store.flights)
+    store.close()
+
+    reloaded = open_store(engine_factory())
+    assert by_key(reloaded.flights) == expected
+    assert FlightData(reloaded.find(repriced)).get_prices_list() == [191.29, 150.5]
+    assert reloaded.find(make_entry(future_day(41), flight_number="FR3000")) is None
+
+
+def test_rewrite_replaces_everything_stored(engine_factory):
+    engine = engine_factory()
+    engine.rewrite(sample_entries())
+    engine.rewrite(sample_entries()[:1])
+    engine.close()
+    assert engine_factory().load() == sample_entries()[:1]
+
+
+def test_missing_store_loads_empty(engine_factory):
+    engine = engine_factory()
+    assert engine.load() == []
+    assert list(engine.iter_flights()) == []
+
+
+def test_create_storage_engine_rejects_an_unknown_name():
+    with pytest.raises(ValueError):
+        create_storage_engine("csv")
+
+
+def test_jsonl_drops_a_torn_last_log_line(tmp_path):
+    engine = JsonLinesEngine(str(tmp_path / "flights_log"), import_json_path=None)
+    store = open_store(engine)
+    for entry in sample_entries():
+        store.merge(entry)
+    store.flush()
+    store.close()
+
+    log_path = sorted((tmp_path / "flights_log").glob("log-*.jsonl"))[-1]
+    with open(log_path, "a", encoding="utf-8") as file:
+        file.write('{"op": "add", "entry": {"departureAir')
+
+    assert by_key(JsonLinesEngine(str(tmp_path / "flights_log"), import_json_path=None).load()) \
+        == by_key(sample_entries())
+
+
+def test_jsonl_rewrite_without_load_drops_every_log(tmp_path):
+    # exp: replay_archive --rebuild rewrites a folder this process never loaded
+    engine = JsonLinesEngine(str(tmp_path / "flights_log"), import_json_path=None)
+    store = open_store(engine)
+    for day in range(5, 9):
+        store.merge(make_entry(future_day(day)))
+        store.flush()
+        engine.start_compaction()
+        engine.close()
+    store.merge(make_entry(future_day(9)))
+    store.flush()
+    store.close()
+    assert [path.name for path in (tmp_path / "flights_log").glob("log-*.jsonl")] == ["log-000005.jsonl"]
+
+    engine = JsonLinesEngine(str(tmp_path / "flights_log"), import_json_path=None)
+    engine.rewrite(sample_entries()[:1])
+    engine.close()
+
+    assert list((tmp_path / "flights_log").glob("log-*.jsonl")) == []
+    assert JsonLinesEngine(str(tmp_path / "flights_log"), import_json_path=None).load() == sample_entries()[:1]
+
+
+def test_binary_file_rejects_another_version(tmp_path):
+    path = tmp_path / "flights.bin"
+    write_binary_flights(sample_entries(), str(path))
+    data = bytearray(path.read_bytes())
+    header = np.frombuffer(bytes(data[:HEADER_DTYPE.itemsize]), dtype=HEADER_DTYPE).copy()
+    assert header["magic"][0] == BINARY_MAGIC
+    header["version"] = 1
+    data[:HEADER_DTYPE.itemsize] = header.tobytes()
+    path.write_bytes(bytes(data))
+
+    with pytest.raises(ValueError):
+        BinaryFlightFile(str(path))
+
+
+def test_sqlite_imports_the_json_file_into_a_new_database(tmp_path):
+    JsonFileEngine(str(tmp_path / "flights.json")).rewrite(sample_entries())
+    engine = SqliteEngine(str(tmp_path / "flights.sqlite3"), import_json_path=str(tmp_path / "flights.json"))
+
+    assert by_key(engine.load()) == by_key(sample_entries())
+    assert engine.get_flight(FlightStore.make_key(sample_entries()[1])) == sample_entries()[1]
+    assert engine.route_flights("VNO", "BCN") == [sample_entries()[0], sample_entries()[2], sample_entries()[3]]
+    engine.close()
+
+
+def test_sharded_flush_writes_only_the_changed_shards(tmp_path, monkeypatch):
+    engine = ShardedEngine(str(tmp_path / "flights_sharded"), import_json_path=None)
+    engine.rewrite(sample_entries())
+    store = open_store(engine)
+    written = []
+    write_shard = engine._write_shard
+    monkeypatch.setattr(engine, "_write_shard",
+                        lambda shard, entries, key: written.append(shard) or write_shard(shard, entries, key))
+
+    store.merge(make_entry(future_day(5), price=150.5))
+    store.flush()
+
+    assert written == [f"VNO-BCN-{future_day(5)[:7]}"]
+
+
+def test_sharded_load_skips_departed_months(tmp_path):
+    departed = make_entry(future_day(-70), flight_number="FR0001")
+    engine = ShardedEngine(str(tmp_path / "flights_sharded"), import_json_path=None)
+    engine.rewrite(sample_entries() + [departed])
+
+    reopened = ShardedEngine(str(tmp_path / "flights_sharded"), import_json_path=None)
+    assert by_key(reopened.load()) == by_key(sample_entries())
+    assert departed in list(reopened.iter_flights())
+    assert reopened.manifest[f"VNO-BCN-{future_day(-70)[:7]}"]["frozen"]
@@ -0,0 +1,57 @@
+import io
+import json
+import pytest
+from conftest import future_day, make_entry
+from flight_data_process import FlightData
+from flight_store import FlightStore
+from storage import JsonFileEngine, iter_json_array, iter_flights_file, write_flights_file
+
+
+def sample_entries():
+    return [make_entry(future_day(day), price=price)
+            for day, price in ((3, 191.29), (4, 20), (5, 1e-05), (6, 2.5))]
+
+
+@pytest.mark.parametrize("chunk_chars", [1, 2, 3, 5, 8, 64, 4096])
+def test_iter_json_array_matches_json_loads(chunk_chars):
+    text = json.dumps([1, 2.5, -0.001, 1e-05, "a, b]", {"c": [1, {"d": None}]}, [], True, 191.29], indent=4)
+    assert list(iter_json_array(io.StringIO(text), chunk_chars)) == json.loads(text)
+
+
+@pytest.mark.parametrize("text", ["", "   ", "[]", " [ ] "])
+def test_iter_json_array_of_nothing(text):
+    assert list(iter_json_array(io.StringIO(text), 2)) == []
+
+
+@pytest.mark.parametrize("text", ['{"a": 1}', '[1, 2', '[1, {"a": ', '[1, 2.'])
+def test_iter_json_array_rejects_damaged_json(text):
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_array(io.StringIO(text), 2))
+
+
+@pytest.mark.parametrize("serializer, compression", [("json-pretty", "none"), ("json", "gzip"),
+                                                     ("msgpack", "zstd")])
+def test_iter_flights_file_streams_every_codec(serializer, compression, tmp_path):
+    path = str(tmp_path / "flights.json")
+    write_flights_file(sample_entries(), path, serializer, compression)
+
+    assert list(iter_flights_file(path, chunk_chars=7)) == sample_entries()
+
+
+def test_missing_file_streams_nothing(tmp_path):
+    assert list(iter_flights_file(str(tmp_path / "missing.json"))) == []
+
+
+def test_json_engine_stream_ends_at_the_damage(tmp_path):
+    path = tmp_path / "flights.json"
+    text = json.dumps(sample_entries(), indent=4)
+    path.write_text(text[:text.index(future_day(5))], encoding="utf-8")
+    assert list(JsonFileEngine(str(path)).iter_flights()) == sample_entries()[:2]
+
+
+def test_iter_flights_filters_by_departure(tmp_path):
+    engine = JsonFileEngine(str(tmp_path / "flights.json"))
+    engine.rewrite(sample_entries())
+
+    departing_from = FlightData.from_store(sample_entries()[2]).departure_timestamp
+    assert sorted(engine.iter_flights(departing_from), key=FlightStore.make_key) == sample_entries()[2:]